@@ -10,6 +10,7 @@ from sqlalchemy.engine import Connection
 
 from appserver.apps.account import models
 from appserver.apps.calendar import models
+from appserver.apps.outbox import models
 from sqlmodel import SQLModel
 from appserver.db import DSN
 
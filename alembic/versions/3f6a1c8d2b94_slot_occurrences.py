@@ -0,0 +1,38 @@
+"""Slot occurrences
+
+Revision ID: 3f6a1c8d2b94
+Revises: e27a90f3c5d8
+Create Date: 2026-10-18 18:21:09.104527
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f6a1c8d2b94'
+down_revision: Union[str, Sequence[str], None] = 'e27a90f3c5d8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 행은 앱이 시작할 때 백그라운드 갱신 작업이 채웁니다.
+    op.create_table('slot_occurrences',
+    sa.Column('time_slot_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('calendar_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['calendar_id'], ['calendars.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['time_slot_id'], ['time_slots.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('time_slot_id', 'day')
+    )
+    op.create_index('ix_slot_occurrences_calendar_id_day', 'slot_occurrences', ['calendar_id', 'day'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_slot_occurrences_calendar_id_day', table_name='slot_occurrences')
+    op.drop_table('slot_occurrences')
@@ -0,0 +1,33 @@
+"""Booking conflict constraints
+
+Revision ID: 5b8e2f4a9c17
+Revises: c04d48ce521b
+Create Date: 2026-10-18 10:12:31.204518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b8e2f4a9c17'
+down_revision: Union[str, Sequence[str], None] = 'c04d48ce521b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # SQLite는 ALTER TABLE 로 제약 조건을 추가할 수 없으므로 batch 모드를 사용합니다.
+    with op.batch_alter_table('bookings') as batch_op:
+        batch_op.create_unique_constraint('uq_booking_time_slot_when', ['time_slot_id', 'when'])
+        batch_op.create_index('ix_bookings_guest_id_when', ['guest_id', 'when'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('bookings') as batch_op:
+        batch_op.drop_index('ix_bookings_guest_id_when')
+        batch_op.drop_constraint('uq_booking_time_slot_when', type_='unique')
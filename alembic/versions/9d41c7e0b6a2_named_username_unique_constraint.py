@@ -0,0 +1,35 @@
+"""Named username unique constraint
+
+Revision ID: 9d41c7e0b6a2
+Revises: 5b8e2f4a9c17
+Create Date: 2026-10-18 13:40:05.918377
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d41c7e0b6a2'
+down_revision: Union[str, Sequence[str], None] = '5b8e2f4a9c17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 회원가입 시 위반한 제약 조건 이름으로 중복 항목을 구분하므로 이름을 붙입니다.
+    with op.batch_alter_table('users') as batch_op:
+        if op.get_bind().dialect.name == 'postgresql':
+            batch_op.drop_constraint('users_username_key', type_='unique')
+        batch_op.create_unique_constraint('uq_username', ['username'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.drop_constraint('uq_username', type_='unique')
+        if op.get_bind().dialect.name == 'postgresql':
+            batch_op.create_unique_constraint('users_username_key', ['username'])
@@ -0,0 +1,32 @@
+"""Calendar timezone
+
+Revision ID: b5d2f8e41c63
+Revises: a7c3e9f1d052
+Create Date: 2026-10-18 21:12:07.504912
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5d2f8e41c63'
+down_revision: Union[str, Sequence[str], None] = 'a7c3e9f1d052'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 기존 캘린더의 타임슬롯 시각은 UTC 로 다뤄 왔으므로 'UTC' 로 채웁니다.
+    with op.batch_alter_table('calendars') as batch_op:
+        batch_op.add_column(sa.Column('timezone', sqlmodel.sql.sqltypes.AutoString(length=64), server_default='UTC', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('calendars') as batch_op:
+        batch_op.drop_column('timezone')
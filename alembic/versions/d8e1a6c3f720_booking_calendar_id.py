@@ -0,0 +1,42 @@
+"""Booking calendar id
+
+Revision ID: d8e1a6c3f720
+Revises: b5d2f8e41c63
+Create Date: 2026-10-18 23:41:26.318047
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8e1a6c3f720'
+down_revision: Union[str, Sequence[str], None] = 'b5d2f8e41c63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 호스트 부킹 목록이 타임슬롯을 거치지 않도록 부킹에 캘린더 id 를 옮겨 두고 기존 부킹은 타임슬롯에서 채웁니다.
+    op.add_column('bookings', sa.Column('calendar_id', sa.Integer(), nullable=True))
+    op.execute(
+        'UPDATE bookings SET calendar_id = '
+        '(SELECT time_slots.calendar_id FROM time_slots WHERE time_slots.id = bookings.time_slot_id)'
+    )
+    with op.batch_alter_table('bookings') as batch_op:
+        batch_op.alter_column('calendar_id', existing_type=sa.Integer(), nullable=False)
+        batch_op.create_foreign_key('fk_bookings_calendar_id_calendars', 'calendars', ['calendar_id'], ['id'])
+        batch_op.drop_index('ix_bookings_when_id')
+        batch_op.create_index('ix_bookings_calendar_id_when_id', ['calendar_id', 'when', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('bookings') as batch_op:
+        batch_op.drop_index('ix_bookings_calendar_id_when_id')
+        batch_op.create_index('ix_bookings_when_id', ['when', 'id'], unique=False)
+        batch_op.drop_constraint('fk_bookings_calendar_id_calendars', type_='foreignkey')
+        batch_op.drop_column('calendar_id')
@@ -0,0 +1,35 @@
+"""Booking keyset indexes
+
+Revision ID: e27a90f3c5d8
+Revises: 9d41c7e0b6a2
+Create Date: 2026-10-18 16:05:47.551932
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e27a90f3c5d8'
+down_revision: Union[str, Sequence[str], None] = '9d41c7e0b6a2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 부킹 목록을 (when, id) 커서로 읽을 수 있도록 인덱스에 id 를 포함합니다.
+    op.drop_index('ix_bookings_guest_id_when', table_name='bookings')
+    op.create_index('ix_bookings_guest_id_when_id', 'bookings', ['guest_id', 'when', 'id'], unique=False)
+    op.create_index('ix_bookings_when_id', 'bookings', ['when', 'id'], unique=False)
+    op.create_index(op.f('ix_time_slots_calendar_id'), 'time_slots', ['calendar_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_time_slots_calendar_id'), table_name='time_slots')
+    op.drop_index('ix_bookings_when_id', table_name='bookings')
+    op.drop_index('ix_bookings_guest_id_when_id', table_name='bookings')
+    op.create_index('ix_bookings_guest_id_when', 'bookings', ['guest_id', 'when'], unique=False)
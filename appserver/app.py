@@ -1,11 +1,130 @@
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager, suppress
+
+#앱 모듈을 불러오기 시작한 시각, 워커가 요청을 받을 준비가 될 때까지 걸린 시간을 잴 때 사용합니다.
+IMPORT_STARTED = time.perf_counter()
+
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from appserver.apps.account.endpoints import router as account_router
+from appserver.apps.calendar.endpoints import router as calendar_router
+from appserver.apps.account.hashing import hashing_service
+from appserver.apps.calendar.occurrences import watch_occurrences
+from appserver.apps.calendar.providers import busy_time_client, verify_provider_settings
+from appserver.apps.outbox.sinks import configured_sinks, missing_topics
+from appserver.apps.outbox.worker import BACKLOG_STATUSES, OutboxWorker, watch_backlog
+from appserver import db
+from appserver.config import settings
+from appserver.libs.metrics import MetricsMiddleware, registry
+from appserver.libs.responses import FastJSONResponse
+
+logger = logging.getLogger(__name__)
+
+IMPORTED = time.perf_counter()
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    #엔진과 커넥션 풀, 해시 스레드는 워커 프로세스 안에서 만듭니다. fork 전에 만든 커넥션을 나눠 쓰지 않습니다.
+    lifespan_started = time.perf_counter()
+    verify_provider_settings()
+    db.init_engine()
+    await asyncio.gather(
+        db.warm_up_pool(settings.database_pool_warmup),
+        hashing_service.warm_up(),
+    )
+    background_tasks = [
+        asyncio.create_task(
+            watch_occurrences(db.get_session_factory(), settings.slot_occurrence_refresh_interval)
+        ),
+    ]
+    #워커를 띄우지 않아도 밀린 메시지 수는 항상 지표로 내보냅니다.
+    _app.state.outbox_backlog = dict.fromkeys(BACKLOG_STATUSES, 0)
+    registry.gauge_function(
+        "outbox_backlog_messages", "상태별 아웃박스 미전달 메시지 수", lambda: _app.state.outbox_backlog, "status"
+    )
+    background_tasks.append(asyncio.create_task(
+        watch_backlog(db.get_session_factory(), settings.outbox_backlog_check_interval, _app.state.outbox_backlog)
+    ))
+
+    _app.state.outbox_worker = outbox_task = None
+    sinks = configured_sinks()
+    if not sinks:
+        #보낼 곳이 없는데 워커를 돌리면 메시지가 전달되지 않은 채 DONE 이 됩니다. PENDING 으로 남겨 둡니다.
+        logger.error(
+            "outbox sinks are not configured (set GOOGLE_CALENDAR_ACCESS_TOKEN and SMTP_HOST); "
+            "outbox worker is NOT running and messages stay PENDING"
+        )
+    else:
+        if missing := missing_topics(sinks):
+            logger.error("outbox sinks are not configured for %s; those messages stay PENDING", ", ".join(missing))
+        _app.state.outbox_worker = OutboxWorker(
+            db.get_session_factory(),
+            sinks,
+            concurrency=settings.outbox_concurrency,
+            batch_size=settings.outbox_batch_size,
+            max_attempts=settings.outbox_max_attempts,
+            poll_interval=settings.outbox_poll_interval,
+        )
+        registry.gauge_function(
+            "outbox_messages", "아웃박스 대기 메시지 수와 처리 결과", _app.state.outbox_worker.metrics.snapshot, "state"
+        )
+        outbox_task = asyncio.create_task(_app.state.outbox_worker.run())
+        background_tasks.append(outbox_task)
+    if db.router.replicas:
+        background_tasks.append(asyncio.create_task(
+            db.router.watch_replicas(settings.database_replica_check_interval)
+        ))
 
+    ready = time.perf_counter()
+    _app.state.startup_seconds = {
+        "import": IMPORTED - IMPORT_STARTED,
+        "lifespan": ready - lifespan_started,
+        "total": ready - IMPORT_STARTED,
+    }
+    registry.gauge_function(
+        "app_startup_seconds", "워커가 요청을 받을 준비가 되기까지 걸린 시간", lambda: _app.state.startup_seconds, "phase"
+    )
+    logger.info("ready in %.3fs (import %.3fs, lifespan %.3fs)", *(
+        _app.state.startup_seconds[phase] for phase in ("total", "import", "lifespan")
+    ))
 
-app = FastAPI()
+    yield
+
+    #서버가 새 요청을 받지 않고 처리 중인 요청을 마친 뒤에 불립니다.
+    #아웃박스는 보내던 묶음을 마치도록 기다리고, 제한 시간을 넘기면 나머지와 함께 취소합니다.
+    if outbox_task is not None:
+        _app.state.outbox_worker.stop()
+        await asyncio.wait([outbox_task], timeout=settings.server_shutdown_timeout)
+    for task in background_tasks:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    for sink in sinks.values():
+        await sink.aclose()
+    await busy_time_client.aclose()
+    await db.dispose_engine()
+    hashing_service.shutdown()
 
 
 def include_routers(_app: FastAPI):
     _app.include_router(account_router)
-    
-include_routers(app)
\ No newline at end of file
+    _app.include_router(calendar_router)
+
+
+def create_app() -> FastAPI:
+    """워커 프로세스마다 앱을 만듭니다. uvicorn --factory appserver.app:create_app"""
+    _app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
+    _app.add_middleware(MetricsMiddleware)
+
+    @_app.get("/metrics", include_in_schema=False)
+    async def metrics() -> PlainTextResponse:
+        return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+    include_routers(_app)
+    return _app
+
+
+app = create_app()
@@ -0,0 +1,112 @@
+import asyncio
+from typing import Any, Protocol
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from appserver.config import settings
+from appserver.libs.cache import TTLCache
+from .models import User
+from .schemas import UserDetailOut
+
+
+class UserCacheBackend(Protocol):
+    #여러 워커가 공유하는 저장소(예: Redis)를 붙일 때 구현합니다. 값은 JSON 으로 직렬화할 수 있는 dict 입니다.
+    async def get(self, key: str) -> dict[str, Any] | None: ...
+
+    async def set(self, key: str, value: dict[str, Any], ttl: int) -> None: ...
+
+    async def delete(self, key: str) -> None: ...
+
+
+class InMemoryUserCacheBackend:
+    #테스트나 로컬 개발에서 공유 저장소 대신 사용합니다.
+    def __init__(self):
+        self._data: dict[str, dict[str, Any]] = {}
+
+    async def get(self, key: str) -> dict[str, Any] | None:
+        return self._data.get(key)
+
+    async def set(self, key: str, value: dict[str, Any], ttl: int) -> None:
+        self._data[key] = value
+
+    async def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+
+
+def make_etag(user: User) -> str:
+    return f'"{int(user.updated_at.timestamp() * 1_000_000):x}"'
+
+
+#프로세스 안의 TTL/LRU 캐시를 먼저 보고, 없으면 공유 저장소(설정한 경우)를 봅니다.
+class UserCache:
+    def __init__(self, maxsize: int, ttl: int, backend: UserCacheBackend | None = None):
+        self.local: TTLCache[str, dict[str, Any]] = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.ttl = ttl
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self._pending_deletes: set[asyncio.Task] = set()
+
+    async def get(self, username: str) -> dict[str, Any] | None:
+        entry = self.local.get(username)
+        if entry is None and self.backend is not None:
+            entry = await self.backend.get(username)
+            if entry is not None:
+                self.local.set(username, entry)
+
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    async def set(self, user: User) -> dict[str, Any]:
+        entry = {
+            "data": UserDetailOut.model_validate(user, from_attributes=True).model_dump(mode="json"),
+            "etag": make_etag(user),
+        }
+        self.local.set(user.username, entry)
+        if self.backend is not None:
+            await self.backend.set(user.username, entry, self.ttl)
+        return entry
+
+    def invalidate(self, username: str) -> None:
+        #ORM 이벤트(동기 함수)에서 호출하므로 공유 저장소 삭제는 태스크로 예약합니다.
+        self.local.pop(username)
+        if self.backend is None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        task = loop.create_task(self.backend.delete(username))
+        self._pending_deletes.add(task)
+        task.add_done_callback(self._pending_deletes.discard)
+
+    def stats(self) -> dict[str, int]:
+        return {"size": len(self.local), "hits": self.hits, "misses": self.misses}
+
+
+user_cache = UserCache(maxsize=settings.user_cache_size, ttl=settings.user_cache_ttl)
+
+
+#User 가 바뀌면(updated_at 갱신) 커밋된 뒤에 캐시를 비웁니다.
+@event.listens_for(Session, "after_flush")
+def _collect_user_invalidations(session: Session, flush_context):
+    pending = session.info.setdefault("user_cache_invalidations", set())
+    for instance in (*session.dirty, *session.deleted):
+        if isinstance(instance, User):
+            pending.add(instance.username)
+            pending.update(inspect(instance).attrs.username.history.deleted)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_user_invalidations(session: Session):
+    for username in session.info.pop("user_cache_invalidations", ()):
+        user_cache.invalidate(username)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_user_invalidations(session: Session, previous_transaction):
+    session.info.pop("user_cache_invalidations", None)
@@ -0,0 +1,119 @@
+"""계정 관리 명령
+
+    python -m appserver.apps.account.commands import-users users.csv --batch-size 1000
+
+CSV 헤더: username,email,display_name,is_host,password,hashed_password
+"""
+import argparse
+import asyncio
+import csv
+import logging
+import sys
+from dataclasses import dataclass
+from itertools import islice
+from typing import Iterable
+
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from appserver.db import dialect_insert, get_session_factory, dispose_engine
+from .hashing import PasswordHashingService
+from .models import User
+from .schemas import UserImportRow
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ImportResult:
+    inserted: int = 0
+    #이미 같은 username 또는 email 이 있어 건너뛴 행
+    skipped: int = 0
+    invalid: int = 0
+
+
+def _batched(rows: Iterable[dict], size: int):
+    iterator = iter(rows)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+async def import_users(
+    session: AsyncSession,
+    rows: Iterable[dict],
+    *,
+    hashing: PasswordHashingService,
+    batch_size: int = 1000,
+) -> ImportResult:
+    result = ImportResult()
+    insert = dialect_insert((await session.connection()).dialect.name)
+    stmt = insert(User).on_conflict_do_nothing().returning(User.id)
+
+    for batch in _batched(rows, batch_size):
+        users: list[UserImportRow] = []
+        for row in batch:
+            try:
+                users.append(UserImportRow.model_validate(row))
+            except ValidationError as e:
+                result.invalid += 1
+                logger.warning("invalid user row %r: %s", row.get("username"), e.errors())
+
+        #해시는 스레드 풀에서 병렬로 계산합니다.
+        hashed_passwords = await asyncio.gather(*(
+            hashing.hash_password(user.password)
+            for user in users
+            if user.hashed_password is None
+        ))
+        hashed = iter(hashed_passwords)
+        params = [
+            {
+                "username": user.username,
+                "email": user.email,
+                "display_name": user.display_name,
+                "is_host": user.is_host,
+                "hashed_password": user.hashed_password or next(hashed),
+            }
+            for user in users
+        ]
+        if not params:
+            continue
+
+        #배치 단위로 executemany 후 커밋합니다.
+        inserted = len((await session.scalars(stmt, params)).all())
+        await session.commit()
+        result.inserted += inserted
+        result.skipped += len(params) - inserted
+
+    return result
+
+
+async def import_users_from_csv(path: str, batch_size: int, workers: int) -> ImportResult:
+    hashing = PasswordHashingService(max_workers=workers, max_queue_size=batch_size)
+    try:
+        with open(path, newline="", encoding="utf-8") as fp:
+            async with get_session_factory()() as session:
+                return await import_users(session, csv.DictReader(fp), hashing=hashing, batch_size=batch_size)
+    finally:
+        hashing.shutdown()
+        await dispose_engine()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m appserver.apps.account.commands")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = subparsers.add_parser("import-users", help="CSV 파일에서 사용자를 한꺼번에 추가합니다.")
+    import_parser.add_argument("path")
+    import_parser.add_argument("--batch-size", type=int, default=1000)
+    import_parser.add_argument("--workers", type=int, default=4, help="비밀번호 해시 스레드 수")
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    result = asyncio.run(import_users_from_csv(args.path, args.batch_size, args.workers))
+    print(f"inserted={result.inserted} skipped={result.skipped} invalid={result.invalid}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
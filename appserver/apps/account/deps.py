@@ -0,0 +1,71 @@
+import hashlib
+import time
+from typing import Annotated
+
+from fastapi import Depends, Request
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+from appserver.config import settings
+from appserver.libs.cache import TTLCache
+from .exceptions import AuthNotProvidedError, ExpiredTokenError, InvalidTokenError
+from .schemas import AuthUser
+from .utils import decode_token
+
+AUTH_COOKIE_NAME = "auth_token"
+
+bearer_scheme = HTTPBearer(auto_error=False)
+
+#토큰 원문 대신 SHA-256 다이제스트를 키로 사용합니다.
+token_cache: TTLCache[bytes, AuthUser] = TTLCache(
+    maxsize=settings.auth_token_cache_size,
+    ttl=settings.auth_token_cache_ttl,
+)
+
+
+def authenticate_token(token: str) -> AuthUser:
+    key = hashlib.sha256(token.encode()).digest()
+    user = token_cache.get(key)
+    if user is not None:
+        return user
+
+    from jose import ExpiredSignatureError, JWTError
+
+    try:
+        claims = decode_token(token)
+    except ExpiredSignatureError:
+        raise ExpiredTokenError
+    except JWTError:
+        raise InvalidTokenError
+
+    try:
+        user = AuthUser(
+            username=claims["sub"],
+            display_name=claims["display_name"],
+            is_host=claims["is_host"],
+        )
+        expires_in = claims["exp"] - time.time()
+    except (KeyError, TypeError, ValueError):
+        raise InvalidTokenError
+
+    #캐시에 남아 있는 동안 토큰이 만료되지 않도록 exp 까지만 보관합니다.
+    ttl = min(expires_in, settings.auth_token_cache_ttl)
+    if ttl > 0:
+        token_cache.set(key, user, ttl=ttl)
+    return user
+
+
+async def get_current_user(
+    request: Request,
+    credentials: Annotated[HTTPAuthorizationCredentials | None, Depends(bearer_scheme)],
+) -> AuthUser:
+    if credentials is not None:
+        token = credentials.credentials
+    else:
+        token = request.cookies.get(AUTH_COOKIE_NAME)
+
+    if not token:
+        raise AuthNotProvidedError
+    return authenticate_token(token)
+
+
+CurrentUserDep = Annotated[AuthUser, Depends(get_current_user)]
@@ -1,15 +1,17 @@
 from datetime import datetime, timezone, timedelta
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Request, Response, status
 from sqlmodel import Session, select, func
-from appserver.db import DbSessionDep
+from appserver.db import DbSessionDep, ReadDbSessionDep, get_violated_constraint, query_budget
 from .models import User
-from .exceptions import DuplicatedUsernameError, DuplicatedEmailError, UserNotFoundError, PasswordMismatchError
+from .exceptions import DuplicatedUsernameError, DuplicatedEmailError, PasswordMismatchError
 from sqlalchemy.exc import IntegrityError
-from .schemas import SignupPayload, UserOut, LoginPayload
-from .utils import verify_password
-from fastapi.responses import JSONResponse
+from .schemas import SignupPayload, UserOut, LoginPayload, AuthUser, UserDetailOut
+from .cache import user_cache
+from .deps import CurrentUserDep, AUTH_COOKIE_NAME
+from appserver.libs.responses import FastJSONResponse, dump_model, etag_matches
+from .hashing import hashing_service
+from .ratelimit import login_rate_limiter
 from .utils import (
-  verify_password,
   create_access_token,
   ACCESS_TOKEN_EXPIRE_MINUTES
 )
@@ -18,54 +20,80 @@ from .utils import (
 
 router = APIRouter(prefix="/api/accounts", tags=["accounts"])
 
-@router.get("/users/{username}")
-async def user_detail(username: str, session: DbSessionDep) -> User:
-  stmt = select(User).where(User.username == username)
-  result = await session.execute(stmt)
-  user = result.scalar_one_or_none()
-  
-  if user is not None:
-    return user
+@router.get("/@me")
+async def me(user: CurrentUserDep) -> AuthUser:
+  return user
 
+
+@router.get("/users/{username}", response_model=UserDetailOut, dependencies=[query_budget(1)])
+async def user_detail(username: str, request: Request, session: ReadDbSessionDep):
+  cached = await user_cache.get(username)
+  if cached is None:
+    stmt = select(User).where(User.username == username)
+    result = await session.execute(stmt)
+    user = result.scalar_one_or_none()
     
-  raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    if user is None:
+      raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    cached = await user_cache.set(user)
+
+  #클라이언트가 가진 정보가 최신이면 본문 없이 304 로 응답합니다.
+  if etag_matches(request.headers.get("if-none-match"), cached["etag"]):
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": cached["etag"]})
+
+  #캐시에 넣을 때 이미 UserDetailOut 으로 검증했으므로 바로 직렬화합니다.
+  return FastJSONResponse(cached["data"], headers={"ETag": cached["etag"]})
 
 
 #model_validate 는 pydantic 제공하는 함수로 ,해당 모델필드의 유효성 검사를 검증한 후 객체를 반환합니다.
 #dic 자료형이 아닐경우 , 속성으로 접근해야 하는 객체일때는 from_attributes=True 옵션을 추가해야 합니다.
-@router.post("/signup", status_code=status.HTTP_201_CREATED, response_model=UserOut)
+@router.post("/signup", status_code=status.HTTP_201_CREATED, response_model=UserOut, dependencies=[query_budget(2)])
 async def signup(payload: SignupPayload, session: DbSessionDep) -> User:
-  stmt = select(func.count()).select_from(User).where(User.username == payload.username)
-  
-  result = await session.execute(stmt)
-  count = result.scalar_one()
-  if count > 0:
-    raise DuplicatedUsernameError
-  
-
-  user = User.model_validate(payload)
+  hashed_password = await hashing_service.hash_password(payload.password)
+  user = User.model_validate(payload, update={"hashed_password": hashed_password})
   session.add(user)
   
+  #중복 확인 조회 없이 INSERT 한 번만 실행하고, 어떤 유니크 제약 조건을 위반했는지로 오류를 구분합니다.
   try:
     await session.commit()
   except IntegrityError as e:
-    raise DuplicatedEmailError
+    await session.rollback()
+    constraint_name = get_violated_constraint(e, User.__table__)
+    if constraint_name == "uq_username":
+      raise DuplicatedUsernameError
+    if constraint_name == "uq_email":
+      raise DuplicatedEmailError
+    raise
   
   return user
 
 
-@router.post("/login", status_code=status.HTTP_200_OK)
-async def login(payload: LoginPayload, session: DbSessionDep) -> User:
+@router.post("/login", status_code=status.HTTP_200_OK, dependencies=[query_budget(3)])
+async def login(payload: LoginPayload, request: Request, session: DbSessionDep) -> User:
+  #비밀번호 검증은 비용이 크므로 시도 횟수 한도를 먼저 확인합니다.
+  await login_rate_limiter.check(payload.username, request.client.host if request.client else None)
+
   stmt = select(User).where(User.username == payload.username)
   result = await session.execute(stmt)
   user = result.scalar_one_or_none()
   
+  #없는 계정도 더미 해시를 검증하고 같은 오류로 응답해서, 응답 시간이나 내용으로 계정이 있는지 알 수 없게 합니다.
   if user is None:
-    raise UserNotFoundError
+    await hashing_service.verify_dummy_password(payload.password)
+    raise PasswordMismatchError
   
-  if not verify_password(payload.password, user.hashed_password):
+  is_valid, updated_hash = await hashing_service.verify_and_update_password(
+    payload.password, user.hashed_password
+  )
+  if not is_valid:
     raise PasswordMismatchError
   
+  #bcrypt 또는 이전 비용 설정으로 만든 해시는 로그인 성공 시 현재 설정으로 교체합니다.
+  if updated_hash is not None:
+    user.hashed_password = updated_hash
+    session.add(user)
+    await session.commit()
+  
   access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
   access_token = create_access_token(
     data={
@@ -80,16 +108,16 @@ async def login(payload: LoginPayload, session: DbSessionDep) -> User:
     
       "access_token": access_token,
       "token_type": "bearer",
-      "user": user.model_dump(mode="json", exclude={"hashed_password", "email"}),
+      "user": dump_model(UserOut, user),
     }
   
   
   now = datetime.now(timezone.utc)
   
-  res = JSONResponse(response_data, status_code=status.HTTP_200_OK)
+  res = FastJSONResponse(response_data, status_code=status.HTTP_200_OK)
   
   res.set_cookie(
-    key="auth_token",
+    key=AUTH_COOKIE_NAME,
     value=access_token,
     expires=now + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES),
     httponly=True,
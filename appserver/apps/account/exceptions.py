@@ -17,19 +17,11 @@ class DuplicatedEmailError(HTTPException):
         )
 
 
-class UserNotFoundError(HTTPException):
-    def __init__(self):
-        super().__init__(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="사용자가 없습니다.",
-        )
-
-
 class PasswordMismatchError(HTTPException):
     def __init__(self):
         super().__init__(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="틀린 비밀번호입니다.",
+            detail="계정 ID 또는 비밀번호가 틀렸습니다.",
         )
 
 
@@ -57,3 +49,21 @@ class AuthNotProvidedError(HTTPException):
             detail="로그인이 필요합니다.",
             headers={"WWW-Authenticate": "Bearer"},
         )
+
+
+class HashingQueueFullError(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해 주세요.",
+            headers={"Retry-After": "1"},
+        )
+
+
+class TooManyLoginAttemptsError(HTTPException):
+    def __init__(self, retry_after: int):
+        super().__init__(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="로그인 시도가 너무 많습니다. 잠시 후 다시 시도해 주세요.",
+            headers={"Retry-After": str(retry_after)},
+        )
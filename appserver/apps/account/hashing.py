@@ -0,0 +1,107 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar
+
+from appserver.config import settings
+from appserver.libs.metrics import current_timings, registry
+from . import utils
+from .exceptions import HashingQueueFullError
+
+T = TypeVar("T")
+
+#스레드를 기다린 시간을 포함합니다.
+PASSWORD_HASH_SECONDS = registry.histogram("password_hash_duration_seconds", "비밀번호 해시/검증 시간", ("operation",))
+
+
+#Argon2/bcrypt 연산은 수십 ms 동안 CPU를 점유하므로 이벤트 루프가 아닌 별도 스레드에서 실행합니다.
+#argon2-cffi, bcrypt 모두 해시 계산 중에는 GIL을 놓기 때문에 스레드 풀로도 병렬 처리가 됩니다.
+class PasswordHashingService:
+    def __init__(self, max_workers: int, max_queue_size: int):
+        if max_workers < 1:
+            raise ValueError("max_workers 는 1 이상이어야 합니다.")
+        if max_queue_size < 0:
+            raise ValueError("max_queue_size 는 0 이상이어야 합니다.")
+
+        self.max_workers = max_workers
+        self.max_queue_size = max_queue_size
+        self._executor: ThreadPoolExecutor | None = None
+        self._in_flight = 0
+        #성공한 요청 수와, 해시 함수가 예외를 일으켰거나 기다리던 쪽이 취소된 요청 수
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queue_depth(self) -> int:
+        #스레드를 배정받지 못하고 기다리는 요청 수
+        return max(self._in_flight - self.max_workers, 0)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="password-hash",
+            )
+        return self._executor
+
+    async def _run(self, func: Callable[..., T], *args) -> T:
+        #이벤트 루프 스레드에서만 증감하므로 별도의 락이 필요 없습니다.
+        if self._in_flight >= self.max_workers + self.max_queue_size:
+            self.rejected += 1
+            raise HashingQueueFullError
+
+        self._in_flight += 1
+        started = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self._get_executor(), func, *args)
+        except BaseException:
+            self.failed += 1
+            raise
+        finally:
+            self._in_flight -= 1
+            elapsed = time.perf_counter() - started
+            PASSWORD_HASH_SECONDS.observe(elapsed, operation=func.__name__)
+            timings = current_timings()
+            if timings is not None:
+                timings.hash_seconds += elapsed
+        self.completed += 1
+        return result
+
+    async def hash_password(self, password: str) -> str:
+        return await self._run(utils.hash_password, password)
+
+    async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(utils.verify_password, plain_password, hashed_password)
+
+    async def verify_and_update_password(
+        self, plain_password: str, hashed_password: str
+    ) -> tuple[bool, str | None]:
+        return await self._run(utils.verify_and_update_password, plain_password, hashed_password)
+
+    async def verify_dummy_password(self, plain_password: str) -> bool:
+        return await self._run(utils.verify_dummy_password, plain_password)
+
+    async def warm_up(self) -> None:
+        #첫 로그인 요청이 더미 해시를 만드는 비용까지 치르지 않도록 미리 만들어 둡니다.
+        await self._run(utils.dummy_password_hash)
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+
+hashing_service = PasswordHashingService(
+    max_workers=settings.password_hash_workers,
+    max_queue_size=settings.password_hash_queue_size,
+)
+
+registry.gauge_function("password_hash_in_flight", "실행 중이거나 기다리는 해시 요청 수", lambda: hashing_service.in_flight)
+registry.gauge_function("password_hash_queue_depth", "스레드를 기다리는 해시 요청 수", lambda: hashing_service.queue_depth)
+registry.gauge_function("password_hash_rejected", "대기열이 가득 차서 거절한 해시 요청 수", lambda: hashing_service.rejected)
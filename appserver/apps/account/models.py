@@ -15,6 +15,7 @@ if TYPE_CHECKING:
 class User(SQLModel, table=True):
   __tablename__= "users"
   __table_args__ =(
+    UniqueConstraint("username", name="uq_username"),
     UniqueConstraint("email", name="uq_email"),
   )
   
@@ -26,15 +27,18 @@ class User(SQLModel, table=True):
   hashed_password: str = Field(min_length=4, max_length=128, description="사용자 비밀번호")
   
   #OAuthAccount 문자열로 표기하면 해당 자료형을 지연 로딩, 파이썬에서는 문자열 각주 또는 전방 참조라고 합니다.
-  oauth_accounts: list["OAuthAccount"] = Relationship(back_populates="user")
+  oauth_accounts: list["OAuthAccount"] = Relationship(back_populates="user", sa_relationship_kwargs={"lazy": "raise_on_sql"})
   
   #single_parent 한 부모 객체에게만 연결되면 부모 객체가 삭제될때 자식 객체도 삭제됩니다.
   #uselist 연결된 객체가 여러개인지 여부 
-  calendar: "Calendar" = Relationship(back_populates="host", sa_relationship_kwargs={"uselist": False, "single_parent": True})
+  #lazy="raise_on_sql" 비동기 세션에서 지연 로딩은 동작하지 않으므로, 미리 불러오지 않은 관계에 접근하면 바로 예외를 일으킵니다.
+  #관계가 필요한 조회는 selectinload/joinedload 로더 옵션을 명시해야 합니다.
+  calendar: "Calendar" = Relationship(back_populates="host", sa_relationship_kwargs={"uselist": False, "single_parent": True, "lazy": "raise_on_sql"})
   
   
   bookings: list["Booking"] = Relationship(
     back_populates="guest",
+    sa_relationship_kwargs={"lazy": "raise_on_sql"},
     )
   
   #server_default 데이터베이스 영역에서 기본값을 설정하는 옵션
@@ -77,7 +81,7 @@ class OAuthAccount(SQLModel, table=True):#
   #foreign_key 외래키 제약조건 설정 , 테이블이름과 기본키이름을 합친 문자열
   user_id: int = Field(foreign_key="users.id", nullable=False)
   #Relationship() relationshipInfo객체를 반환하는 함수입니다
-  user: User = Relationship(back_populates="oauth_accounts")
+  user: User = Relationship(back_populates="oauth_accounts", sa_relationship_kwargs={"lazy": "raise_on_sql"})
   
   provider: str = Field(nullable=False, max_length=10, description="OAuth 제공자")
   provider_account_id: str = Field(nullable=False, max_length=128, description="OAuth 제공자 계정 ID")
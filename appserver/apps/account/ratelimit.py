@@ -0,0 +1,46 @@
+import math
+
+from appserver.config import settings
+from appserver.libs.metrics import registry
+from appserver.libs.ratelimit import RateLimiter, RateLimitStore
+from .exceptions import TooManyLoginAttemptsError
+
+#한도에 걸려 비밀번호 검증을 실행하지 않은 로그인 요청 수
+LOGIN_HASHES_AVOIDED = registry.counter(
+    "login_rate_limited_total", "한도를 넘어 비밀번호 검증 없이 거절한 로그인 요청 수", ("limit",)
+)
+
+
+def _per_minute(name: str, limit: int, store: RateLimitStore | None) -> RateLimiter | None:
+    if limit <= 0:
+        return None
+    return RateLimiter(name, rate=limit / 60, burst=limit, maxsize=settings.login_rate_limit_size, store=store)
+
+
+#한 계정을 노리는 대입 공격과, 한 클라이언트가 여러 계정을 돌아가며 시도하는 경우를 따로 셉니다.
+class LoginRateLimiter:
+    def __init__(self, per_username: int, per_ip: int, store: RateLimitStore | None = None):
+        self.by_username = _per_minute("login-username", per_username, store)
+        self.by_ip = _per_minute("login-ip", per_ip, store)
+
+    async def check(self, username: str, client_ip: str | None) -> None:
+        #해시를 실행하기 전에 호출해서, 한도를 넘은 요청은 CPU 를 쓰지 않고 거절합니다.
+        checks = [("username", self.by_username, username), ("ip", self.by_ip, client_ip)]
+        for limit, limiter, key in checks:
+            if limiter is None or key is None:
+                continue
+            retry_after = await limiter.acquire(key)
+            if retry_after:
+                LOGIN_HASHES_AVOIDED.inc(limit=limit)
+                raise TooManyLoginAttemptsError(math.ceil(retry_after))
+
+    def clear(self) -> None:
+        for limiter in (self.by_username, self.by_ip):
+            if limiter is not None:
+                limiter.local.clear()
+
+
+login_rate_limiter = LoginRateLimiter(
+    per_username=settings.login_rate_limit_per_username,
+    per_ip=settings.login_rate_limit_per_ip,
+)
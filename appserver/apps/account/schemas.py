@@ -2,7 +2,7 @@ import random
 import string
 from typing import Self
 
-from pydantic import AwareDatetime, EmailStr, model_validator, computed_field
+from pydantic import AwareDatetime, ConfigDict, EmailStr, model_validator, computed_field
 from sqlmodel import SQLModel, Field
 
 
@@ -33,6 +33,49 @@ class UserOut(SQLModel):
     display_name: str
     is_host: bool
     
+class UserDetailOut(SQLModel):
+    username: str
+    email: EmailStr
+    display_name: str
+    is_host: bool
+    created_at: AwareDatetime
+    updated_at: AwareDatetime
+
+
+#인증 토큰의 클레임으로 만든 사용자 정보, 데이터베이스를 조회하지 않습니다.
+#캐시된 인스턴스를 여러 요청에서 함께 사용하므로 변경할 수 없게 합니다.
+class AuthUser(SQLModel):
+    model_config = ConfigDict(frozen=True)
+
+    username: str
+    display_name: str
+    is_host: bool
+
+
 class LoginPayload(SQLModel):
     username: str = Field(min_length=4, max_length=40, description="사용자 계정 ID")
-    password: str = Field(min_length=4, max_length=128, description="사용자 비밀번호")
\ No newline at end of file
+    password: str = Field(min_length=4, max_length=128, description="사용자 비밀번호")
+
+class UserImportRow(SQLModel):
+    username: str = Field(min_length=4, max_length=40, description="사용자 계정 ID")
+    email: EmailStr = Field(max_length=128, description="사용자 이메일")
+    display_name: str = Field(min_length=4, max_length=40, description="사용자 표시 이름")
+    is_host: bool = Field(default=False, description="사용자가 호스트인지 여부")
+    #다른 시스템에서 옮겨올 때는 해시값(bcrypt/Argon2)을 그대로 가져올 수 있습니다.
+    password: str | None = Field(default=None, min_length=8, max_length=128, description="사용자 비밀번호")
+    hashed_password: str | None = Field(default=None, max_length=128, description="사용자 비밀번호 해시")
+
+    @model_validator(mode="before")
+    @classmethod
+    def drop_empty_values(cls, data: dict):
+        #CSV 의 빈 칸은 값이 없는 것으로 다룹니다.
+        data = {key: value for key, value in data.items() if value not in ("", None)}
+        if not data.get("display_name"):
+            data["display_name"] = "".join(random.choices(string.ascii_letters + string.digits, k=8))
+        return data
+
+    @model_validator(mode="after")
+    def verify_password(self) -> Self:
+        if self.password is None and self.hashed_password is None:
+            raise ValueError("password 또는 hashed_password 중 하나는 필요합니다.")
+        return self
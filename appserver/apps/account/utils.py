@@ -1,9 +1,13 @@
+import secrets
 from datetime import datetime, timedelta, timezone
-from typing import Any, Union
-from jose import jwt
-from pwdlib import PasswordHash
-from pwdlib.hashers.argon2 import Argon2Hasher
-from pwdlib.hashers.bcrypt import BcryptHasher
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Union
+from appserver.config import settings
+
+#jose(cryptography 백엔드)와 pwdlib(argon2, bcrypt)는 불러오는 데 시간이 걸리므로 처음 사용할 때 불러옵니다.
+#워커 프로세스가 앱을 불러오는 시간이 줄고, 해시를 쓰지 않는 스크립트는 아예 불러오지 않습니다.
+if TYPE_CHECKING:
+    from pwdlib import PasswordHash
 
 SECRET_KEY = "your-secret-key-here"
 ALGORITHM = "HS256"
@@ -11,6 +15,8 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
 
 def create_access_token(data: dict, expires_delta: Union[timedelta, None] = None) -> str:
+    from jose import jwt
+
     to_encode = data.copy()
     now = datetime.now(timezone.utc)
     if expires_delta:
@@ -24,16 +30,59 @@ def create_access_token(data: dict, expires_delta: Union[timedelta, None] = None
 
 
 def decode_token(token: str) -> dict:
+    from jose import jwt
+
     return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
   
 
-def hash_password(password: str) -> str:
-    password_hash = PasswordHash((Argon2Hasher(), BcryptHasher()))
-    return password_hash.hash(password)
+def build_password_hash(
+    time_cost: int = settings.argon2_time_cost,
+    memory_cost: int = settings.argon2_memory_cost,
+    parallelism: int = settings.argon2_parallelism,
+) -> "PasswordHash":
+    from pwdlib import PasswordHash
+    from pwdlib.hashers.argon2 import Argon2Hasher
+    from pwdlib.hashers.bcrypt import BcryptHasher
+
+    #첫 번째 hasher가 현재 해시 방식이고, 나머지는 기존 해시 검증용입니다.
+    return PasswordHash((
+        Argon2Hasher(time_cost=time_cost, memory_cost=memory_cost, parallelism=parallelism),
+        BcryptHasher(),
+    ))
+
+
+@lru_cache(maxsize=1)
+def get_password_hash() -> "PasswordHash":
+    return build_password_hash()
+
 
+def __getattr__(name: str):
+    #utils.password_hash 로 접근하던 코드는 그대로 두고, 처음 접근할 때 만듭니다.
+    if name == "password_hash":
+        return get_password_hash()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def hash_password(password: str) -> str:
+    return get_password_hash().hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    password_hash = PasswordHash((Argon2Hasher(), BcryptHasher()))
-    return password_hash.verify(plain_password, hashed_password)
+    return get_password_hash().verify(plain_password, hashed_password)
+
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    #bcrypt 해시이거나 Argon2 비용 설정이 바뀐 경우 새 해시를 함께 반환합니다.
+    return get_password_hash().verify_and_update(plain_password, hashed_password)
+
+
+@lru_cache(maxsize=1)
+def dummy_password_hash() -> str:
+    #없는 계정으로 로그인할 때 검증할 해시, 실제 해시와 같은 비용이 들도록 현재 설정으로 한 번만 만듭니다.
+    return get_password_hash().hash(secrets.token_urlsafe(32))
+
 
+def verify_dummy_password(plain_password: str) -> bool:
+    #계정이 없어도 있는 계정과 같은 시간이 걸리도록 검증만 하고 결과는 버립니다.
+    get_password_hash().verify(plain_password, dummy_password_hash())
+    return False
@@ -0,0 +1,313 @@
+import hashlib
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import Iterable, Iterator, Mapping
+
+from sqlalchemy import and_, event, func, inspect, select, true
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from appserver.config import settings
+from appserver.libs.cache import TTLCache
+from appserver.libs.datetime.calendar import get_start_weekday_of_month, get_last_day_of_month
+from appserver.libs.datetime.zones import UTC, get_zone, local_month_range, month_offsets
+from .models import Booking, TimeSlot
+
+
+#타임슬롯 i 의 상태를 정수의 i 번째 비트로 표현합니다. (슬롯 순서는 slot_ids 순서)
+@dataclass(frozen=True)
+class MonthAvailability:
+    calendar_id: int
+    year: int
+    month: int
+    slot_ids: tuple[int, ...]
+    #일자별(인덱스 0 이 1일) 예약을 받는 슬롯 비트마스크
+    open_masks: tuple[int, ...]
+    #일자별 이미 예약된 슬롯 비트마스크
+    booked_masks: tuple[int, ...]
+    #슬롯별 (시작, 종료) 현지 시각 (슬롯 순서는 slot_ids 순서)
+    slot_times: tuple[tuple[time, time], ...] = ()
+
+    def free_mask(self, day: int) -> int:
+        return self.open_masks[day - 1] & ~self.booked_masks[day - 1]
+
+    def is_available(self, day: int) -> bool:
+        return self.free_mask(day) != 0
+
+    def slot_status(self, day: int) -> dict[int, bool]:
+        #해당 일자에 열려 있는 슬롯별 예약 가능 여부 (True 면 예약 가능)
+        open_mask = self.open_masks[day - 1]
+        free_mask = self.free_mask(day)
+        return {
+            slot_id: bool(free_mask >> index & 1)
+            for index, slot_id in enumerate(self.slot_ids)
+            if open_mask >> index & 1
+        }
+
+    def free_instants(self, zone_name: str = UTC, days: range | None = None) -> Iterator[tuple[int, datetime, datetime]]:
+        """예약 가능한 (slot_id, 시작, 종료) 를 날짜, 슬롯 순서로 돌려줍니다. days 를 주면 그 일자만 봅니다.
+
+        타임슬롯 시각을 zone_name 의 현지 시각으로 보고 UTC 시점으로 바꿉니다.
+        오프셋 표는 (시간대, 연, 월) 마다 캐시되어 있어 게스트마다 다시 계산하지 않습니다.
+        """
+        offsets = month_offsets(zone_name, self.year, self.month)
+        for day in days if days is not None else range(1, len(self.open_masks) + 1):
+            free_mask = self.free_mask(day)
+            index = 0
+            while free_mask:
+                if free_mask & 1:
+                    start_time, end_time = self.slot_times[index]
+                    yield self.slot_ids[index], offsets.to_utc(day, start_time), offsets.to_utc(day, end_time)
+                free_mask >>= 1
+                index += 1
+
+    @property
+    def available_days(self) -> tuple[int, ...]:
+        return tuple(day for day in range(1, len(self.open_masks) + 1) if self.is_available(day))
+
+    @property
+    def day_bitset(self) -> int:
+        #예약 가능한 슬롯이 하나라도 있는 날은 (day - 1) 번째 비트가 켜집니다.
+        bitset = 0
+        for index, (open_mask, booked_mask) in enumerate(zip(self.open_masks, self.booked_masks)):
+            if open_mask & ~booked_mask:
+                bitset |= 1 << index
+        return bitset
+
+
+def compute_month_availability(
+    calendar_id: int,
+    year: int,
+    month: int,
+    time_slots: Iterable[tuple[int, Iterable[int]]],
+    bookings: Iterable[tuple[int, date]],
+    slot_times: Mapping[int, tuple[time, time]] | None = None,
+) -> MonthAvailability:
+    slot_ids: list[int] = []
+    slot_index: dict[int, int] = {}
+    #요일별(월 0 ~ 일 6)로 열려 있는 슬롯 비트마스크
+    weekday_masks = [0] * 7
+    for slot_id, weekdays in time_slots:
+        bit = 1 << len(slot_ids)
+        slot_index[slot_id] = len(slot_ids)
+        slot_ids.append(slot_id)
+        for weekday in weekdays:
+            weekday_masks[weekday] |= bit
+
+    start_weekday = get_start_weekday_of_month(year, month)
+    last_day = get_last_day_of_month(year, month)
+    open_masks = [weekday_masks[(start_weekday + offset) % 7] for offset in range(last_day)]
+
+    booked_masks = [0] * last_day
+    for slot_id, when in bookings:
+        index = slot_index.get(slot_id)
+        if index is not None and when.year == year and when.month == month:
+            booked_masks[when.day - 1] |= 1 << index
+
+    return MonthAvailability(
+        calendar_id=calendar_id,
+        year=year,
+        month=month,
+        slot_ids=tuple(slot_ids),
+        open_masks=tuple(open_masks),
+        booked_masks=tuple(booked_masks),
+        slot_times=tuple(slot_times[slot_id] for slot_id in slot_ids) if slot_times is not None else (),
+    )
+
+
+async def load_month_availability(
+    session: AsyncSession, calendar_id: int, year: int, month: int
+) -> MonthAvailability:
+    first_day = date(year, month, 1)
+    last_day = date(year, month, get_last_day_of_month(year, month))
+
+    #타임슬롯과 해당 월의 부킹을 한 번의 쿼리로 가져옵니다.
+    stmt = (
+        select(TimeSlot.id, TimeSlot.weekdays, TimeSlot.start_time, TimeSlot.end_time, Booking.when)
+        .select_from(TimeSlot)
+        .outerjoin(
+            Booking,
+            and_(Booking.time_slot_id == TimeSlot.id, Booking.when.between(first_day, last_day)),
+        )
+        .where(TimeSlot.calendar_id == calendar_id)
+        .order_by(TimeSlot.id)
+    )
+    result = await session.execute(stmt)
+
+    time_slots: dict[int, list[int]] = {}
+    slot_times: dict[int, tuple[time, time]] = {}
+    bookings: list[tuple[int, date]] = []
+    for slot_id, weekdays, start_time, end_time, when in result:
+        time_slots.setdefault(slot_id, weekdays)
+        slot_times[slot_id] = (start_time, end_time)
+        if when is not None:
+            bookings.append((slot_id, when))
+
+    return compute_month_availability(calendar_id, year, month, time_slots.items(), bookings, slot_times)
+
+
+availability_cache: TTLCache[tuple[int, int, int], MonthAvailability] = TTLCache(
+    maxsize=settings.availability_cache_size,
+    ttl=settings.availability_cache_ttl,
+)
+#(calendar_id, year, month, 시간대)마다 마지막으로 계산에 쓴 load_availability_version 값
+_seen_versions: TTLCache[tuple[int, int, int, str], tuple] = TTLCache(
+    maxsize=settings.availability_cache_size,
+    ttl=settings.availability_cache_ttl,
+)
+
+
+async def get_month_availability(
+    session: AsyncSession, calendar_id: int, year: int, month: int
+) -> MonthAvailability:
+    key = (calendar_id, year, month)
+    availability = availability_cache.get(key)
+    if availability is None:
+        availability = await load_month_availability(session, calendar_id, year, month)
+        availability_cache.set(key, availability)
+    return availability
+
+
+def calendar_date_range(calendar_zone: str, year: int, month: int, zone_name: str = UTC) -> tuple[date, date]:
+    #zone_name 기준 year 년 month 월이 캘린더 시간대로 걸치는 첫 날과 마지막 날
+    start, end = local_month_range(year, month, zone_name)
+    zone = get_zone(calendar_zone)
+    return start.astimezone(zone).date(), (end - timedelta(microseconds=1)).astimezone(zone).date()
+
+
+async def get_day_bitset(
+    session: AsyncSession,
+    calendar_id: int,
+    calendar_zone: str,
+    year: int,
+    month: int,
+    zone_name: str | None = None,
+    version: tuple | None = None,
+) -> int:
+    """zone_name 기준 year 년 month 월에 예약 가능한 슬롯이 있는 날은 (일 - 1) 번째 비트가 켜집니다.
+
+    zone_name 이 없거나 캘린더 시간대와 같으면 캐시된 월별 현황의 비트셋을 그대로 씁니다.
+    version(load_availability_version)이 지난번과 다르면 다른 워커에서 바뀐 것이므로 캐시를 버리고 다시 읽습니다.
+    """
+    if version is not None:
+        key = (calendar_id, year, month, zone_name or calendar_zone)
+        if _seen_versions.get(key) != version:
+            first, last = calendar_date_range(calendar_zone, year, month, zone_name or calendar_zone)
+            for host_month in {(first.year, first.month), (year, month), (last.year, last.month)}:
+                availability_cache.pop((calendar_id, *host_month))
+            _seen_versions.set(key, version)
+    if zone_name is None or zone_name == calendar_zone:
+        return (await get_month_availability(session, calendar_id, year, month)).day_bitset
+    zone = get_zone(zone_name)
+    bitset = 0
+    for _, start, _ in await get_free_instants(session, calendar_id, calendar_zone, year, month, zone_name):
+        bitset |= 1 << (start.astimezone(zone).day - 1)
+    return bitset
+
+
+async def load_availability_version(
+    session: AsyncSession, calendar_id: int, first: date, last: date
+) -> tuple:
+    """first ~ last 기간의 예약 가능 현황이 바뀌었는지 판단할 값을 한 번의 쿼리로 가져옵니다.
+
+    삭제는 updated_at 최댓값을 바꾸지 않을 수 있으므로 개수를 함께 봅니다.
+    """
+    slots = (
+        select(func.max(TimeSlot.updated_at).label("updated_at"), func.count(TimeSlot.id).label("count"))
+        .where(TimeSlot.calendar_id == calendar_id)
+        .subquery()
+    )
+    bookings = (
+        select(func.max(Booking.updated_at).label("updated_at"), func.count(Booking.id).label("count"))
+        .join(TimeSlot, Booking.time_slot_id == TimeSlot.id)
+        .where(TimeSlot.calendar_id == calendar_id, Booking.when.between(first, last))
+        .subquery()
+    )
+    #두 집계는 각각 한 행이므로 조건 없이 붙입니다.
+    stmt = (
+        select(slots.c.updated_at, slots.c.count, bookings.c.updated_at, bookings.c.count)
+        .select_from(slots)
+        .join(bookings, true())
+    )
+    return tuple((await session.execute(stmt)).one())
+
+
+def make_availability_etag(*parts) -> str:
+    #같은 값이면 응답 본문도 바이트 단위로 같으므로 강한 ETag 로 보냅니다.
+    digest = hashlib.sha256(":".join(map(str, parts)).encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+async def get_free_instants(
+    session: AsyncSession, calendar_id: int, calendar_zone: str, year: int, month: int, zone_name: str = UTC
+) -> list[tuple[int, datetime, datetime]]:
+    """zone_name 기준 year 년 month 월에 시작하는 예약 가능한 (slot_id, 시작, 종료) 를 UTC 시점 순서로 돌려줍니다.
+
+    보는 사람의 한 달은 캘린더 시간대(calendar_zone)로 앞뒤 달에 걸칠 수 있으므로 걸치는 달을 모두 읽습니다.
+    """
+    start, end = local_month_range(year, month, zone_name)
+    first, last = calendar_date_range(calendar_zone, year, month, zone_name)
+
+    instants = []
+    current = (first.year, first.month)
+    while current <= (last.year, last.month):
+        availability = await get_month_availability(session, calendar_id, *current)
+        #범위에 걸치는 일자만 펼치고, 경계의 날만 시점으로 한 번 더 거릅니다.
+        days = range(
+            first.day if current == (first.year, first.month) else 1,
+            (last.day if current == (last.year, last.month) else len(availability.open_masks)) + 1,
+        )
+        instants.extend(
+            instant for instant in availability.free_instants(calendar_zone, days) if start <= instant[1] < end
+        )
+        current = (current[0] + 1, 1) if current[1] == 12 else (current[0], current[1] + 1)
+    return sorted(instants, key=lambda instant: (instant[1], instant[0]))
+
+
+def invalidate_calendar(calendar_id: int) -> None:
+    availability_cache.invalidate_where(lambda key: key[0] == calendar_id)
+
+
+def invalidate_booking(calendar_id: int, when: date) -> None:
+    availability_cache.pop((calendar_id, when.year, when.month))
+
+
+def schedule_booking_invalidation(session: AsyncSession | Session, calendar_id: int, when: date) -> None:
+    #ORM flush 를 거치지 않는 INSERT/UPDATE 로 부킹을 쓴 경우 호출합니다.
+    pending = session.info.setdefault("availability_invalidations", set())
+    pending.add(("booking", calendar_id, when))
+
+
+def schedule_calendar_invalidation(session: AsyncSession | Session, calendar_id: int) -> None:
+    #ORM flush 를 거치지 않고 타임슬롯을 쓴 경우 호출합니다.
+    pending = session.info.setdefault("availability_invalidations", set())
+    pending.add(("calendar", calendar_id))
+
+
+#ORM 으로 부킹/타임슬롯을 변경하면 커밋된 뒤에 캐시를 비웁니다.
+#커밋 전에 비우면 다른 요청이 커밋 전 데이터로 캐시를 다시 채울 수 있습니다.
+@event.listens_for(Session, "after_flush")
+def _collect_invalidations(session: Session, flush_context):
+    pending = session.info.setdefault("availability_invalidations", set())
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(instance, Booking):
+            whens = {instance.when, *inspect(instance).attrs.when.history.deleted}
+            calendar_ids = {instance.calendar_id, *inspect(instance).attrs.calendar_id.history.deleted}
+            pending.update(("booking", calendar_id, when) for calendar_id in calendar_ids for when in whens)
+        elif isinstance(instance, TimeSlot):
+            calendar_ids = {instance.calendar_id, *inspect(instance).attrs.calendar_id.history.deleted}
+            pending.update(("calendar", calendar_id) for calendar_id in calendar_ids)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_invalidations(session: Session):
+    for item in session.info.pop("availability_invalidations", ()):
+        if item[0] == "booking":
+            invalidate_booking(item[1], item[2])
+        else:
+            invalidate_calendar(item[1])
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_invalidations(session: Session, previous_transaction):
+    session.info.pop("availability_invalidations", None)
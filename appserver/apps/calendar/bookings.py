@@ -0,0 +1,131 @@
+from datetime import date, datetime
+
+from sqlalchemy import exists, literal, select, type_coerce, func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from appserver.apps.outbox.sinks import CALENDAR_EVENT_TOPIC, EMAIL_TOPIC
+from appserver.apps.outbox.worker import enqueue
+from appserver.db import dialect_insert
+from .availability import schedule_booking_invalidation
+from .exceptions import (
+    TimeSlotNotFoundError,
+    SlotNotAvailableError,
+    SlotAlreadyBookedError,
+    GuestBookingOverlapError,
+)
+from .models import Booking, Calendar, TimeSlot
+from .overlaps import schedule_guest_invalidation
+
+
+def _weekday_clause(dialect_name: str, weekday: int):
+    if dialect_name == "postgresql":
+        return type_coerce(TimeSlot.weekdays, JSONB).contains([weekday])
+    weekdays = func.json_each(TimeSlot.weekdays).table_valued("value")
+    return exists().select_from(weekdays).where(weekdays.c.value == weekday)
+
+
+def _guest_overlap_clause(guest_id: int, when: date):
+    #같은 날 게스트가 가진 다른 부킹 중 시간이 겹치는 것이 있는지 확인합니다.
+    #타임슬롯 시각은 캘린더 시간대의 현지 시각이라 시간대가 같은 캘린더끼리만 비교할 수 있습니다.
+    #시간대가 다른 캘린더와의 겹침은 부킹 API 가 UTC 시점 색인(overlaps 모듈)으로 확인합니다.
+    other_booking = aliased(Booking)
+    other_slot = aliased(TimeSlot)
+    other_calendar = aliased(Calendar)
+    target_calendar = aliased(Calendar)
+    return exists().where(
+        other_booking.guest_id == guest_id,
+        other_booking.when == when,
+        other_booking.time_slot_id == other_slot.id,
+        other_slot.start_time < TimeSlot.end_time,
+        other_slot.end_time > TimeSlot.start_time,
+        other_calendar.id == other_slot.calendar_id,
+        target_calendar.id == TimeSlot.calendar_id,
+        other_calendar.timezone == target_calendar.timezone,
+    )
+
+
+async def insert_booking(
+    session: AsyncSession,
+    *,
+    time_slot_id: int,
+    guest_id: int,
+    when: date,
+    topic: str,
+    description: str,
+) -> Booking:
+    dialect_name = (await session.connection()).dialect.name
+    insert = dialect_insert(dialect_name)
+
+    #조회 후 추가하는 대신 조건을 모두 담은 INSERT 한 번으로 생성합니다.
+    #같은 슬롯, 같은 날의 동시 요청은 uq_booking_time_slot_when 제약 조건에서 하나만 성공합니다.
+    source = select(
+        literal(when),
+        literal(topic),
+        literal(description),
+        TimeSlot.id,
+        TimeSlot.calendar_id,
+        literal(guest_id),
+    ).where(
+        TimeSlot.id == time_slot_id,
+        _weekday_clause(dialect_name, when.weekday()),
+        ~_guest_overlap_clause(guest_id, when),
+    )
+    stmt = (
+        insert(Booking)
+        .from_select(["when", "topic", "description", "time_slot_id", "calendar_id", "guest_id"], source)
+        .on_conflict_do_nothing(index_elements=["time_slot_id", "when"])
+        .returning(Booking)
+    )
+    booking = (await session.scalars(stmt)).one_or_none()
+
+    if booking is None:
+        await _raise_booking_error(session, time_slot_id=time_slot_id, when=when)
+
+    schedule_booking_invalidation(session, booking.calendar_id, when)
+    schedule_guest_invalidation(session, guest_id)
+    return booking
+
+
+async def _raise_booking_error(session: AsyncSession, *, time_slot_id: int, when: date):
+    #실패한 경우에만 원인을 확인하기 위해 추가로 조회합니다.
+    time_slot = await session.get(TimeSlot, time_slot_id)
+    if time_slot is None:
+        raise TimeSlotNotFoundError
+    if when.weekday() not in time_slot.weekdays:
+        raise SlotNotAvailableError
+
+    stmt = select(exists().where(Booking.time_slot_id == time_slot_id, Booking.when == when))
+    if await session.scalar(stmt):
+        raise SlotAlreadyBookedError
+    raise GuestBookingOverlapError
+
+
+def enqueue_booking_created(
+    session: AsyncSession,
+    booking: Booking,
+    *,
+    google_calendar_id: str,
+    start: datetime,
+    end: datetime,
+    timezone: str,
+    guest_email: str,
+) -> None:
+    #구글 캘린더 일정 등록과 알림 이메일은 부킹과 같은 트랜잭션에 아웃박스로 남기고 워커가 처리합니다.
+    #워커가 데이터베이스를 다시 읽지 않도록 보낼 때 필요한 값을 모두 담습니다.
+    payload = {
+        "booking_id": booking.id,
+        "time_slot_id": booking.time_slot_id,
+        "guest_id": booking.guest_id,
+        "when": booking.when.isoformat(),
+        "topic": booking.topic,
+        "description": booking.description,
+        "google_calendar_id": google_calendar_id,
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "timezone": timezone,
+        "guest_email": guest_email,
+    }
+    enqueue(session, CALENDAR_EVENT_TOPIC, f"booking-{booking.id}-calendar-event", payload)
+    enqueue(session, EMAIL_TOPIC, f"booking-{booking.id}-created-email", payload)
@@ -0,0 +1,346 @@
+import base64
+import csv
+import io
+from datetime import date, time
+from typing import Annotated, Callable, Literal
+
+from fastapi import APIRouter, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select, select, tuple_
+from sqlalchemy.orm import contains_eager, selectinload
+
+from appserver.apps.account.deps import CurrentUserDep
+from appserver.apps.account.models import User
+from appserver.apps.account.schemas import AuthUser
+from appserver.config import settings
+from appserver.db import DbSessionDep, ReadDbSessionDep, query_budget
+from appserver.libs.datetime.calendar import get_last_day_of_month
+from appserver.libs.datetime.zones import is_valid_zone
+from appserver.libs.responses import FastJSONResponse, dump_models, dumps, etag_matches, model_response
+from .availability import calendar_date_range, get_day_bitset, load_availability_version, make_availability_etag
+from .bookings import enqueue_booking_created, insert_booking
+from .exceptions import (
+    CalendarNotFoundError,
+    GuestBookingOverlapError,
+    HostCalendarBusyError,
+    HostOnlyError,
+    InvalidCursorError,
+    InvalidTimezoneError,
+)
+from .models import Booking, Calendar, TimeSlot
+from .occurrences import find_open_time_slots
+from .overlaps import get_guest_booking_index
+from .providers import BusyTimeClientDep, slot_range
+from .schemas import (
+    AvailabilitySummaryOut,
+    BookingCreatePayload,
+    BookingOut,
+    BookingPage,
+    CalendarDetailOut,
+    TimeSlotIn,
+    TimeSlotOut,
+    TimeSlotPatchPayload,
+    TimeSlotSchedulePayload,
+)
+from .time_slots import SlotSpec, apply_time_slot_changes, diff_time_slots, load_time_slots, patch_schedule, verify_schedule
+
+router = APIRouter(prefix="/api", tags=["calendar"])
+
+LimitQuery = Annotated[int, Query(ge=1, le=100, description="한 번에 가져올 부킹 수")]
+CursorQuery = Annotated[str | None, Query(description="이전 응답의 next_cursor")]
+ExportFormatQuery = Annotated[Literal["ndjson", "csv"], Query(alias="format")]
+
+
+def encode_cursor(when: date, booking_id: int) -> str:
+    return base64.urlsafe_b64encode(f"{when.isoformat()}:{booking_id}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[date, int]:
+    try:
+        when, booking_id = base64.urlsafe_b64decode(cursor.encode()).decode().split(":")
+        return date.fromisoformat(when), int(booking_id)
+    except ValueError:
+        raise InvalidCursorError
+
+
+def _booking_rows() -> Select:
+    #ORM 객체와 관계를 불러오지 않고 응답에 필요한 컬럼만 조회합니다.
+    return (
+        select(
+            Booking.id,
+            Booking.when,
+            Booking.topic,
+            Booking.description,
+            Booking.time_slot_id,
+            Booking.guest_id,
+            TimeSlot.start_time,
+            TimeSlot.end_time,
+            Booking.created_at,
+        )
+        .join(TimeSlot, Booking.time_slot_id == TimeSlot.id)
+        .order_by(Booking.when, Booking.id)
+    )
+
+
+def calendar_detail_query(host_username: str) -> Select:
+    #호스트는 조건에 쓰려고 이미 JOIN 했으므로 그 결과를 채우고, 여러 개인 타임슬롯은 SELECT ... IN 한 번으로 불러옵니다.
+    return (
+        select(Calendar)
+        .join(Calendar.host)
+        .where(User.username == host_username)
+        .options(contains_eager(Calendar.host), selectinload(Calendar.time_slots))
+    )
+
+
+def _user_id(username: str):
+    return select(User.id).where(User.username == username).scalar_subquery()
+
+
+def guest_bookings_query(user: AuthUser) -> Select:
+    return _booking_rows().where(Booking.guest_id == _user_id(user.username))
+
+
+def verify_host(user: AuthUser, host_username: str) -> None:
+    if not user.is_host or user.username != host_username:
+        raise HostOnlyError
+
+
+def host_bookings_query(user: AuthUser, host_username: str) -> Select:
+    verify_host(user, host_username)
+    calendar_id = select(Calendar.id).where(Calendar.host_id == _user_id(host_username)).scalar_subquery()
+    return _booking_rows().where(Booking.calendar_id == calendar_id)
+
+
+async def paginate(session, stmt: Select, cursor: str | None, limit: int) -> FastJSONResponse:
+    #OFFSET 대신 마지막으로 본 (when, id) 이후부터 읽으므로 페이지가 깊어져도 비용이 같습니다.
+    if cursor is not None:
+        stmt = stmt.where(tuple_(Booking.when, Booking.id) > decode_cursor(cursor))
+    rows = (await session.execute(stmt.limit(limit + 1))).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].when, rows[-1].id)
+    return FastJSONResponse({"items": dump_models(BookingOut, rows), "next_cursor": next_cursor})
+
+
+def stream_export(session, stmt: Select, export_format: str, filename: str) -> StreamingResponse:
+    fields = tuple(BookingOut.model_fields)
+
+    #session.stream() 은 서버 측 커서로 행을 나눠 읽으므로 결과가 커져도 메모리 사용량이 늘지 않습니다.
+    async def ndjson_lines():
+        result = await session.stream(stmt.execution_options(yield_per=500))
+        async for row in result:
+            yield dumps({name: getattr(row, name) for name in fields}) + b"\n"
+
+    async def csv_lines():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(fields)
+        result = await session.stream(stmt.execution_options(yield_per=500))
+        async for partition in result.partitions():
+            writer.writerows(partition)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue()
+
+    if export_format == "csv":
+        content, media_type = csv_lines(), "text/csv; charset=utf-8"
+    else:
+        content, media_type = ndjson_lines(), "application/x-ndjson"
+    return StreamingResponse(
+        content,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{export_format}"'},
+    )
+
+
+@router.get("/calendars/{host_username}", response_model=CalendarDetailOut, dependencies=[query_budget(2)])
+async def calendar_detail(host_username: str, session: ReadDbSessionDep):
+    calendar = (await session.execute(calendar_detail_query(host_username))).unique().scalar_one_or_none()
+    if calendar is None:
+        raise CalendarNotFoundError
+    return calendar
+
+
+@router.get("/calendars/{host_username}/time-slots", response_model=list[TimeSlotOut], dependencies=[query_budget(2)])
+async def open_time_slots(
+    host_username: str,
+    day: Annotated[date, Query(description="조회할 날짜")],
+    session: ReadDbSessionDep,
+    busy_time_client: BusyTimeClientDep,
+):
+    stmt = (
+        select(Calendar.id, Calendar.google_calendar_id, Calendar.timezone)
+        .where(Calendar.host_id == _user_id(host_username))
+    )
+    calendar = (await session.execute(stmt)).one_or_none()
+    if calendar is None:
+        raise CalendarNotFoundError
+
+    time_slots = await find_open_time_slots(session, calendar.id, day)
+    #호스트 구글 캘린더에 일정이 있는 시간대는 뺍니다. 한 달 치를 한 번에 가져와 캐시하므로 같은 달의 다른 날은 다시 요청하지 않습니다.
+    busy = await busy_time_client.get_busy(calendar.google_calendar_id, *slot_range(day, time.min, time.max, calendar.timezone))
+    return [
+        time_slot for time_slot in time_slots
+        if not any(interval.overlaps(*slot_range(day, time_slot.start_time, time_slot.end_time, calendar.timezone)) for interval in busy)
+    ]
+
+
+@router.get(
+    "/calendars/{host_username}/availability", response_model=AvailabilitySummaryOut, dependencies=[query_budget(5)]
+)
+async def availability_summary(
+    host_username: str,
+    year: Annotated[int, Query(ge=2000, le=2100)],
+    month: Annotated[int, Query(ge=1, le=12)],
+    request: Request,
+    session: ReadDbSessionDep,
+    tz: Annotated[str | None, Query(description="일자를 나눌 시간대, 없으면 캘린더 시간대")] = None,
+):
+    if tz is not None and not is_valid_zone(tz):
+        raise InvalidTimezoneError
+    stmt = (
+        select(Calendar.id, Calendar.timezone, Calendar.updated_at)
+        .where(Calendar.host_id == _user_id(host_username))
+    )
+    calendar = (await session.execute(stmt)).one_or_none()
+    if calendar is None:
+        raise CalendarNotFoundError
+    zone_name = tz or calendar.timezone
+
+    #타임슬롯과 해당 기간 부킹의 변경 시각, 개수로 ETag 를 만들어서 바뀌지 않았으면 계산 없이 304 로 응답합니다.
+    first, last = calendar_date_range(calendar.timezone, year, month, zone_name)
+    version = await load_availability_version(session, calendar.id, first, last)
+    etag = make_availability_etag(calendar.id, calendar.timezone, calendar.updated_at, zone_name, year, month, *version)
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={settings.availability_http_max_age}"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    days = await get_day_bitset(session, calendar.id, calendar.timezone, year, month, zone_name, version)
+    return FastJSONResponse({
+        "year": year,
+        "month": month,
+        "timezone": zone_name,
+        "days_in_month": get_last_day_of_month(year, month),
+        "days": days,
+    }, headers=headers)
+
+
+async def save_schedule(
+    session, host_username: str, build_schedule: Callable[[dict[int, SlotSpec]], list[TimeSlotIn]]
+) -> list[TimeSlotOut]:
+    #build_schedule 은 기존 타임슬롯을 받아 적용 후의 전체 타임슬롯 목록을 돌려줍니다.
+    calendar_id = await session.scalar(select(Calendar.id).where(Calendar.host_id == _user_id(host_username)))
+    if calendar_id is None:
+        raise CalendarNotFoundError
+
+    existing = await load_time_slots(session, calendar_id)
+    desired = build_schedule(existing)
+    verify_schedule(desired)
+    schedule = await apply_time_slot_changes(session, calendar_id, existing, diff_time_slots(existing, desired))
+    await session.commit()
+
+    items = sorted(schedule.items(), key=lambda item: (item[1].start_time, item[0]))
+    return [
+        TimeSlotOut(id=slot_id, start_time=spec.start_time, end_time=spec.end_time, weekdays=list(spec.weekdays))
+        for slot_id, spec in items
+    ]
+
+
+#전체 타임슬롯을 요청 내용으로 바꿉니다. 바뀐 것만 종류별로 묶어서 한 트랜잭션으로 씁니다.
+@router.put("/calendars/{host_username}/time-slots", response_model=list[TimeSlotOut], dependencies=[query_budget(9)])
+async def replace_time_slots(
+    host_username: str, payload: TimeSlotSchedulePayload, user: CurrentUserDep, session: DbSessionDep
+):
+    verify_host(user, host_username)
+    return await save_schedule(session, host_username, lambda existing: payload.time_slots)
+
+
+#요청에 담긴 타임슬롯만 추가, 수정, 삭제하고 나머지는 그대로 둡니다.
+@router.patch("/calendars/{host_username}/time-slots", response_model=list[TimeSlotOut], dependencies=[query_budget(9)])
+async def patch_time_slots(
+    host_username: str, payload: TimeSlotPatchPayload, user: CurrentUserDep, session: DbSessionDep
+):
+    verify_host(user, host_username)
+    return await save_schedule(
+        session, host_username, lambda existing: patch_schedule(existing, payload.upsert, payload.delete)
+    )
+
+
+@router.post("/bookings", status_code=status.HTTP_201_CREATED, response_model=BookingOut, dependencies=[query_budget(7)])
+async def create_booking(
+    payload: BookingCreatePayload,
+    user: CurrentUserDep,
+    session: DbSessionDep,
+    busy_time_client: BusyTimeClientDep,
+):
+    stmt = (
+        select(TimeSlot.start_time, TimeSlot.end_time, Calendar.google_calendar_id, Calendar.timezone)
+        .join(Calendar, TimeSlot.calendar_id == Calendar.id)
+        .where(TimeSlot.id == payload.time_slot_id)
+    )
+    #타임슬롯이 없으면 insert_booking 이 알맞은 오류를 일으킵니다.
+    slot = (await session.execute(stmt)).one_or_none()
+    if slot is not None:
+        start, end = slot_range(payload.when, slot.start_time, slot.end_time, slot.timezone)
+        if await busy_time_client.is_busy(slot.google_calendar_id, start, end):
+            raise HostCalendarBusyError
+
+    guest = (await session.execute(select(User.id, User.email).where(User.username == user.username))).one()
+    guest_id = guest.id
+    #게스트의 다른 부킹과 UTC 시점으로 겹치면 INSERT 를 시도하지 않고 거절합니다.
+    #색인은 캐시이므로 동시에 들어온 요청이나 다른 워커의 부킹은 insert_booking 의 INSERT 조건이 막습니다.
+    #(INSERT 조건은 같은 시간대 캘린더끼리만 비교하므로, 시간대가 다른 호스트끼리는 이 확인에 의존합니다.)
+    if slot is not None:
+        guest_index = await get_guest_booking_index(session, guest_id)
+        if guest_index.find_overlap(start, end, exclude_slot_id=payload.time_slot_id) is not None:
+            raise GuestBookingOverlapError
+
+    booking = await insert_booking(session, guest_id=guest_id, **payload.model_dump())
+    enqueue_booking_created(
+        session,
+        booking,
+        google_calendar_id=slot.google_calendar_id,
+        start=start,
+        end=end,
+        timezone=slot.timezone,
+        guest_email=guest.email,
+    )
+    await session.commit()
+
+    row = (await session.execute(_booking_rows().where(Booking.id == booking.id))).one()
+    return model_response(BookingOut, row, status.HTTP_201_CREATED)
+
+
+@router.get("/bookings", response_model=BookingPage, dependencies=[query_budget(1)])
+async def guest_bookings(user: CurrentUserDep, session: ReadDbSessionDep, limit: LimitQuery = 20, cursor: CursorQuery = None):
+    return await paginate(session, guest_bookings_query(user), cursor, limit)
+
+
+@router.get("/bookings/export", dependencies=[query_budget(1)])
+async def export_guest_bookings(user: CurrentUserDep, session: ReadDbSessionDep, export_format: ExportFormatQuery = "ndjson"):
+    return stream_export(session, guest_bookings_query(user), export_format, "bookings")
+
+
+@router.get("/calendars/{host_username}/bookings", response_model=BookingPage, dependencies=[query_budget(1)])
+async def host_bookings(
+    host_username: str,
+    user: CurrentUserDep,
+    session: ReadDbSessionDep,
+    limit: LimitQuery = 20,
+    cursor: CursorQuery = None,
+):
+    return await paginate(session, host_bookings_query(user, host_username), cursor, limit)
+
+
+@router.get("/calendars/{host_username}/bookings/export", dependencies=[query_budget(1)])
+async def export_host_bookings(
+    host_username: str,
+    user: CurrentUserDep,
+    session: ReadDbSessionDep,
+    export_format: ExportFormatQuery = "ndjson",
+):
+    return stream_export(session, host_bookings_query(user, host_username), export_format, f"{host_username}-bookings")
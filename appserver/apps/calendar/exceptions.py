@@ -0,0 +1,97 @@
+from fastapi import HTTPException, status
+
+
+class TimeSlotNotFoundError(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="타임슬롯이 없습니다.",
+        )
+
+
+class SlotNotAvailableError(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="해당 요일에는 예약할 수 없는 타임슬롯입니다.",
+        )
+
+
+class SlotAlreadyBookedError(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="이미 예약된 타임슬롯입니다.",
+        )
+
+
+class GuestBookingOverlapError(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="같은 시간대에 이미 다른 부킹이 있습니다.",
+        )
+
+
+class CalendarNotFoundError(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="캘린더가 없습니다.",
+        )
+
+
+class HostOnlyError(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="캘린더 주최자만 사용할 수 있습니다.",
+        )
+
+
+class InvalidCursorError(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="잘못된 페이지 커서입니다.",
+        )
+
+
+class CalendarProviderError(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="호스트의 캘린더 일정을 가져오지 못했습니다.",
+        )
+
+
+class HostCalendarBusyError(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="호스트의 캘린더에 이미 일정이 있는 시간입니다.",
+        )
+
+
+class TimeSlotOverlapError(HTTPException):
+    def __init__(self, first: str, second: str):
+        super().__init__(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"같은 요일에 시간이 겹치는 타임슬롯이 있습니다. ({first}, {second})",
+        )
+
+
+class TimeSlotInUseError(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="부킹이 있는 타임슬롯은 삭제하거나 시각, 요일을 바꿀 수 없습니다.",
+        )
+
+
+class InvalidTimezoneError(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="알 수 없는 시간대입니다.",
+        )
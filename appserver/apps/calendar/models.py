@@ -2,7 +2,7 @@ from datetime import datetime, timezone, time, date
 from sqlmodel import SQLModel, Field, Relationship, Text, JSON, func
 from sqlmodel.main import SQLModelConfig
 from pydantic import EmailStr, AwareDatetime
-from sqlalchemy import UniqueConstraint
+from sqlalchemy import UniqueConstraint, Index
 from sqlalchemy_utc import UtcDateTime
 from sqlalchemy.dialects.postgresql import JSONB
 from typing import TYPE_CHECKING, Union
@@ -25,7 +25,7 @@ class Calendar(SQLModel, table=True):
   host_id: int = Field(foreign_key="users.id", unique=True)
   
   #1:1관계는 어느 쪽에서 관계를 짓던 상관없습니다.
-  host: "User" = Relationship(back_populates="calendar", sa_relationship_kwargs={"uselist": False, "single_parent": True})
+  host: "User" = Relationship(back_populates="calendar", sa_relationship_kwargs={"uselist": False, "single_parent": True, "lazy": "raise_on_sql"})
   
   #리스트형 객체 , 이를 데이터베이스에서 JSON자료형으로 다룹니다.
   # postgresql에서 JSONB자료형으로 다룹니다.
@@ -36,8 +36,14 @@ class Calendar(SQLModel, table=True):
   
   description: str = Field(sa_type=Text, description="캘린더 설명")
   google_calendar_id: str = Field(max_length=1024, description="구글 캘린더 id")
+  #타임슬롯의 시작, 종료 시각과 부킹 날짜는 이 시간대의 현지 시각입니다.
+  timezone: str = Field(
+    default="UTC",
+    max_length=64,
+    sa_column_kwargs={"server_default": "UTC"},
+    description="IANA 시간대 이름 (예: Asia/Seoul)")
 
-  time_slots: list["TimeSlot"] = Relationship(back_populates="calendar")
+  time_slots: list["TimeSlot"] = Relationship(back_populates="calendar", sa_relationship_kwargs={"lazy": "raise_on_sql"})
 
   created_at: AwareDatetime = Field(
     default=None,
@@ -65,13 +71,15 @@ class TimeSlot(SQLModel, table=True):
         description="예약 가능한 요일들"
     )
 
-    calendar_id: int = Field(foreign_key="calendars.id")
+    calendar_id: int = Field(foreign_key="calendars.id", index=True)
     calendar: Calendar = Relationship(
         back_populates="time_slots",
+        sa_relationship_kwargs={"lazy": "raise_on_sql"},
     )
 
     bookings: list["Booking"] = Relationship(
     back_populates="time_slot",
+    sa_relationship_kwargs={"lazy": "raise_on_sql"},
     )
 
 
@@ -96,6 +104,14 @@ class TimeSlot(SQLModel, table=True):
 
 class Booking(SQLModel, table=True):
     __tablename__ = "bookings"
+    __table_args__ = (
+        #하나의 타임슬롯은 하루에 한 번만 예약할 수 있습니다.
+        UniqueConstraint("time_slot_id", "when", name="uq_booking_time_slot_when"),
+        #게스트의 같은 날 다른 부킹을 찾거나, 게스트 부킹 목록을 (when, id) 순서로 읽을 때 사용합니다.
+        Index("ix_bookings_guest_id_when_id", "guest_id", "when", "id"),
+        #호스트 부킹 목록을 타임슬롯을 거치지 않고 캘린더별 (when, id) 순서로 읽을 때 사용합니다.
+        Index("ix_bookings_calendar_id_when_id", "calendar_id", "when", "id"),
+    )
 
     id: int = Field(default=None, primary_key=True)
     when: date
@@ -105,11 +121,16 @@ class Booking(SQLModel, table=True):
     time_slot_id: int = Field(foreign_key="time_slots.id")
     time_slot: TimeSlot = Relationship(
         back_populates="bookings",
+        sa_relationship_kwargs={"lazy": "raise_on_sql"},
     )
     
+    #time_slot.calendar_id 를 그대로 옮겨 둔 값, 타임슬롯의 캘린더는 바뀌지 않습니다.
+    calendar_id: int = Field(foreign_key="calendars.id")
+
     guest_id: int = Field(foreign_key="users.id")
     guest: "User" = Relationship(
         back_populates="bookings",
+        sa_relationship_kwargs={"lazy": "raise_on_sql"},
     )
     
     created_at: AwareDatetime = Field(
@@ -121,4 +142,17 @@ class Booking(SQLModel, table=True):
         default=None,
         nullable=False,
         sa_type=UtcDateTime,
-        sa_column_kwargs={"server_default": func.now(), "onupdate": lambda : datetime.now(timezone.utc)})
\ No newline at end of file
+        sa_column_kwargs={"server_default": func.now(), "onupdate": lambda : datetime.now(timezone.utc)})
+
+class SlotOccurrence(SQLModel, table=True):
+    #타임슬롯이 열리는 날짜를 앞으로 몇 주치 미리 펼쳐 둔 테이블입니다.
+    #weekdays JSON 을 거르지 않고 (calendar_id, day) 인덱스 범위 조회로 특정 날짜의 슬롯을 찾습니다.
+    #occurrences 모듈이 타임슬롯 변경 시 갱신하고, 주기적으로 기간을 앞으로 옮깁니다.
+    __tablename__ = "slot_occurrences"
+    __table_args__ = (
+        Index("ix_slot_occurrences_calendar_id_day", "calendar_id", "day"),
+    )
+
+    time_slot_id: int = Field(foreign_key="time_slots.id", primary_key=True, ondelete="CASCADE")
+    day: date = Field(primary_key=True)
+    calendar_id: int = Field(foreign_key="calendars.id", ondelete="CASCADE")
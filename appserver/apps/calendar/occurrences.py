@@ -0,0 +1,158 @@
+import asyncio
+import logging
+from datetime import date, datetime, timedelta, timezone
+from typing import Iterable, NamedTuple, Sequence
+
+from sqlalchemy import Connection, delete, event, insert, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from appserver.config import settings
+from .models import SlotOccurrence, TimeSlot
+
+logger = logging.getLogger(__name__)
+
+#기간을 옮길 때 한 번에 다시 펼치는 타임슬롯 수, 배치마다 커밋합니다.
+REFRESH_BATCH_SIZE = 500
+
+
+class OccurrenceSlot(NamedTuple):
+    id: int
+    calendar_id: int
+    weekdays: Sequence[int]
+
+
+def today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+def occurrence_window(start: date | None = None) -> tuple[date, date]:
+    #[start, end) 기간의 날짜를 펼쳐 둡니다.
+    start = start or today()
+    return start, start + timedelta(weeks=settings.slot_occurrence_weeks)
+
+
+def occurrence_days(weekdays: Iterable[int], start: date, end: date) -> list[date]:
+    days = []
+    for weekday in set(weekdays):
+        day = start + timedelta(days=(weekday - start.weekday()) % 7)
+        while day < end:
+            days.append(day)
+            day += timedelta(weeks=1)
+    return sorted(days)
+
+
+def occurrence_rows(time_slot_id: int, calendar_id: int, weekdays: Sequence[int], start: date, end: date) -> list[dict]:
+    return [
+        {"time_slot_id": time_slot_id, "day": day, "calendar_id": calendar_id}
+        for day in occurrence_days(weekdays, start, end)
+    ]
+
+
+def sync_time_slot_occurrences(connection: Connection, time_slot: TimeSlot, start: date | None = None) -> None:
+    """타임슬롯 하나의 날짜 행을 현재 weekdays 기준으로 다시 만듭니다.
+
+    flush 중인 동기 커넥션에서 실행하므로 타임슬롯 변경과 같은 트랜잭션에 묶입니다.
+    """
+    start, end = occurrence_window(start)
+    connection.execute(delete(SlotOccurrence).where(SlotOccurrence.time_slot_id == time_slot.id))
+    rows = occurrence_rows(time_slot.id, time_slot.calendar_id, time_slot.weekdays, start, end)
+    if rows:
+        connection.execute(insert(SlotOccurrence), rows)
+
+
+@event.listens_for(TimeSlot, "after_insert")
+def _sync_inserted_time_slot(mapper, connection: Connection, target: TimeSlot):
+    sync_time_slot_occurrences(connection, target)
+
+
+@event.listens_for(TimeSlot, "after_update")
+def _sync_updated_time_slot(mapper, connection: Connection, target: TimeSlot):
+    attrs = inspect(target).attrs
+    if attrs.weekdays.history.has_changes() or attrs.calendar_id.history.has_changes():
+        sync_time_slot_occurrences(connection, target)
+
+
+@event.listens_for(TimeSlot, "before_delete")
+def _delete_time_slot_occurrences(mapper, connection: Connection, target: TimeSlot):
+    connection.execute(delete(SlotOccurrence).where(SlotOccurrence.time_slot_id == target.id))
+
+
+async def replace_occurrences(session: AsyncSession, slots: Sequence[OccurrenceSlot], start: date | None = None) -> int:
+    """여러 타임슬롯(id, calendar_id, weekdays)의 날짜 행을 DELETE, INSERT 한 번씩으로 다시 만듭니다.
+
+    ORM 이벤트를 거치지 않고 타임슬롯을 쓴 경우 같은 트랜잭션 안에서 호출합니다. 만든 행 수를 돌려줍니다.
+    """
+    if not slots:
+        return 0
+    start, end = occurrence_window(start)
+    rows = [
+        row
+        for slot in slots
+        for row in occurrence_rows(slot.id, slot.calendar_id, slot.weekdays, start, end)
+    ]
+    await session.execute(delete(SlotOccurrence).where(SlotOccurrence.time_slot_id.in_([slot.id for slot in slots])))
+    if rows:
+        await session.execute(insert(SlotOccurrence), rows)
+    return len(rows)
+
+
+async def refresh_occurrences(session: AsyncSession, start: date | None = None) -> int:
+    """기간을 start 기준으로 옮기고 모든 타임슬롯의 날짜 행을 다시 만듭니다.
+
+    ORM 이벤트를 거치지 않은 변경(대량 UPDATE/DELETE 등)으로 어긋난 행도 여기서 바로잡힙니다.
+    만든 행 수를 돌려줍니다.
+    """
+    start, end = occurrence_window(start)
+    await session.execute(delete(SlotOccurrence).where(SlotOccurrence.day < start))
+    await session.execute(delete(SlotOccurrence).where(SlotOccurrence.time_slot_id.not_in(select(TimeSlot.id))))
+    await session.commit()
+
+    total = 0
+    last_id = 0
+    while True:
+        stmt = (
+            select(TimeSlot.id, TimeSlot.calendar_id, TimeSlot.weekdays)
+            .where(TimeSlot.id > last_id)
+            .order_by(TimeSlot.id)
+            .limit(REFRESH_BATCH_SIZE)
+        )
+        slots = (await session.execute(stmt)).all()
+        if not slots:
+            return total
+
+        total += await replace_occurrences(session, slots, start)
+        await session.commit()
+        last_id = slots[-1].id
+
+
+async def watch_occurrences(session_factory: async_sessionmaker[AsyncSession], interval: float) -> None:
+    while True:
+        try:
+            async with session_factory() as session:
+                total = await refresh_occurrences(session)
+            logger.info("타임슬롯 날짜 %d개를 갱신했습니다.", total)
+        except Exception as exc:
+            logger.warning("타임슬롯 날짜를 갱신하지 못했습니다: %r", exc)
+        await asyncio.sleep(interval)
+
+
+def is_materialized(day: date) -> bool:
+    #갱신 주기만큼 기간이 늦게 옮겨질 수 있으므로 마지막 하루는 펼쳐 둔 것으로 보지 않습니다.
+    start, end = occurrence_window()
+    return start <= day < end - timedelta(days=1)
+
+
+async def find_open_time_slots(session: AsyncSession, calendar_id, day: date) -> list[TimeSlot]:
+    if is_materialized(day):
+        #(calendar_id, day) 인덱스 범위 조회
+        stmt = (
+            select(TimeSlot)
+            .join(SlotOccurrence, SlotOccurrence.time_slot_id == TimeSlot.id)
+            .where(SlotOccurrence.calendar_id == calendar_id, SlotOccurrence.day == day)
+            .order_by(TimeSlot.start_time, TimeSlot.id)
+        )
+        return list((await session.scalars(stmt)).all())
+
+    #펼쳐 두지 않은 날짜는 캘린더의 타임슬롯을 모두 읽어서 요일로 거릅니다.
+    stmt = select(TimeSlot).where(TimeSlot.calendar_id == calendar_id).order_by(TimeSlot.start_time, TimeSlot.id)
+    return [time_slot for time_slot in (await session.scalars(stmt)).all() if day.weekday() in time_slot.weekdays]
@@ -0,0 +1,92 @@
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from appserver.config import settings
+from appserver.libs.cache import TTLCache
+from appserver.libs.datetime.zones import local_to_utc
+from appserver.libs.intervals import IntervalIndex
+from .models import Booking, Calendar, TimeSlot
+
+
+#게스트가 가진 오늘 이후 부킹을 UTC 시점 (시작, 종료) 구간 색인으로 들고 있습니다. 값은 부킹의 time_slot_id 입니다.
+#호스트마다 시간대가 달라도 같은 기준으로 비교할 수 있습니다.
+@dataclass(frozen=True)
+class GuestBookingIndex:
+    guest_id: int
+    since: date
+    index: IntervalIndex[datetime, int]
+
+    def find_overlap(self, start: datetime, end: datetime, exclude_slot_id: int | None = None) -> int | None:
+        """[start, end) 와 겹치는 부킹의 time_slot_id 를 돌려줍니다. since 이전의 부킹은 색인에 없습니다."""
+        for time_slot_id in self.index.overlapping(start, end):
+            if time_slot_id != exclude_slot_id:
+                return time_slot_id
+        return None
+
+
+async def load_guest_booking_index(session: AsyncSession, guest_id: int, since: date | None = None) -> GuestBookingIndex:
+    since = since or datetime.now(timezone.utc).date()
+    stmt = (
+        select(Booking.when, TimeSlot.start_time, TimeSlot.end_time, Booking.time_slot_id, Calendar.timezone)
+        .join(TimeSlot, Booking.time_slot_id == TimeSlot.id)
+        .join(Calendar, TimeSlot.calendar_id == Calendar.id)
+        #현지 날짜는 UTC 날짜와 하루까지 차이가 나므로 하루 앞부터 읽습니다.
+        .where(Booking.guest_id == guest_id, Booking.when >= since - timedelta(days=1))
+    )
+    return GuestBookingIndex(
+        guest_id=guest_id,
+        since=since,
+        index=IntervalIndex(
+            (local_to_utc(when, start_time, zone), local_to_utc(when, end_time, zone), time_slot_id)
+            for when, start_time, end_time, time_slot_id, zone in await session.execute(stmt)
+        ),
+    )
+
+
+guest_booking_indexes: TTLCache[int, GuestBookingIndex] = TTLCache(
+    maxsize=settings.guest_booking_index_cache_size,
+    ttl=settings.guest_booking_index_cache_ttl,
+)
+
+
+async def get_guest_booking_index(session: AsyncSession, guest_id: int) -> GuestBookingIndex:
+    index = guest_booking_indexes.get(guest_id)
+    if index is None or index.since != datetime.now(timezone.utc).date():
+        index = await load_guest_booking_index(session, guest_id)
+        guest_booking_indexes.set(guest_id, index)
+    return index
+
+
+def schedule_guest_invalidation(session: AsyncSession | Session, guest_id: int | None) -> None:
+    #ORM flush 를 거치지 않고 부킹이나 타임슬롯을 쓴 경우 호출합니다. guest_id 가 None 이면 모든 게스트의 색인을 비웁니다.
+    session.info.setdefault("guest_booking_invalidations", set()).add(guest_id)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_guest_invalidations(session: Session, flush_context):
+    pending = session.info.setdefault("guest_booking_invalidations", set())
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(instance, Booking):
+            pending.update({instance.guest_id, *inspect(instance).attrs.guest_id.history.deleted})
+        elif isinstance(instance, (TimeSlot, Calendar)) and instance not in session.new:
+            #타임슬롯 시각이나 캘린더 시간대가 바뀌면 예약한 게스트를 따로 찾지 않고 모두 비웁니다. (드문 변경)
+            pending.add(None)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_guest_invalidations(session: Session):
+    pending = session.info.pop("guest_booking_invalidations", set())
+    if None in pending:
+        guest_booking_indexes.clear()
+        return
+    for guest_id in pending:
+        guest_booking_indexes.pop(guest_id)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_guest_invalidations(session: Session, previous_transaction):
+    session.info.pop("guest_booking_invalidations", None)
@@ -0,0 +1,243 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime, time, timezone
+from typing import Annotated, Iterable, Mapping, Protocol, Sequence
+
+import httpx
+from fastapi import Depends
+
+from appserver.config import Settings, settings
+from appserver.libs.cache import TTLCache
+from appserver.libs.datetime.zones import UTC, local_to_utc
+from .exceptions import CalendarProviderError
+
+logger = logging.getLogger(__name__)
+
+GOOGLE_FREEBUSY_URL = "https://www.googleapis.com/calendar/v3/freeBusy"
+#freeBusy 요청 하나에 넣을 수 있는 캘린더 수
+GOOGLE_FREEBUSY_MAX_CALENDARS = 50
+
+
+@dataclass(frozen=True)
+class BusyInterval:
+    start: datetime
+    end: datetime
+
+    def overlaps(self, start: datetime, end: datetime) -> bool:
+        return self.start < end and start < self.end
+
+
+class CalendarProvider(Protocol):
+    async def fetch_busy(
+        self, calendar_ids: Sequence[str], time_min: datetime, time_max: datetime
+    ) -> dict[str, list[BusyInterval]]: ...
+
+
+def _parse_datetime(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+class GoogleCalendarProvider:
+    def __init__(self, access_token: str, timeout: float, transport: httpx.AsyncBaseTransport | None = None):
+        self.access_token = access_token
+        self.timeout = timeout
+        self.transport = transport
+        self._client: httpx.AsyncClient | None = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        #커넥션을 재사용하도록 프로세스에 클라이언트 하나만 둡니다.
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+                headers={"Authorization": f"Bearer {self.access_token}"},
+                transport=self.transport,
+            )
+        return self._client
+
+    async def fetch_busy(
+        self, calendar_ids: Sequence[str], time_min: datetime, time_max: datetime
+    ) -> dict[str, list[BusyInterval]]:
+        result: dict[str, list[BusyInterval]] = {}
+        for offset in range(0, len(calendar_ids), GOOGLE_FREEBUSY_MAX_CALENDARS):
+            chunk = calendar_ids[offset:offset + GOOGLE_FREEBUSY_MAX_CALENDARS]
+            body = {
+                "timeMin": time_min.isoformat(),
+                "timeMax": time_max.isoformat(),
+                "items": [{"id": calendar_id} for calendar_id in chunk],
+            }
+            try:
+                response = await self._get_client().post(GOOGLE_FREEBUSY_URL, json=body)
+                response.raise_for_status()
+            except httpx.HTTPError as exc:
+                raise CalendarProviderError from exc
+
+            calendars = response.json().get("calendars", {})
+            for calendar_id in chunk:
+                data = calendars.get(calendar_id, {})
+                if data.get("errors"):
+                    logger.warning("%s 캘린더의 일정을 가져오지 못했습니다: %s", calendar_id, data["errors"])
+                result[calendar_id] = [
+                    BusyInterval(_parse_datetime(item["start"]), _parse_datetime(item["end"]))
+                    for item in data.get("busy", ())
+                ]
+        return result
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+class FakeCalendarProvider:
+    """네트워크 없이 정해 둔 일정을 돌려주는 제공자, 테스트와 벤치마크용입니다."""
+
+    def __init__(self, busy: Mapping[str, Iterable[BusyInterval]] | None = None, latency: float = 0.0):
+        self.busy = {calendar_id: list(intervals) for calendar_id, intervals in (busy or {}).items()}
+        self.latency = latency
+        self.calls = 0
+        self.requested_calendars = 0
+
+    async def fetch_busy(
+        self, calendar_ids: Sequence[str], time_min: datetime, time_max: datetime
+    ) -> dict[str, list[BusyInterval]]:
+        self.calls += 1
+        self.requested_calendars += len(calendar_ids)
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return {
+            calendar_id: [
+                interval for interval in self.busy.get(calendar_id, ())
+                if interval.overlaps(time_min, time_max)
+            ]
+            for calendar_id in calendar_ids
+        }
+
+    async def aclose(self) -> None:
+        pass
+
+
+def slot_range(day: date, start_time: time, end_time: time, zone_name: str = UTC) -> tuple[datetime, datetime]:
+    #타임슬롯 시각은 캘린더 시간대(zone_name)의 현지 시각입니다. UTC 시점으로 바꿔서 돌려줍니다.
+    return local_to_utc(day, start_time, zone_name), local_to_utc(day, end_time, zone_name)
+
+
+def month_range(year: int, month: int) -> tuple[datetime, datetime]:
+    start = datetime(year, month, 1, tzinfo=timezone.utc)
+    end = datetime(year + month // 12, month % 12 + 1, 1, tzinfo=timezone.utc)
+    return start, end
+
+
+class BusyTimeClient:
+    """호스트 구글 캘린더의 바쁜 시간을 월 단위로 가져옵니다.
+
+    여러 캘린더를 한 번의 요청으로 묶어서 가져오고, 같은 (캘린더, 연, 월)을 동시에 요청하면
+    먼저 나간 요청 하나의 결과를 함께 기다립니다. 결과는 짧은 시간 동안만 캐시하고 저장하지는 않습니다.
+    """
+
+    def __init__(self, provider: CalendarProvider, maxsize: int, ttl: float):
+        self.provider = provider
+        self.cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._in_flight: dict[tuple[str, int, int], asyncio.Future] = {}
+
+    async def get_month_busy(
+        self, calendar_ids: Iterable[str], year: int, month: int
+    ) -> dict[str, tuple[BusyInterval, ...]]:
+        keys = {calendar_id: (calendar_id, year, month) for calendar_id in calendar_ids if calendar_id}
+        result: dict[str, tuple[BusyInterval, ...]] = {}
+        waiting: dict[str, asyncio.Future] = {}
+        to_fetch: list[str] = []
+
+        for calendar_id, key in keys.items():
+            cached = self.cache.get(key)
+            if cached is not None:
+                result[calendar_id] = cached
+            elif key in self._in_flight:
+                waiting[calendar_id] = self._in_flight[key]
+            else:
+                to_fetch.append(calendar_id)
+
+        if to_fetch:
+            loop = asyncio.get_running_loop()
+            futures = {calendar_id: loop.create_future() for calendar_id in to_fetch}
+            for calendar_id, future in futures.items():
+                self._in_flight[keys[calendar_id]] = future
+            waiting.update(futures)
+            try:
+                fetched = await self.provider.fetch_busy(to_fetch, *month_range(year, month))
+            except BaseException as exc:
+                #요청이 취소되어도 같은 결과를 기다리던 다른 요청은 실패로 끝나야 합니다.
+                error = exc if isinstance(exc, Exception) else CalendarProviderError()
+                for future in futures.values():
+                    future.set_exception(error)
+                    #기다리는 쪽이 없어도 경고가 남지 않도록 확인한 것으로 표시합니다.
+                    future.exception()
+                if not isinstance(exc, Exception):
+                    raise
+            else:
+                for calendar_id, future in futures.items():
+                    intervals = tuple(fetched.get(calendar_id, ()))
+                    self.cache.set(keys[calendar_id], intervals)
+                    future.set_result(intervals)
+            finally:
+                for calendar_id in to_fetch:
+                    self._in_flight.pop(keys[calendar_id], None)
+
+        for calendar_id, future in waiting.items():
+            result[calendar_id] = await future
+        return result
+
+    async def get_busy(self, calendar_id: str, start: datetime, end: datetime) -> list[BusyInterval]:
+        #start ~ end 가 걸친 달을 모두 가져와서 겹치는 일정만 돌려줍니다.
+        months = []
+        year, month = start.year, start.month
+        while (year, month) <= (end.year, end.month):
+            months.append((year, month))
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+        intervals = []
+        for year, month in months:
+            busy = await self.get_month_busy([calendar_id], year, month)
+            intervals.extend(interval for interval in busy.get(calendar_id, ()) if interval.overlaps(start, end))
+        return intervals
+
+    async def is_busy(self, calendar_id: str, start: datetime, end: datetime) -> bool:
+        return bool(await self.get_busy(calendar_id, start, end))
+
+    async def aclose(self) -> None:
+        await self.provider.aclose()
+
+
+CALENDAR_PROVIDERS = ("google", "fake")
+
+
+def verify_provider_settings(_settings: Settings = settings) -> None:
+    #토큰 없이 띄우면 호스트 일정을 확인하지 못해 실제 일정과 겹치는 부킹을 받게 되므로 서버를 띄우지 않습니다.
+    if _settings.calendar_provider not in CALENDAR_PROVIDERS:
+        raise ValueError(f"CALENDAR_PROVIDER 는 {' 또는 '.join(CALENDAR_PROVIDERS)} 이어야 합니다: {_settings.calendar_provider!r}")
+    if _settings.calendar_provider == "google" and not _settings.google_calendar_access_token:
+        raise ValueError(
+            "GOOGLE_CALENDAR_ACCESS_TOKEN 이 없습니다. 호스트 일정을 확인하지 않으려면 CALENDAR_PROVIDER=fake 로 지정합니다."
+        )
+    if _settings.calendar_provider == "fake":
+        logger.warning("calendar provider is 'fake'; host calendars are NOT checked for conflicting events")
+
+
+def build_provider() -> CalendarProvider:
+    if settings.calendar_provider == "fake":
+        return FakeCalendarProvider()
+    return GoogleCalendarProvider(settings.google_calendar_access_token, settings.calendar_provider_timeout)
+
+
+busy_time_client = BusyTimeClient(
+    build_provider(),
+    maxsize=settings.busy_time_cache_size,
+    ttl=settings.busy_time_cache_ttl,
+)
+
+
+def get_busy_time_client() -> BusyTimeClient:
+    return busy_time_client
+
+BusyTimeClientDep = Annotated[BusyTimeClient, Depends(get_busy_time_client)]
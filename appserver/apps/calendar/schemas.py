@@ -0,0 +1,106 @@
+from datetime import date, datetime, time
+from typing import Self
+
+from pydantic import model_validator
+from sqlmodel import SQLModel, Field
+
+
+class BookingOut(SQLModel):
+    id: int
+    when: date
+    topic: str
+    description: str
+    time_slot_id: int
+    guest_id: int
+    start_time: time
+    end_time: time
+    created_at: datetime
+
+
+class BookingCreatePayload(SQLModel):
+    time_slot_id: int
+    when: date
+    topic: str = Field(min_length=1, max_length=255)
+    description: str = Field(max_length=2000)
+
+
+class BookingPage(SQLModel):
+    items: list[BookingOut]
+    #다음 페이지를 요청할 때 cursor 로 넘기는 값, 마지막 페이지면 None 입니다.
+    next_cursor: str | None
+
+
+class TimeSlotOut(SQLModel):
+    id: int
+    start_time: time
+    end_time: time
+    weekdays: list[int]
+
+
+class TimeSlotIn(SQLModel):
+    #id 가 있으면 해당 타임슬롯을 고치고, 없으면 새로 만듭니다.
+    id: int | None = None
+    start_time: time
+    end_time: time
+    weekdays: list[int] = Field(min_length=1, max_length=7, description="예약 가능한 요일들 (월 0 ~ 일 6)")
+
+    @model_validator(mode="after")
+    def verify_time_slot(self) -> Self:
+        if self.start_time >= self.end_time:
+            raise ValueError("시작 시각은 종료 시각보다 빨라야 합니다.")
+        if any(weekday not in range(7) for weekday in self.weekdays):
+            raise ValueError("요일은 0(월) ~ 6(일) 사이의 값이어야 합니다.")
+        if len(set(self.weekdays)) != len(self.weekdays):
+            raise ValueError("같은 요일을 두 번 지정할 수 없습니다.")
+        return self
+
+
+def _verify_unique_ids(time_slots: list[TimeSlotIn], *others: int) -> None:
+    ids = [time_slot.id for time_slot in time_slots if time_slot.id is not None] + list(others)
+    if len(set(ids)) != len(ids):
+        raise ValueError("같은 타임슬롯을 두 번 지정할 수 없습니다.")
+
+
+class TimeSlotSchedulePayload(SQLModel):
+    #캘린더의 타임슬롯 전체, 목록에 없는 기존 타임슬롯은 삭제합니다.
+    time_slots: list[TimeSlotIn] = Field(max_length=500)
+
+    @model_validator(mode="after")
+    def verify_ids(self) -> Self:
+        _verify_unique_ids(self.time_slots)
+        return self
+
+
+class TimeSlotPatchPayload(SQLModel):
+    #목록에 없는 기존 타임슬롯은 그대로 둡니다.
+    upsert: list[TimeSlotIn] = Field(default_factory=list, max_length=500)
+    delete: list[int] = Field(default_factory=list, max_length=500)
+
+    @model_validator(mode="after")
+    def verify_ids(self) -> Self:
+        _verify_unique_ids(self.upsert, *self.delete)
+        return self
+
+
+class AvailabilitySummaryOut(SQLModel):
+    year: int
+    month: int
+    #days 의 일자를 계산한 시간대
+    timezone: str
+    days_in_month: int
+    #예약 가능한 슬롯이 하나라도 있는 날은 (일 - 1) 번째 비트가 켜집니다. (1일이 가장 낮은 비트)
+    days: int
+
+
+class CalendarHostOut(SQLModel):
+    username: str
+    display_name: str
+
+
+class CalendarDetailOut(SQLModel):
+    id: int
+    topics: list[str]
+    description: str
+    timezone: str
+    host: CalendarHostOut
+    time_slots: list[TimeSlotOut]
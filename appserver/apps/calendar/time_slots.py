@@ -0,0 +1,188 @@
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import time
+from typing import Iterable, Mapping, Sequence
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from appserver.libs.intervals import IntervalIndex
+from .availability import schedule_calendar_invalidation
+from .exceptions import TimeSlotInUseError, TimeSlotNotFoundError, TimeSlotOverlapError
+from .models import Booking, SlotOccurrence, TimeSlot
+from .occurrences import OccurrenceSlot, replace_occurrences
+from .schemas import TimeSlotIn
+
+
+@dataclass(frozen=True)
+class SlotSpec:
+    start_time: time
+    end_time: time
+    weekdays: tuple[int, ...]
+
+    @classmethod
+    def from_payload(cls, time_slot: TimeSlotIn) -> "SlotSpec":
+        return cls(time_slot.start_time, time_slot.end_time, tuple(sorted(time_slot.weekdays)))
+
+    def label(self) -> str:
+        return f"{self.start_time:%H:%M}-{self.end_time:%H:%M}"
+
+
+@dataclass
+class TimeSlotChanges:
+    inserts: list[SlotSpec] = field(default_factory=list)
+    updates: dict[int, SlotSpec] = field(default_factory=dict)
+    deletes: list[int] = field(default_factory=list)
+    #바뀌지 않은 것을 포함해 적용 후 남는 기존 타임슬롯
+    kept: dict[int, SlotSpec] = field(default_factory=dict)
+
+    def __bool__(self) -> bool:
+        return bool(self.inserts or self.updates or self.deletes)
+
+
+def find_overlap(slots: Iterable[SlotSpec]) -> tuple[SlotSpec, SlotSpec] | None:
+    """같은 요일에 시간이 겹치는 타임슬롯 한 쌍을 찾습니다.
+
+    요일별 구간 색인을 만들고(O(n log n)), 시작 순으로 앞선 슬롯들의 가장 늦은 종료 시각보다
+    일찍 시작하는 슬롯을 찾습니다.
+    """
+    by_weekday: dict[int, list[tuple[time, time, SlotSpec]]] = defaultdict(list)
+    for spec in slots:
+        for weekday in spec.weekdays:
+            by_weekday[weekday].append((spec.start_time, spec.end_time, spec))
+
+    for intervals in by_weekday.values():
+        pair = IntervalIndex(intervals).find_overlapping_pair()
+        if pair is not None:
+            return pair
+    return None
+
+
+def diff_time_slots(existing: Mapping[int, SlotSpec], desired: Sequence[TimeSlotIn]) -> TimeSlotChanges:
+    """기존 타임슬롯을 desired 목록과 같게 만들기 위한 변경만 계산합니다.
+
+    id 가 없는 항목은 아직 짝이 없는 기존 타임슬롯 중 시작, 종료 시각이 같은 것에 맞춰서
+    부킹이 걸린 타임슬롯을 지우고 다시 만들지 않게 합니다.
+    """
+    changes = TimeSlotChanges()
+    unmatched = dict(existing)
+    without_id: list[SlotSpec] = []
+
+    for time_slot in desired:
+        spec = SlotSpec.from_payload(time_slot)
+        if time_slot.id is None:
+            without_id.append(spec)
+            continue
+        if time_slot.id not in existing:
+            raise TimeSlotNotFoundError
+        del unmatched[time_slot.id]
+        changes.kept[time_slot.id] = spec
+        if existing[time_slot.id] != spec:
+            changes.updates[time_slot.id] = spec
+
+    by_times: dict[tuple[time, time], list[int]] = defaultdict(list)
+    for slot_id, spec in sorted(unmatched.items()):
+        by_times[spec.start_time, spec.end_time].append(slot_id)
+    for spec in without_id:
+        candidates = by_times.get((spec.start_time, spec.end_time))
+        if not candidates:
+            changes.inserts.append(spec)
+            continue
+        slot_id = candidates.pop(0)
+        del unmatched[slot_id]
+        changes.kept[slot_id] = spec
+        if existing[slot_id] != spec:
+            changes.updates[slot_id] = spec
+
+    changes.deletes = sorted(unmatched)
+    return changes
+
+
+def patch_schedule(
+    existing: Mapping[int, SlotSpec], upsert: Sequence[TimeSlotIn], delete_ids: Sequence[int]
+) -> list[TimeSlotIn]:
+    #PATCH 요청을 적용한 뒤의 전체 타임슬롯 목록으로 바꿔서 PUT 과 같은 방식으로 비교합니다.
+    deleted = set(delete_ids)
+    if deleted - existing.keys():
+        raise TimeSlotNotFoundError
+    changed = {time_slot.id for time_slot in upsert if time_slot.id is not None}
+    untouched = [
+        TimeSlotIn(id=slot_id, start_time=spec.start_time, end_time=spec.end_time, weekdays=list(spec.weekdays))
+        for slot_id, spec in existing.items()
+        if slot_id not in changed and slot_id not in deleted
+    ]
+    return [*untouched, *upsert]
+
+
+async def load_time_slots(session: AsyncSession, calendar_id: int) -> dict[int, SlotSpec]:
+    stmt = (
+        select(TimeSlot.id, TimeSlot.start_time, TimeSlot.end_time, TimeSlot.weekdays)
+        .where(TimeSlot.calendar_id == calendar_id)
+    )
+    return {
+        row.id: SlotSpec(row.start_time, row.end_time, tuple(sorted(row.weekdays)))
+        for row in await session.execute(stmt)
+    }
+
+
+async def apply_time_slot_changes(
+    session: AsyncSession, calendar_id: int, existing: Mapping[int, SlotSpec], changes: TimeSlotChanges
+) -> dict[int, SlotSpec]:
+    """변경을 종류별로 한 번씩 묶어서 실행하고 적용 후의 타임슬롯을 돌려줍니다. 커밋은 호출한 쪽에서 합니다.
+
+    ORM 객체를 만들지 않는 대량 실행이라 타임슬롯 이벤트가 불리지 않으므로,
+    날짜 행과 예약 가능 현황 캐시는 여기서 함께 갱신합니다.
+    """
+    schedule = dict(changes.kept)
+    if not changes:
+        return schedule
+
+    #부킹이 걸린 타임슬롯은 지우지도, 시각이나 요일을 바꾸지도 않습니다. 예약한 시간이 달라지기 때문입니다.
+    if touched := [*changes.deletes, *changes.updates]:
+        in_use = await session.scalar(
+            select(Booking.time_slot_id).where(Booking.time_slot_id.in_(touched)).limit(1)
+        )
+        if in_use is not None:
+            raise TimeSlotInUseError
+
+    if changes.deletes:
+        await session.execute(delete(SlotOccurrence).where(SlotOccurrence.time_slot_id.in_(changes.deletes)))
+        await session.execute(delete(TimeSlot).where(TimeSlot.id.in_(changes.deletes)))
+
+    if changes.updates:
+        await session.execute(update(TimeSlot), [
+            {"id": slot_id, "start_time": spec.start_time, "end_time": spec.end_time, "weekdays": list(spec.weekdays)}
+            for slot_id, spec in changes.updates.items()
+        ])
+
+    if changes.inserts:
+        inserted_ids = await session.scalars(
+            insert(TimeSlot).returning(TimeSlot.id, sort_by_parameter_order=True),
+            [
+                {
+                    "start_time": spec.start_time,
+                    "end_time": spec.end_time,
+                    "weekdays": list(spec.weekdays),
+                    "calendar_id": calendar_id,
+                }
+                for spec in changes.inserts
+            ],
+        )
+        schedule.update(zip(inserted_ids.all(), changes.inserts))
+
+    #요일이 바뀌지 않은 수정은 날짜 행에 영향이 없습니다.
+    resync = [
+        OccurrenceSlot(slot_id, calendar_id, spec.weekdays)
+        for slot_id, spec in schedule.items()
+        if slot_id not in existing or existing[slot_id].weekdays != spec.weekdays
+    ]
+    await replace_occurrences(session, resync)
+    schedule_calendar_invalidation(session, calendar_id)
+    return schedule
+
+
+def verify_schedule(desired: Sequence[TimeSlotIn]) -> None:
+    #같은 요일에 겹치는 타임슬롯이 있으면 거절합니다.
+    overlap = find_overlap(SlotSpec.from_payload(time_slot) for time_slot in desired)
+    if overlap is not None:
+        raise TimeSlotOverlapError(overlap[0].label(), overlap[1].label())
@@ -0,0 +1,48 @@
+from datetime import datetime, timezone
+from sqlmodel import SQLModel, Field, JSON, Text, func
+from pydantic import AwareDatetime
+from sqlalchemy import Index, UniqueConstraint
+from sqlalchemy_utc import UtcDateTime
+from sqlalchemy.dialects.postgresql import JSONB
+
+
+class OutboxStatus:
+    PENDING = "pending"
+    DONE = "done"
+    #재시도 횟수를 모두 쓴 메시지, 원인을 확인한 뒤 status 를 pending 으로 바꾸면 다시 처리합니다.
+    DEAD = "dead"
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+#부킹 생성 같은 변경과 같은 트랜잭션에 기록해 두고, 외부 연동(구글 캘린더, 이메일)은 워커가 나중에 처리합니다.
+class OutboxMessage(SQLModel, table=True):
+    __tablename__ = "outbox_messages"
+    __table_args__ = (
+        #같은 작업이 두 번 기록되지 않도록 하고, 외부 서비스에도 이 값을 넘겨서 중복 처리를 막습니다.
+        UniqueConstraint("idempotency_key", name="uq_outbox_idempotency_key"),
+        #워커가 처리할 차례인 메시지를 찾을 때 사용합니다.
+        Index("ix_outbox_messages_status_available_at_id", "status", "available_at", "id"),
+    )
+
+    id: int = Field(default=None, primary_key=True)
+    topic: str = Field(max_length=64, description="메시지를 처리할 싱크 이름")
+    idempotency_key: str = Field(max_length=128, description="중복 처리 방지 키")
+    payload: dict = Field(
+        sa_type=JSON().with_variant(JSONB(astext_type=Text()), "postgresql"),
+        description="싱크에 넘길 내용")
+
+    status: str = Field(default=OutboxStatus.PENDING, max_length=16)
+    attempts: int = Field(default=0, description="처리를 시도한 횟수")
+    #이 시각 이후에 처리합니다. 재시도 대기와 처리 중인 메시지의 점유 시간에도 사용합니다.
+    available_at: AwareDatetime = Field(default_factory=utcnow, nullable=False, sa_type=UtcDateTime)
+    last_error: str | None = Field(default=None, sa_type=Text)
+    processed_at: AwareDatetime | None = Field(default=None, sa_type=UtcDateTime)
+
+    created_at: AwareDatetime = Field(
+        default=None,
+        nullable=False,
+        sa_type=UtcDateTime,
+        sa_column_kwargs={"server_default": func.now()})
@@ -0,0 +1,155 @@
+import asyncio
+import base64
+import smtplib
+from datetime import datetime
+from email.message import EmailMessage
+from typing import Protocol
+from urllib.parse import quote
+
+import httpx
+
+from appserver.config import Settings, settings
+from appserver.libs.datetime.zones import get_zone
+
+#OutboxMessage.topic 값, 메시지를 처리할 싱크 이름입니다.
+CALENDAR_EVENT_TOPIC = "calendar.event"
+EMAIL_TOPIC = "email.notification"
+
+GOOGLE_EVENTS_URL = "https://www.googleapis.com/calendar/v3/calendars/{calendar_id}/events"
+
+
+class OutboxSink(Protocol):
+    #같은 idempotency_key 로 여러 번 호출될 수 있으므로 외부 서비스에 키를 넘겨 한 번만 반영되게 해야 합니다.
+    async def send(self, idempotency_key: str, payload: dict) -> None: ...
+
+    async def aclose(self) -> None: ...
+
+
+def google_event_id(idempotency_key: str) -> str:
+    #구글 캘린더 일정 id 는 base32hex 문자(a-v, 0-9)만 쓸 수 있습니다. 같은 키는 항상 같은 id 가 됩니다.
+    return base64.b32hexencode(idempotency_key.encode()).decode().rstrip("=").lower()
+
+
+class GoogleCalendarEventSink:
+    """호스트의 구글 캘린더에 부킹 일정을 만듭니다.
+
+    일정 id 를 idempotency_key 로 정해서 만들므로, 다시 보내면 409 로 거절되고 이미 만든 것으로 봅니다.
+    """
+
+    def __init__(self, access_token: str, timeout: float, transport: httpx.AsyncBaseTransport | None = None):
+        self.access_token = access_token
+        self.timeout = timeout
+        self.transport = transport
+        self._client: httpx.AsyncClient | None = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                headers={"Authorization": f"Bearer {self.access_token}"},
+                transport=self.transport,
+            )
+        return self._client
+
+    async def send(self, idempotency_key: str, payload: dict) -> None:
+        if not payload["google_calendar_id"]:
+            return
+        body = {
+            "id": google_event_id(idempotency_key),
+            "summary": payload["topic"],
+            "description": payload["description"],
+            "start": {"dateTime": payload["start"]},
+            "end": {"dateTime": payload["end"]},
+            "attendees": [{"email": payload["guest_email"]}],
+        }
+        url = GOOGLE_EVENTS_URL.format(calendar_id=quote(payload["google_calendar_id"], safe=""))
+        response = await self._get_client().post(url, json=body)
+        if response.status_code == httpx.codes.CONFLICT:
+            return
+        response.raise_for_status()
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+class SmtpEmailSink:
+    """게스트에게 예약 확정 메일을 보냅니다.
+
+    SMTP 에는 중복 전송을 막는 방법이 없으므로 Message-ID 를 idempotency_key 로 정해서
+    점유 시간이 지나 다시 보낸 메일은 받는 쪽에서 같은 메일로 묶이게 합니다.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        sender: str,
+        username: str = "",
+        password: str = "",
+        starttls: bool = True,
+        timeout: float = 10.0,
+    ):
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.timeout = timeout
+
+    def build_message(self, idempotency_key: str, payload: dict) -> EmailMessage:
+        zone = get_zone(payload["timezone"])
+        start = datetime.fromisoformat(payload["start"]).astimezone(zone)
+        end = datetime.fromisoformat(payload["end"]).astimezone(zone)
+
+        message = EmailMessage()
+        message["From"] = self.sender
+        message["To"] = payload["guest_email"]
+        message["Subject"] = f"[예약 확정] {payload['topic']}"
+        message["Message-ID"] = f"<{idempotency_key}@{self.sender.rpartition('@')[2] or 'localhost'}>"
+        message.set_content(
+            f"{start:%Y-%m-%d %H:%M} ~ {end:%H:%M} ({payload['timezone']}) 예약이 확정되었습니다.\n\n"
+            f"{payload['description']}\n"
+        )
+        return message
+
+    def _deliver(self, message: EmailMessage) -> None:
+        with smtplib.SMTP(self.host, self.port, timeout=self.timeout) as smtp:
+            if self.starttls:
+                smtp.starttls()
+            if self.username:
+                smtp.login(self.username, self.password)
+            smtp.send_message(message)
+
+    async def send(self, idempotency_key: str, payload: dict) -> None:
+        #smtplib 은 블로킹 API 이므로 스레드에서 보냅니다.
+        await asyncio.to_thread(self._deliver, self.build_message(idempotency_key, payload))
+
+    async def aclose(self) -> None:
+        pass
+
+
+def configured_sinks(_settings: Settings = settings) -> dict[str, OutboxSink]:
+    #자격 증명이 설정된 싱크만 만듭니다.
+    sinks: dict[str, OutboxSink] = {}
+    if _settings.google_calendar_access_token:
+        sinks[CALENDAR_EVENT_TOPIC] = GoogleCalendarEventSink(
+            _settings.google_calendar_access_token, _settings.calendar_provider_timeout
+        )
+    if _settings.smtp_host:
+        sinks[EMAIL_TOPIC] = SmtpEmailSink(
+            _settings.smtp_host,
+            _settings.smtp_port,
+            _settings.smtp_sender,
+            _settings.smtp_username,
+            _settings.smtp_password,
+            _settings.smtp_starttls,
+        )
+    return sinks
+
+
+def missing_topics(sinks: dict[str, OutboxSink]) -> list[str]:
+    #예약을 만들 때 쌓는 토픽 중에 처리할 싱크가 없는 것
+    return [topic for topic in (CALENDAR_EVENT_TOPIC, EMAIL_TOPIC) if topic not in sinks]
@@ -0,0 +1,190 @@
+import asyncio
+import logging
+import random
+from contextlib import suppress
+from dataclasses import dataclass, asdict
+from datetime import timedelta
+from typing import Mapping
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from .models import OutboxMessage, OutboxStatus, utcnow
+from .sinks import OutboxSink
+
+logger = logging.getLogger(__name__)
+
+BACKLOG_STATUSES = (OutboxStatus.PENDING, OutboxStatus.DEAD)
+
+
+def enqueue(session: AsyncSession, topic: str, idempotency_key: str, payload: dict) -> OutboxMessage:
+    #호출한 쪽의 트랜잭션과 함께 커밋되거나 롤백됩니다.
+    message = OutboxMessage(topic=topic, idempotency_key=idempotency_key, payload=payload)
+    session.add(message)
+    return message
+
+
+async def count_pending(session: AsyncSession) -> int:
+    stmt = select(func.count()).select_from(OutboxMessage).where(OutboxMessage.status == OutboxStatus.PENDING)
+    return await session.scalar(stmt)
+
+
+async def count_backlog(session: AsyncSession) -> dict[str, int]:
+    #전달되지 않은 메시지를 상태별로 셉니다. 계속 늘어나는 DONE 은 세지 않고 상태 인덱스 범위만 읽습니다.
+    stmt = (
+        select(OutboxMessage.status, func.count())
+        .where(OutboxMessage.status.in_(BACKLOG_STATUSES))
+        .group_by(OutboxMessage.status)
+    )
+    counts = dict.fromkeys(BACKLOG_STATUSES, 0)
+    counts.update((await session.execute(stmt)).tuples().all())
+    return counts
+
+
+async def watch_backlog(
+    session_factory: async_sessionmaker[AsyncSession], interval: float, counts: dict[str, int]
+) -> None:
+    #워커가 없거나 멈춰도 밀린 메시지가 지표에 보이도록 워커와 따로 셉니다.
+    while True:
+        try:
+            async with session_factory() as session:
+                counts.update(await count_backlog(session))
+        except Exception as exc:
+            logger.warning("아웃박스 메시지 수를 세지 못했습니다: %r", exc)
+        await asyncio.sleep(interval)
+
+
+def backoff_delay(attempts: int, base: float, maximum: float) -> float:
+    #attempts 번째 실패 후 기다릴 시간(초), 실패한 메시지들이 한꺼번에 다시 시도되지 않도록 흩어 놓습니다.
+    delay = min(maximum, base * 2 ** (attempts - 1))
+    return delay * random.uniform(0.5, 1.0)
+
+
+@dataclass
+class OutboxMetrics:
+    #처리를 기다리는 메시지 수 (재시도 대기 포함)
+    queue_depth: int = 0
+    in_flight: int = 0
+    delivered: int = 0
+    retried: int = 0
+    dead: int = 0
+
+    def snapshot(self) -> dict[str, int]:
+        return asdict(self)
+
+
+class OutboxWorker:
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        sinks: Mapping[str, OutboxSink],
+        *,
+        concurrency: int = 4,
+        batch_size: int = 50,
+        max_attempts: int = 8,
+        lease_seconds: float = 60,
+        base_delay: float = 1.0,
+        max_delay: float = 300.0,
+        poll_interval: float = 1.0,
+    ):
+        if concurrency < 1:
+            raise ValueError("concurrency 는 1 이상이어야 합니다.")
+        self.session_factory = session_factory
+        self.sinks = sinks
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.lease_seconds = lease_seconds
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.poll_interval = poll_interval
+        self.metrics = OutboxMetrics()
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._stopping = asyncio.Event()
+
+    async def claim(self, session: AsyncSession) -> list[OutboxMessage]:
+        now = utcnow()
+        stmt = (
+            select(OutboxMessage)
+            .where(OutboxMessage.status == OutboxStatus.PENDING, OutboxMessage.available_at <= now)
+            #싱크가 없는 토픽은 가져가지 않고 PENDING 으로 남겨 둡니다. 싱크를 설정하면 그때 처리합니다.
+            .where(OutboxMessage.topic.in_(list(self.sinks)))
+            .order_by(OutboxMessage.available_at, OutboxMessage.id)
+            .limit(self.batch_size)
+            #여러 워커가 동시에 읽어도 같은 행을 가져가지 않습니다. (PostgreSQL)
+            .with_for_update(skip_locked=True)
+        )
+        messages = list((await session.scalars(stmt)).all())
+
+        #처리하는 동안 다른 워커가 가져가지 않도록 점유 시간만큼 뒤로 미룹니다.
+        #워커가 중간에 죽으면 점유 시간이 지난 뒤 다시 처리되므로 싱크는 멱등해야 합니다.
+        lease_until = now + timedelta(seconds=self.lease_seconds)
+        for message in messages:
+            message.available_at = lease_until
+        await session.commit()
+        return messages
+
+    async def _deliver(self, message: OutboxMessage) -> Exception | None:
+        async with self._semaphore:
+            self.metrics.in_flight += 1
+            try:
+                sink = self.sinks.get(message.topic)
+                if sink is None:
+                    raise LookupError(f"{message.topic} 을 처리할 싱크가 없습니다.")
+                await sink.send(message.idempotency_key, message.payload)
+            except Exception as exc:
+                return exc
+            finally:
+                self.metrics.in_flight -= 1
+        return None
+
+    async def process_batch(self) -> int:
+        """처리할 차례인 메시지를 한 묶음 가져와 동시에 보내고, 결과를 한 번에 기록합니다."""
+        async with self.session_factory() as session:
+            messages = await self.claim(session)
+            if not messages:
+                return 0
+
+            errors = await asyncio.gather(*(self._deliver(message) for message in messages))
+
+            now = utcnow()
+            for message, error in zip(messages, errors):
+                message.attempts += 1
+                if error is None:
+                    message.status = OutboxStatus.DONE
+                    message.processed_at = now
+                    message.last_error = None
+                    self.metrics.delivered += 1
+                elif message.attempts >= self.max_attempts:
+                    message.status = OutboxStatus.DEAD
+                    message.last_error = repr(error)
+                    self.metrics.dead += 1
+                    logger.error("아웃박스 메시지 %s 처리를 포기합니다: %r", message.idempotency_key, error)
+                else:
+                    delay = backoff_delay(message.attempts, self.base_delay, self.max_delay)
+                    message.available_at = now + timedelta(seconds=delay)
+                    message.last_error = repr(error)
+                    self.metrics.retried += 1
+            await session.commit()
+            return len(messages)
+
+    async def refresh_queue_depth(self) -> int:
+        async with self.session_factory() as session:
+            self.metrics.queue_depth = await count_pending(session)
+        return self.metrics.queue_depth
+
+    def stop(self) -> None:
+        #처리 중인 묶음은 끝까지 보내고 다음 묶음을 가져오지 않습니다.
+        self._stopping.set()
+
+    async def run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                processed = await self.process_batch()
+                await self.refresh_queue_depth()
+            except Exception as exc:
+                logger.warning("아웃박스를 처리하지 못했습니다: %r", exc)
+                processed = 0
+            #한 묶음을 가득 채웠으면 밀린 메시지가 더 있을 수 있으므로 기다리지 않고 이어서 처리합니다.
+            if processed < self.batch_size:
+                with suppress(TimeoutError):
+                    await asyncio.wait_for(self._stopping.wait(), self.poll_interval)
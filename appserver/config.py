@@ -0,0 +1,175 @@
+import os
+from dataclasses import dataclass
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.environ.get(name)
+    if not value:
+        return default
+    return int(value)
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.environ.get(name)
+    if not value:
+        return default
+    return value.lower() in ("1", "true", "yes", "on")
+
+
+def _env_list(name: str) -> tuple[str, ...]:
+    value = os.environ.get(name, "")
+    return tuple(item.strip() for item in value.split(",") if item.strip())
+
+
+@dataclass(frozen=True)
+class Settings:
+    #비밀번호 해시(Argon2/bcrypt)를 동시에 처리할 스레드 수
+    password_hash_workers: int
+    #실행 중인 작업 외에 대기열에 쌓아둘 수 있는 최대 해시 요청 수
+    password_hash_queue_size: int
+    #Argon2 비용 설정, 값을 바꾸면 기존 해시는 다음 로그인 때 새 설정으로 다시 해시됩니다.
+    argon2_time_cost: int
+    argon2_memory_cost: int
+    argon2_parallelism: int
+
+    #postgresql:// 로 지정하면 asyncpg 드라이버를 사용합니다. (postgres 추가 의존성으로 설치합니다.)
+    database_dsn: str
+    database_echo: bool
+    #커넥션 풀 크기와 풀이 가득 찼을 때 추가로 열 수 있는 커넥션 수
+    database_pool_size: int
+    database_max_overflow: int
+    #풀에서 커넥션을 얻기 위해 기다릴 최대 시간(초)
+    database_pool_timeout: int
+    #커넥션을 꺼낼 때마다 살아있는지 확인할지 여부
+    database_pool_pre_ping: bool
+    #이 시간(초)보다 오래된 커넥션은 다시 연결합니다.
+    database_pool_recycle: int
+    #워커가 시작할 때 미리 열어 둘 커넥션 수
+    database_pool_warmup: int
+    #쿼리 하나가 실행될 수 있는 최대 시간(ms), 0이면 제한하지 않습니다.
+    database_statement_timeout: int
+    #읽기 전용 조회를 보낼 복제본 DSN 목록 (쉼표로 구분)
+    database_replica_dsns: tuple[str, ...]
+    #커밋한 세션은 이후 조회도 주 데이터베이스에서 읽습니다.
+    database_read_your_writes: bool
+    #복제본 상태를 확인하는 주기(초)
+    database_replica_check_interval: int
+    #요청이 선언한 쿼리 예산을 넘으면 경고 대신 예외를 일으킵니다. 개발/테스트 환경에서 켭니다.
+    database_query_budget_strict: bool
+
+    #(calendar_id, year, month) 단위로 캐시하는 월별 예약 가능 현황 개수와 유효 시간(초)
+    availability_cache_size: int
+    availability_cache_ttl: int
+    #예약 가능 현황 요약 응답의 Cache-Control max-age(초), 리버스 프록시가 이 시간 동안 다시 묻지 않고 응답합니다.
+    availability_http_max_age: int
+
+    #타임슬롯이 열리는 날짜를 미리 펼쳐 둘 기간(주)과 기간을 앞으로 옮기는 주기(초)
+    slot_occurrence_weeks: int
+    slot_occurrence_refresh_interval: int
+
+    #아웃박스 워커가 동시에 보내는 메시지 수, 한 번에 가져오는 메시지 수, 최대 시도 횟수, 새 메시지를 확인하는 주기(초)
+    outbox_concurrency: int
+    outbox_batch_size: int
+    outbox_max_attempts: int
+    outbox_poll_interval: int
+    #상태별 아웃박스 메시지 수를 세는 주기(초), 워커가 없어도 밀린 메시지 수를 지표로 내보냅니다.
+    outbox_backlog_check_interval: int
+    #알림 이메일을 보낼 SMTP 서버, 호스트를 지정하지 않으면 이메일 싱크를 만들지 않습니다.
+    smtp_host: str
+    smtp_port: int
+    smtp_username: str
+    smtp_password: str
+    smtp_sender: str
+    smtp_starttls: bool
+
+    #호스트 캘린더 일정을 가져올 제공자("google" 또는 "fake"), 기본값은 google 이고 토큰이 없으면 서버를 띄우지 않습니다.
+    #fake 는 호스트 일정을 확인하지 않으므로 테스트와 로컬 개발에서만 CALENDAR_PROVIDER=fake 로 명시해서 사용합니다.
+    calendar_provider: str
+    google_calendar_access_token: str
+    #제공자 API 요청 제한 시간(초)
+    calendar_provider_timeout: float
+    #(캘린더, 연, 월) 단위로 캐시하는 바쁜 시간 개수와 유효 시간(초), 일정은 저장하지 않으므로 짧게 둡니다.
+    busy_time_cache_size: int
+    busy_time_cache_ttl: int
+
+    #게스트별 부킹 겹침 색인을 보관할 개수와 유효 시간(초), 다른 워커에서 바뀐 부킹은 이 시간만큼 늦게 반영됩니다.
+    guest_booking_index_cache_size: int
+    guest_booking_index_cache_ttl: int
+
+    #검증을 마친 인증 토큰을 보관할 개수와 최대 유효 시간(초), 토큰 만료 시각을 넘기지는 않습니다.
+    auth_token_cache_size: int
+    auth_token_cache_ttl: int
+
+    #username 으로 조회한 사용자 정보를 프로세스 안에 보관할 개수와 유효 시간(초)
+    user_cache_size: int
+    user_cache_ttl: int
+
+    #서버 워커 프로세스 수, 0이면 CPU 수만큼 띄웁니다.
+    server_workers: int
+    #종료할 때 처리 중인 요청과 백그라운드 작업을 기다리는 최대 시간(초)
+    server_shutdown_timeout: int
+
+    #계정 ID별, 클라이언트 IP별로 1분에 허용하는 로그인 시도 수, 0이면 제한하지 않습니다.
+    login_rate_limit_per_username: int
+    login_rate_limit_per_ip: int
+    #로그인 시도 수를 세는 키의 최대 개수(종류별)
+    login_rate_limit_size: int
+
+
+def load_settings() -> Settings:
+    google_calendar_access_token = os.environ.get("GOOGLE_CALENDAR_ACCESS_TOKEN", "")
+    return Settings(
+        password_hash_workers=_env_int("PASSWORD_HASH_WORKERS", min(os.cpu_count() or 1, 4)),
+        password_hash_queue_size=_env_int("PASSWORD_HASH_QUEUE_SIZE", 64),
+        argon2_time_cost=_env_int("ARGON2_TIME_COST", 3),
+        argon2_memory_cost=_env_int("ARGON2_MEMORY_COST", 65536),
+        argon2_parallelism=_env_int("ARGON2_PARALLELISM", 4),
+        database_dsn=os.environ.get("DATABASE_DSN") or "sqlite+aiosqlite:///./local.db",
+        database_echo=_env_bool("DATABASE_ECHO", False),
+        database_pool_size=_env_int("DATABASE_POOL_SIZE", 10),
+        database_max_overflow=_env_int("DATABASE_MAX_OVERFLOW", 10),
+        database_pool_timeout=_env_int("DATABASE_POOL_TIMEOUT", 10),
+        database_pool_pre_ping=_env_bool("DATABASE_POOL_PRE_PING", True),
+        database_pool_recycle=_env_int("DATABASE_POOL_RECYCLE", 1800),
+        database_pool_warmup=_env_int("DATABASE_POOL_WARMUP", 2),
+        database_statement_timeout=_env_int("DATABASE_STATEMENT_TIMEOUT", 15000),
+        database_replica_dsns=_env_list("DATABASE_REPLICA_DSNS"),
+        database_read_your_writes=_env_bool("DATABASE_READ_YOUR_WRITES", True),
+        database_replica_check_interval=_env_int("DATABASE_REPLICA_CHECK_INTERVAL", 10),
+        database_query_budget_strict=_env_bool("DATABASE_QUERY_BUDGET_STRICT", False),
+        availability_cache_size=_env_int("AVAILABILITY_CACHE_SIZE", 4096),
+        availability_cache_ttl=_env_int("AVAILABILITY_CACHE_TTL", 60),
+        availability_http_max_age=_env_int("AVAILABILITY_HTTP_MAX_AGE", 30),
+        slot_occurrence_weeks=_env_int("SLOT_OCCURRENCE_WEEKS", 12),
+        slot_occurrence_refresh_interval=_env_int("SLOT_OCCURRENCE_REFRESH_INTERVAL", 3600),
+        outbox_concurrency=_env_int("OUTBOX_CONCURRENCY", 4),
+        outbox_batch_size=_env_int("OUTBOX_BATCH_SIZE", 50),
+        outbox_max_attempts=_env_int("OUTBOX_MAX_ATTEMPTS", 8),
+        outbox_poll_interval=_env_int("OUTBOX_POLL_INTERVAL", 1),
+        outbox_backlog_check_interval=_env_int("OUTBOX_BACKLOG_CHECK_INTERVAL", 15),
+        smtp_host=os.environ.get("SMTP_HOST", ""),
+        smtp_port=_env_int("SMTP_PORT", 587),
+        smtp_username=os.environ.get("SMTP_USERNAME", ""),
+        smtp_password=os.environ.get("SMTP_PASSWORD", ""),
+        smtp_sender=os.environ.get("SMTP_SENDER", "noreply@localhost"),
+        smtp_starttls=_env_bool("SMTP_STARTTLS", True),
+        calendar_provider=os.environ.get("CALENDAR_PROVIDER") or "google",
+        google_calendar_access_token=google_calendar_access_token,
+        calendar_provider_timeout=float(os.environ.get("CALENDAR_PROVIDER_TIMEOUT") or 5),
+        busy_time_cache_size=_env_int("BUSY_TIME_CACHE_SIZE", 4096),
+        busy_time_cache_ttl=_env_int("BUSY_TIME_CACHE_TTL", 30),
+        guest_booking_index_cache_size=_env_int("GUEST_BOOKING_INDEX_CACHE_SIZE", 10000),
+        guest_booking_index_cache_ttl=_env_int("GUEST_BOOKING_INDEX_CACHE_TTL", 30),
+        auth_token_cache_size=_env_int("AUTH_TOKEN_CACHE_SIZE", 10000),
+        auth_token_cache_ttl=_env_int("AUTH_TOKEN_CACHE_TTL", 300),
+        user_cache_size=_env_int("USER_CACHE_SIZE", 10000),
+        user_cache_ttl=_env_int("USER_CACHE_TTL", 60),
+        server_workers=_env_int("SERVER_WORKERS", 0),
+        server_shutdown_timeout=_env_int("SERVER_SHUTDOWN_TIMEOUT", 20),
+        login_rate_limit_per_username=_env_int("LOGIN_RATE_LIMIT_PER_USERNAME", 10),
+        login_rate_limit_per_ip=_env_int("LOGIN_RATE_LIMIT_PER_IP", 60),
+        login_rate_limit_size=_env_int("LOGIN_RATE_LIMIT_SIZE", 100000),
+    )
+
+
+settings = load_settings()
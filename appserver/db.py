@@ -1,20 +1,78 @@
-from typing import Annotated
+import asyncio
+import itertools
+import logging
+import time
+from contextlib import AsyncExitStack, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, asdict, field
+from typing import Annotated, Any, Sequence
 
 from fastapi import Depends
+from sqlalchemy import event, text, Select, Table, UniqueConstraint
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import IntegrityError, TimeoutError as PoolTimeoutError
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from sqlalchemy.ext.asyncio import (
     create_async_engine,
     async_sessionmaker,
+    AsyncConnection,
     AsyncSession,
     AsyncEngine,
 )
 
+from appserver.config import Settings, settings
+from appserver.libs.metrics import current_timings, registry
 
-def create_engine(dsn: str):
-    return create_async_engine(
-        dsn,
-        echo=False,
+logger = logging.getLogger(__name__)
+
+
+def normalize_dsn(dsn: str) -> str:
+    #드라이버를 지정하지 않은 PostgreSQL DSN은 asyncpg 드라이버를 사용하도록 바꿉니다.
+    for prefix in ("postgresql://", "postgres://"):
+        if dsn.startswith(prefix):
+            return "postgresql+asyncpg://" + dsn[len(prefix):]
+    return dsn
+
+
+def build_engine_options(dsn: str, _settings: Settings = settings) -> dict[str, Any]:
+    url = make_url(dsn)
+    options: dict[str, Any] = {"echo": _settings.database_echo}
+
+    #메모리 SQLite는 커넥션 하나를 공유하는 StaticPool을 사용하므로 풀 설정이 의미가 없습니다.
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        return options
+
+    options.update(
+        poolclass=TimedQueuePool,
+        pool_size=_settings.database_pool_size,
+        max_overflow=_settings.database_max_overflow,
+        pool_timeout=_settings.database_pool_timeout,
+        pool_pre_ping=_settings.database_pool_pre_ping,
+        pool_recycle=_settings.database_pool_recycle,
     )
 
+    timeout = _settings.database_statement_timeout
+    if url.get_backend_name() == "sqlite":
+        #SQLite에는 statement timeout이 없으므로 잠금 대기 시간으로 대신합니다.
+        if timeout:
+            options["connect_args"] = {"timeout": timeout / 1000}
+    elif url.get_driver_name() == "asyncpg":
+        connect_args: dict[str, Any] = {"server_settings": {"application_name": "appserver"}}
+        if timeout:
+            connect_args["server_settings"]["statement_timeout"] = str(timeout)
+        options["connect_args"] = connect_args
+
+    return options
+
+
+def create_engine(dsn: str | None = None, **kwargs) -> AsyncEngine:
+    dsn = normalize_dsn(dsn or DSN)
+    options = build_engine_options(dsn)
+    options.update(kwargs)
+    return create_async_engine(dsn, **options)
+
 
 def create_session(async_engine: AsyncEngine | None = None):
     if async_engine is None:
@@ -28,15 +86,365 @@ def create_session(async_engine: AsyncEngine | None = None):
     )
 
 
+def dialect_insert(dialect_name: str):
+    #ON CONFLICT DO NOTHING 은 방언별 insert 에서만 제공합니다.
+    if dialect_name == "postgresql":
+        return postgresql.insert
+    if dialect_name == "sqlite":
+        return sqlite.insert
+    raise NotImplementedError(f"{dialect_name} 는 지원하지 않는 데이터베이스입니다.")
+
+
+def get_violated_constraint(exc: IntegrityError, table: Table) -> str | None:
+    #asyncpg 는 원본 예외에, psycopg 는 diag 에 위반한 제약 조건 이름을 담아줍니다.
+    for candidate in (exc.orig, getattr(exc.orig, "__cause__", None), getattr(exc.orig, "diag", None)):
+        name = getattr(candidate, "constraint_name", None)
+        if name:
+            return name
+
+    #SQLite 는 "UNIQUE constraint failed: users.username" 처럼 컬럼만 알려주므로 테이블 정의에서 이름을 찾습니다.
+    message = str(exc.orig)
+    marker = "UNIQUE constraint failed: "
+    if marker not in message:
+        return None
+    columns = frozenset(
+        column.strip().split(".")[-1]
+        for column in message.split(marker, 1)[1].splitlines()[0].split(",")
+    )
+    for constraint in table.constraints:
+        if (
+            isinstance(constraint, UniqueConstraint)
+            and constraint.name
+            and frozenset(constraint.columns.keys()) == columns
+        ):
+            return constraint.name
+    return None
+
+
+@dataclass
+class PoolMetrics:
+    connects: int = 0
+    checkouts: int = 0
+    checkins: int = 0
+    checked_out: int = 0
+    waits: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+
+    def observe_wait(self, seconds: float) -> None:
+        self.waits += 1
+        self.wait_seconds_total += seconds
+        if seconds > self.wait_seconds_max:
+            self.wait_seconds_max = seconds
+
+    def snapshot(self) -> dict[str, int | float]:
+        return asdict(self)
+
+
+def record_pool_wait(seconds: float, metrics: PoolMetrics | None = None) -> None:
+    if metrics is not None:
+        metrics.observe_wait(seconds)
+    POOL_WAIT_SECONDS.observe(seconds)
+    timings = current_timings()
+    if timings is not None:
+        timings.pool_wait_seconds += seconds
+
+
+_pool_getting: ContextVar[bool] = ContextVar("pool_getting", default=False)
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """풀 큐에서 커넥션을 기다린 시간만 재는 풀.
+
+    기다린 시간은 커넥션 기록에 남겨 두고 instrument_pool 의 checkout 이벤트에서 집계합니다.
+    새로 연 커넥션은 기다린 것이 아니라 연결한 것이므로 남기지 않고(connects 로 셉니다),
+    pre-ping 과 BEGIN 은 이 다음 단계라 포함되지 않습니다.
+    """
+
+    def _do_get(self):
+        #QueuePool._do_get 은 경합이 나면 자기 자신을 다시 부르므로 바깥 호출에서만 잽니다.
+        if _pool_getting.get():
+            return super()._do_get()
+        token = _pool_getting.set(True)
+        started = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except PoolTimeoutError:
+            record_pool_wait(time.perf_counter() - started)
+            raise
+        finally:
+            _pool_getting.reset(token)
+        if not record.fresh:
+            record.info["pool_wait"] = time.perf_counter() - started
+        return record
+
+
+def instrument_pool(async_engine: AsyncEngine, metrics: PoolMetrics) -> None:
+    sync_engine = async_engine.sync_engine
+
+    @event.listens_for(sync_engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        metrics.connects += 1
+
+    @event.listens_for(sync_engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.checkouts += 1
+        metrics.checked_out += 1
+        waited = connection_record.info.pop("pool_wait", None)
+        if waited is not None:
+            record_pool_wait(waited, metrics)
+
+    @event.listens_for(sync_engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        metrics.checkins += 1
+        metrics.checked_out -= 1
+
+
+class QueryBudgetExceededError(RuntimeError):
+    pass
+
+
+@dataclass
+class QueryCounter:
+    count: int = 0
+    statements: list[str] = field(default_factory=list)
+
+
+_query_counter: ContextVar[QueryCounter | None] = ContextVar("query_counter", default=None)
+
+
+#Engine 클래스에 등록하므로 모든 엔진(복제본 포함)의 쿼리를 셉니다.
+#세션의 greenlet 안에서도 contextvar 가 전달되어 요청별로 따로 셀 수 있습니다.
+@event.listens_for(Engine, "before_cursor_execute")
+def count_query(conn, cursor, statement, parameters, context, executemany):
+    counter = _query_counter.get()
+    if counter is not None:
+        counter.count += 1
+        counter.statements.append(statement)
+    if context is not None:
+        context._query_started = time.perf_counter()
+
+
+DB_QUERY_SECONDS = registry.histogram("db_query_duration_seconds", "쿼리 하나의 실행 시간")
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def observe_query_time(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_query_started", None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    DB_QUERY_SECONDS.observe(elapsed)
+    timings = current_timings()
+    if timings is not None:
+        timings.db_queries += 1
+        timings.db_seconds += elapsed
+
+
+@contextmanager
+def count_queries():
+    counter = QueryCounter()
+    token = _query_counter.set(counter)
+    try:
+        yield counter
+    finally:
+        _query_counter.reset(token)
+
+
+def query_budget(limit: int):
+    """요청 하나가 실행할 수 있는 쿼리 수를 선언하는 의존성을 만듭니다.
+
+    라우트의 ``dependencies`` 에 넣으면 다른 의존성보다 먼저 실행되므로 인증, 세션 준비까지 포함해서 셉니다.
+    ``DATABASE_QUERY_BUDGET_STRICT`` 가 켜져 있으면 예산을 넘었을 때 예외를 일으켜 테스트를 실패시키고,
+    꺼져 있으면 경고 로그만 남깁니다.
+    """
+    async def check_query_budget():
+        with count_queries() as counter:
+            yield counter
+        if counter.count <= limit:
+            return
+        message = f"쿼리 {counter.count}개를 실행했습니다. (예산 {limit}개)"
+        if settings.database_query_budget_strict:
+            raise QueryBudgetExceededError(message + "\n" + "\n".join(counter.statements))
+        logger.warning(message)
+
+    return Depends(check_query_budget)
+
+
+class RoutingSession(Session):
+    #SELECT 는 복제본으로, flush/INSERT/UPDATE/DELETE 와 FOR UPDATE 는 주 데이터베이스로 보냅니다.
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        router: DatabaseRouter = self.info["router"]
+
+        if (
+            self._flushing
+            or self.info.get("pinned_to_primary")
+            or not isinstance(clause, Select)
+            or clause._for_update_arg is not None
+        ):
+            return router.primary.sync_engine
+
+        #한 세션 안에서는 같은 복제본을 계속 사용해야 조회 결과가 일관됩니다.
+        replica = self.info.get("replica")
+        if replica is None:
+            replica = self.info["replica"] = router.choose_replica()
+        return replica.sync_engine
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def pin_to_primary_after_commit(session: Session):
+    if session.info["router"].read_your_writes:
+        session.info["pinned_to_primary"] = True
+
+
+class DatabaseRouter:
+    def __init__(
+        self,
+        primary: AsyncEngine,
+        replicas: Sequence[AsyncEngine] = (),
+        read_your_writes: bool = True,
+    ):
+        self.primary = primary
+        self.replicas = tuple(replicas)
+        self.read_your_writes = read_your_writes
+        self.healthy_replicas = self.replicas
+        self._round_robin = itertools.count()
+
+    def choose_replica(self) -> AsyncEngine:
+        #사용할 수 있는 복제본이 없으면 주 데이터베이스에서 읽습니다.
+        healthy = self.healthy_replicas
+        if not healthy:
+            return self.primary
+        return healthy[next(self._round_robin) % len(healthy)]
+
+    async def _ping(self, replica: AsyncEngine, timeout: float) -> bool:
+        try:
+            async with asyncio.timeout(timeout):
+                async with replica.connect() as conn:
+                    await conn.execute(text("SELECT 1"))
+        except Exception as exc:
+            logger.warning("replica %s is unavailable: %r", replica.url.render_as_string(), exc)
+            return False
+        return True
+
+    async def check_replicas(self, timeout: float = 2.0) -> tuple[AsyncEngine, ...]:
+        results = await asyncio.gather(*(self._ping(replica, timeout) for replica in self.replicas))
+        self.healthy_replicas = tuple(
+            replica for replica, is_healthy in zip(self.replicas, results) if is_healthy
+        )
+        return self.healthy_replicas
+
+    async def watch_replicas(self, interval: float) -> None:
+        while True:
+            await self.check_replicas()
+            await asyncio.sleep(interval)
+
+    def create_session(self) -> async_sessionmaker[AsyncSession]:
+        return async_sessionmaker(
+            expire_on_commit=False,
+            autoflush=False,
+            class_=AsyncSession,
+            sync_session_class=RoutingSession,
+            info={"router": self},
+        )
+
+    async def dispose(self) -> None:
+        for replica in self.replicas:
+            await replica.dispose()
+
+
+DSN = normalize_dsn(settings.database_dsn)
+
+#엔진은 앱 lifespan 에서 만들고 정리합니다. (init_engine / dispose_engine)
+engine: AsyncEngine | None = None
+async_session_factory: async_sessionmaker[AsyncSession] | None = None
+router: DatabaseRouter | None = None
+read_session_factory: async_sessionmaker[AsyncSession] | None = None
+pool_metrics = PoolMetrics()
+
+POOL_WAIT_SECONDS = registry.histogram(
+    "db_pool_wait_seconds", "커넥션을 얻기까지 기다린 시간", buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+)
+registry.gauge_function("db_pool_checked_out", "사용 중인 커넥션 수", lambda: pool_metrics.checked_out)
+registry.gauge_function("db_pool_connects", "지금까지 새로 연 커넥션 수", lambda: pool_metrics.connects)
+
+
+def init_engine(dsn: str | None = None) -> AsyncEngine:
+    global engine, async_session_factory, router, read_session_factory
+
+    if engine is None:
+        engine = create_engine(dsn)
+        instrument_pool(engine, pool_metrics)
+        async_session_factory = create_session(engine)
+
+        replicas = [create_engine(replica_dsn) for replica_dsn in settings.database_replica_dsns]
+        for replica in replicas:
+            instrument_pool(replica, pool_metrics)
+        router = DatabaseRouter(engine, replicas, read_your_writes=settings.database_read_your_writes)
+        read_session_factory = router.create_session()
+    return engine
+
+
+async def warm_up_pool(count: int) -> int:
+    """커넥션을 count 개(풀 크기까지) 미리 열어서 풀에 넣어 둡니다. 연 커넥션 수를 돌려줍니다.
+
+    워커가 뜬 직후 들어온 요청들이 커넥션을 새로 여느라 기다리지 않게 합니다.
+    """
+    target = init_engine()
+    #메모리 SQLite 의 StaticPool 처럼 크기가 없는 풀은 미리 열 커넥션이 없습니다.
+    pool_size = target.pool.size() if hasattr(target.pool, "size") else 0
+    count = min(count, pool_size)
+    if count <= 0:
+        return 0
+
+    async def ping(conn: AsyncConnection) -> None:
+        await conn.execute(text("SELECT 1"))
+
+    async with AsyncExitStack() as stack:
+        conns = [await stack.enter_async_context(target.connect()) for _ in range(count)]
+        await asyncio.gather(*(ping(conn) for conn in conns))
+    return count
+
+
+async def dispose_engine() -> None:
+    global engine, async_session_factory, router, read_session_factory
+
+    if router is not None:
+        await router.dispose()
+        router = None
+        read_session_factory = None
+
+    if engine is not None:
+        await engine.dispose()
+        engine = None
+        async_session_factory = None
+
+
+def get_session_factory() -> async_sessionmaker[AsyncSession]:
+    #lifespan 없이 실행되는 스크립트에서도 사용할 수 있도록 필요할 때 엔진을 만듭니다.
+    if async_session_factory is None:
+        init_engine()
+    return async_session_factory
+
+
 async def use_session():
-    async with async_session_factory() as session:
+    #커넥션은 첫 쿼리에서 꺼냅니다. 해시 계산이나 요청 제한처럼 DB 를 쓰지 않는 구간에는 커넥션을 잡지 않습니다.
+    #풀에서 기다린 시간은 TimedQueuePool 이 기록합니다.
+    async with get_session_factory()() as session:
         yield session
 
 DbSessionDep = Annotated[AsyncSession, Depends(use_session)]
 
 
-DSN = "sqlite+aiosqlite:///./local.db"
+def get_read_session_factory() -> async_sessionmaker[AsyncSession]:
+    if read_session_factory is None:
+        init_engine()
+    return read_session_factory
 
-engine = create_engine(DSN)
 
-async_session_factory = create_session(engine)
+#조회 위주의 엔드포인트용 세션, 쓰기가 일어나면 해당 쓰기는 주 데이터베이스로 갑니다.
+async def use_read_session():
+    async with get_read_session_factory()() as session:
+        yield session
+
+ReadDbSessionDep = Annotated[AsyncSession, Depends(use_read_session)]
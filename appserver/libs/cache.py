@@ -0,0 +1,66 @@
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+_MISSING = object()
+
+
+#최근에 사용한 항목을 maxsize 개까지 유지하고, 항목마다 만료 시각을 두는 프로세스 내 캐시입니다.
+#이벤트 루프 스레드에서만 사용하는 것을 전제로 하므로 락을 사용하지 않습니다.
+class TTLCache(Generic[K, V]):
+    def __init__(self, maxsize: int, ttl: float, timer: Callable[[], float] = time.monotonic):
+        if maxsize < 1:
+            raise ValueError("maxsize 는 1 이상이어야 합니다.")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._timer = timer
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: K) -> bool:
+        return self.get(key, _MISSING, count=False) is not _MISSING
+
+    def get(self, key: K, default=None, *, count: bool = True):
+        item = self._data.get(key)
+        if item is not None:
+            expires_at, value = item
+            if expires_at > self._timer():
+                self._data.move_to_end(key)
+                if count:
+                    self.hits += 1
+                return value
+            del self._data[key]
+
+        if count:
+            self.misses += 1
+        return default
+
+    def set(self, key: K, value: V, ttl: float | None = None) -> None:
+        expires_at = self._timer() + (self.ttl if ttl is None else ttl)
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: K, default=None):
+        item = self._data.pop(key, None)
+        return default if item is None else item[1]
+
+    def invalidate_where(self, predicate: Callable[[K], bool]) -> int:
+        keys = [key for key in self._data if predicate(key)]
+        for key in keys:
+            del self._data[key]
+        return len(keys)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {"size": len(self._data), "hits": self.hits, "misses": self.misses}
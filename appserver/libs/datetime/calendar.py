@@ -1,4 +1,10 @@
+import calendar
 from datetime import date, timedelta
+from functools import lru_cache
+from typing import NamedTuple
+
+#달력의 첫 요일 (월 0 ~ 일 6), get_range_days_of_month 는 일요일부터 그립니다.
+SUNDAY = 6
 
 
 def get_start_weekday_of_month(year: int, month: int):
@@ -12,29 +18,62 @@ def get_last_day_of_month(year: int, month: int):
     next_month = date(year + 1, 1, 1)
   else:
     next_month = date(year, month + 1, 1)
-    
+
   result = next_month - timedelta(days=1)
   return result.day
 
 
 
 def get_range_days_of_month(year: int, month: int):
-  #월의 시작 요일을 가져옴 (월 0 , 일 6)
-  start_weekday = get_start_weekday_of_month(year, month)
-  #월의 마지막 날을 가져옴
-  last_day = get_last_day_of_month(year, month)
-  
-  #월요일을 1로 변경
-  start_weekday = (start_weekday + 1) % 7
-  
-  result = [0] * start_weekday # 시작 요일 전까지 0으로 채움
-  
-  for day in range(1, last_day + 1):
-    result.append(day)
-    
-  return result
-  
-# import calendar
-
-# cal = calendar.Calendar(calendar.SUNDAY)
-# print(list(cal.itermonthdays(2025,11)))
\ No newline at end of file
+  #일요일부터 그린 달력에서 1일 앞은 0으로 채우고, 마지막 날 뒤는 채우지 않습니다.
+  #캐시된 달력을 공유하므로 호출한 쪽에서 고쳐도 되도록 새 리스트로 돌려줍니다.
+  return list(_range_days_of_month(year, month))
+
+
+@lru_cache(maxsize=1200)
+def _range_days_of_month(year: int, month: int) -> tuple[int, ...]:
+  days = get_month_grid(year, month, SUNDAY).days
+  return days[:days.index(1) + get_last_day_of_month(year, month)]
+
+
+class MonthWeek(NamedTuple):
+  #이 주의 목요일이 속한 ISO 주 번호 (ISO 8601 에서 주는 목요일이 속한 해와 주를 따릅니다.)
+  iso_week: int
+  #7칸의 일자, 이 달이 아닌 칸은 0
+  days: tuple[int, ...]
+
+
+class MonthGrid(NamedTuple):
+  year: int
+  month: int
+  first_weekday: int
+  weeks: tuple[MonthWeek, ...]
+  #주를 이어 붙인 칸 목록, 길이는 항상 7의 배수입니다.
+  days: tuple[int, ...]
+
+
+@lru_cache(maxsize=1200)
+def get_month_grid(year: int, month: int, first_weekday: int = SUNDAY) -> MonthGrid:
+  """주 단위 달력을 만듭니다. 앞뒤 빈칸은 0 입니다.
+
+  결과는 (연, 월, 첫 요일)마다 하나만 만들어 모든 요청이 같은 튜플을 함께 씁니다.
+  """
+  if first_weekday not in range(7):
+    raise ValueError("첫 요일은 0(월) ~ 6(일) 사이의 값이어야 합니다.")
+  weeks = []
+  for days in calendar.Calendar(first_weekday).monthdayscalendar(year, month):
+    #0 이 아닌 칸으로 이 주의 목요일 날짜를 구합니다.
+    column = next(index for index, day in enumerate(days) if day)
+    thursday = date(year, month, days[column]) + timedelta(days=(3 - first_weekday) % 7 - column)
+    weeks.append(MonthWeek(thursday.isocalendar().week, tuple(days)))
+  return MonthGrid(year, month, first_weekday, tuple(weeks), tuple(day for week in weeks for day in week.days))
+
+
+@lru_cache(maxsize=256)
+def get_month_grids(year: int, month: int, count: int, first_weekday: int = SUNDAY) -> tuple[MonthGrid, ...]:
+  #year 년 month 월부터 count 개월의 달력, 각 달력은 get_month_grid 의 캐시를 그대로 씁니다.
+  grids = []
+  for offset in range(count):
+    grid_year, grid_month = divmod(year * 12 + month - 1 + offset, 12)
+    grids.append(get_month_grid(grid_year, grid_month + 1, first_weekday))
+  return tuple(grids)
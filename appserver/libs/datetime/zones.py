@@ -0,0 +1,94 @@
+"""IANA 시간대 조회와 현지 시각 -> UTC 변환.
+
+한 달 동안 UTC 오프셋은 대부분 바뀌지 않으므로 (시간대, 연, 월) 마다 일자별 오프셋 표를 한 번 만들어
+캐시하고, 일광 절약 시간(DST)이 바뀌는 날만 zoneinfo 로 정확히 계산합니다.
+
+>>> local_to_utc(date(2025, 3, 9), time(9, 0), "America/New_York").isoformat()
+'2025-03-09T13:00:00+00:00'
+>>> local_to_utc(date(2025, 3, 8), time(9, 0), "America/New_York").isoformat()
+'2025-03-08T14:00:00+00:00'
+"""
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone, tzinfo
+from functools import lru_cache
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from .calendar import get_last_day_of_month
+
+UTC = "UTC"
+
+
+@lru_cache(maxsize=None)
+def get_zone(name: str) -> tzinfo:
+    """시간대 이름으로 tzinfo 를 찾습니다. 없는 이름이면 ZoneInfoNotFoundError(KeyError) 를 일으킵니다."""
+    if name == UTC:
+        return timezone.utc
+    return ZoneInfo(name)
+
+
+def is_valid_zone(name: str) -> bool:
+    try:
+        get_zone(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        return False
+    return True
+
+
+@dataclass(frozen=True)
+class MonthOffsets:
+    zone: str
+    year: int
+    month: int
+    #일자별(인덱스 0 이 1일) 자정 시점의 UTC 오프셋
+    offsets: tuple[timedelta, ...]
+    #하루 중에 오프셋이 바뀌는 날
+    transition_days: frozenset[int]
+    #일자별 현지 자정의 UTC 시점, 오프셋이 바뀌지 않는 날은 여기에 현지 시각만큼 더하면 됩니다.
+    midnights: tuple[datetime, ...]
+
+    def to_utc(self, day: int, local_time: time) -> datetime:
+        if day in self.transition_days:
+            #없는 시각(시계를 앞당긴 구간)은 바뀌기 전 오프셋으로, 두 번 있는 시각은 앞의 것으로 계산합니다. (PEP 495 fold=0)
+            local = datetime.combine(date(self.year, self.month, day), local_time, tzinfo=get_zone(self.zone))
+            return local.astimezone(timezone.utc)
+        return self.midnights[day - 1] + time_to_delta(local_time)
+
+
+@lru_cache(maxsize=1440)
+def time_to_delta(local_time: time) -> timedelta:
+    #타임슬롯 시각은 종류가 많지 않으므로 바꾼 값을 캐시합니다.
+    return timedelta(
+        hours=local_time.hour, minutes=local_time.minute, seconds=local_time.second, microseconds=local_time.microsecond
+    )
+
+
+@lru_cache(maxsize=4096)
+def month_offsets(zone_name: str, year: int, month: int) -> MonthOffsets:
+    zone = get_zone(zone_name)
+    last_day = get_last_day_of_month(year, month)
+    first = datetime(year, month, 1, tzinfo=zone)
+    #다음 날 자정의 오프셋까지 구해서 하루 사이에 오프셋이 바뀌었는지 비교합니다.
+    offsets = [(first + timedelta(days=offset)).utcoffset() for offset in range(last_day + 1)]
+    return MonthOffsets(
+        zone=zone_name,
+        year=year,
+        month=month,
+        offsets=tuple(offsets[:last_day]),
+        transition_days=frozenset(day for day in range(1, last_day + 1) if offsets[day - 1] != offsets[day]),
+        midnights=tuple(
+            datetime(year, month, day, tzinfo=timezone.utc) - offsets[day - 1] for day in range(1, last_day + 1)
+        ),
+    )
+
+
+def local_to_utc(day: date, local_time: time, zone_name: str = UTC) -> datetime:
+    return month_offsets(zone_name, day.year, day.month).to_utc(day.day, local_time)
+
+
+def local_month_range(year: int, month: int, zone_name: str = UTC) -> tuple[datetime, datetime]:
+    #zone_name 기준 year 년 month 월의 시작과 다음 달 시작을 UTC 로 돌려줍니다.
+    next_year, next_month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return (
+        local_to_utc(date(year, month, 1), time.min, zone_name),
+        local_to_utc(date(next_year, next_month, 1), time.min, zone_name),
+    )
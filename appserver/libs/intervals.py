@@ -0,0 +1,80 @@
+"""반열린 구간 [start, end) 들의 겹침을 찾는 정적 색인.
+
+구간을 시작 순으로 정렬하고, 앞에서부터의 최대 종료값을 함께 저장합니다.
+[start, end) 와 겹치는 구간은 end 보다 먼저 시작한 구간 중 종료가 start 보다 늦은 것이므로,
+이분 탐색 한 번과 최대 종료값 비교로 겹침 여부를 O(log n) 에 답합니다.
+
+>>> index = IntervalIndex([(9, 10, "a"), (13, 15, "b"), (14, 16, "c")])
+>>> index.overlaps(10, 13)
+False
+>>> index.first_overlap(12, 14)
+'b'
+>>> list(index.overlapping(14, 15))
+['c', 'b']
+>>> index.find_overlapping_pair()
+('b', 'c')
+"""
+from bisect import bisect_left
+from typing import Generic, Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+V = TypeVar("V")
+
+
+class IntervalIndex(Generic[T, V]):
+    """만든 뒤에는 바뀌지 않습니다. 구간이 바뀌면 새로 만듭니다. (만드는 비용 O(n log n))"""
+
+    __slots__ = ("starts", "ends", "values", "_max_ends", "_max_positions")
+
+    def __init__(self, intervals: Iterable[tuple[T, T, V]]):
+        ordered = sorted(intervals, key=lambda interval: (interval[0], interval[1]))
+        self.starts: list[T] = [interval[0] for interval in ordered]
+        self.ends: list[T] = [interval[1] for interval in ordered]
+        self.values: list[V] = [interval[2] for interval in ordered]
+        #i 번째까지의 구간 중 가장 늦게 끝나는 구간의 종료값과 위치
+        self._max_ends: list[T] = []
+        self._max_positions: list[int] = []
+        for position, end in enumerate(self.ends):
+            if not self._max_ends or end > self._max_ends[-1]:
+                self._max_ends.append(end)
+                self._max_positions.append(position)
+            else:
+                self._max_ends.append(self._max_ends[-1])
+                self._max_positions.append(self._max_positions[-1])
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def _candidates(self, end: T) -> int:
+        #end 보다 먼저 시작한 구간 수, 이 구간들만 겹칠 수 있습니다.
+        return bisect_left(self.starts, end)
+
+    def overlaps(self, start: T, end: T) -> bool:
+        count = self._candidates(end)
+        return count > 0 and self._max_ends[count - 1] > start
+
+    def first_overlap(self, start: T, end: T) -> V | None:
+        """겹치는 구간 중 가장 늦게 끝나는 구간의 값을 돌려줍니다. O(log n)"""
+        count = self._candidates(end)
+        if count == 0 or not self._max_ends[count - 1] > start:
+            return None
+        return self.values[self._max_positions[count - 1]]
+
+    def overlapping(self, start: T, end: T) -> Iterator[V]:
+        """겹치는 구간의 값을 시작이 늦은 것부터 돌려줍니다.
+
+        최대 종료값이 start 이하가 되면 더 앞의 구간은 겹칠 수 없으므로 멈춥니다.
+        서로 겹치지 않는 구간들이면 O(log n + 겹치는 수) 입니다.
+        """
+        position = self._candidates(end) - 1
+        while position >= 0 and self._max_ends[position] > start:
+            if self.ends[position] > start:
+                yield self.values[position]
+            position -= 1
+
+    def find_overlapping_pair(self) -> tuple[V, V] | None:
+        """색인 안에서 서로 겹치는 구간 한 쌍을 찾습니다. O(n)"""
+        for position in range(1, len(self.starts)):
+            if self.starts[position] < self._max_ends[position - 1]:
+                return self.values[self._max_positions[position - 1]], self.values[position]
+        return None
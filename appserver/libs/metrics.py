@@ -0,0 +1,226 @@
+"""Prometheus 텍스트 형식으로 내보내는 간단한 지표와 요청별 시간 측정.
+
+>>> registry = Registry()
+>>> hits = registry.counter("hits_total", "조회 수", ("route",))
+>>> hits.inc(route="/a")
+>>> print(registry.render())
+# HELP hits_total 조회 수
+# TYPE hits_total counter
+hits_total{route="/a"} 1.0
+<BLANKLINE>
+"""
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Callable, Iterable, Mapping
+
+from starlette.datastructures import MutableHeaders
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str]) -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = tuple(labels[name] for name in self.labelnames)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(tuple(labels[name] for name in self.labelnames), 0.0)
+
+    def samples(self) -> Iterable[str]:
+        for key, value in self._values.items():
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {value}"
+
+
+class Histogram:
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(sorted(buckets))
+        #레이블별 [버킷별 개수..., 합계, 개수]
+        self._values: dict[tuple[str, ...], list[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(labels[name] for name in self.labelnames)
+        state = self._values.get(key)
+        if state is None:
+            state = self._values[key] = [0.0] * (len(self.buckets) + 2)
+        #누적 개수는 내보낼 때 계산하고, 여기서는 해당 버킷 하나만 올립니다.
+        index = bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            state[index] += 1
+        state[-2] += value
+        state[-1] += 1
+
+    def count(self, **labels: str) -> int:
+        state = self._values.get(tuple(labels[name] for name in self.labelnames))
+        return int(state[-1]) if state else 0
+
+    def samples(self) -> Iterable[str]:
+        for key, state in self._values.items():
+            cumulative = 0.0
+            for bound, count in zip(self.buckets, state):
+                cumulative += count
+                labels = _format_labels((*self.labelnames, "le"), (*key, bound))
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels((*self.labelnames, "le"), (*key, "+Inf"))
+            yield f"{self.name}_bucket{labels} {state[-1]}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, key)} {state[-2]}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, key)} {state[-1]}"
+
+
+class GaugeFunction:
+    """내보낼 때마다 함수를 불러서 현재 값을 읽는 게이지, 다른 객체가 이미 세고 있는 값을 내보낼 때 사용합니다."""
+
+    type_name = "gauge"
+
+    def __init__(self, name: str, documentation: str, func: Callable[[], float | Mapping[str, float]], labelname: str = ""):
+        self.name = name
+        self.documentation = documentation
+        self.func = func
+        self.labelname = labelname
+
+    def samples(self) -> Iterable[str]:
+        value = self.func()
+        if isinstance(value, Mapping):
+            for label, item in value.items():
+                yield f"{self.name}{_format_labels((self.labelname,), (label,))} {float(item)}"
+        else:
+            yield f"{self.name} {float(value)}"
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: dict[str, Counter | Histogram | GaugeFunction] = {}
+
+    def _register(self, metric):
+        #모듈을 다시 불러오거나 같은 이름으로 다시 등록하면 나중 것으로 바꿉니다.
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(
+        self, name: str, documentation: str, labelnames: tuple[str, ...] = (), buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def gauge_function(
+        self, name: str, documentation: str, func: Callable[[], float | Mapping[str, float]], labelname: str = ""
+    ) -> GaugeFunction:
+        return self._register(GaugeFunction(name, documentation, func, labelname))
+
+    def get(self, name: str):
+        return self._metrics[name]
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type_name}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+REQUEST_LATENCY = registry.histogram(
+    "http_request_duration_seconds", "라우트별 응답 시간", ("method", "route", "status")
+)
+REQUEST_DB_QUERIES = registry.histogram(
+    "http_request_db_queries", "요청 하나가 실행한 쿼리 수", ("route",), buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100)
+)
+REQUEST_DB_SECONDS = registry.histogram("http_request_db_seconds", "요청 하나가 쿼리 실행에 쓴 시간", ("route",))
+
+
+@dataclass
+class RequestTimings:
+    db_queries: int = 0
+    db_seconds: float = 0.0
+    hash_seconds: float = 0.0
+    pool_wait_seconds: float = 0.0
+
+    def server_timing(self, total_seconds: float) -> str:
+        #브라우저 개발자 도구에서 바로 볼 수 있도록 ms 단위로 내보냅니다.
+        parts = [f"app;dur={total_seconds * 1000:.2f}"]
+        if self.db_queries:
+            parts.append(f'db;dur={self.db_seconds * 1000:.2f};desc="{self.db_queries} queries"')
+        if self.pool_wait_seconds:
+            parts.append(f"pool;dur={self.pool_wait_seconds * 1000:.2f}")
+        if self.hash_seconds:
+            parts.append(f"hash;dur={self.hash_seconds * 1000:.2f}")
+        return ", ".join(parts)
+
+
+_request_timings: ContextVar[RequestTimings | None] = ContextVar("request_timings", default=None)
+
+
+def current_timings() -> RequestTimings | None:
+    return _request_timings.get()
+
+
+class MetricsMiddleware:
+    """라우트별 응답 시간, 쿼리 수, DB 시간을 기록하고 Server-Timing 헤더를 붙입니다.
+
+    응답 본문을 감싸지 않는 순수 ASGI 미들웨어라서 스트리밍 응답도 그대로 흘려보냅니다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = _request_timings.set(timings)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", timings.server_timing(time.perf_counter() - started))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_timings.reset(token)
+            elapsed = time.perf_counter() - started
+            #경로 값마다 레이블이 늘어나지 않도록 /users/{username} 같은 라우트 경로로 묶습니다.
+            route = getattr(scope.get("route"), "path", "unmatched")
+            REQUEST_LATENCY.observe(elapsed, method=scope["method"], route=route, status=str(status_code))
+            REQUEST_DB_QUERIES.observe(timings.db_queries, route=route)
+            REQUEST_DB_SECONDS.observe(timings.db_seconds, route=route)
@@ -0,0 +1,73 @@
+import time
+from collections import OrderedDict
+from typing import Callable, Protocol
+
+
+class RateLimitStore(Protocol):
+    #여러 워커가 같은 한도를 공유해야 할 때(예: Redis) 구현합니다.
+    #허용하면 0, 거절하면 다시 시도할 수 있을 때까지 남은 시간(초)을 돌려줍니다.
+    async def acquire(self, key: str, rate: float, burst: int) -> float: ...
+
+
+#키마다 (남은 토큰, 마지막 갱신 시각) 두 값만 두는 토큰 버킷입니다.
+#버킷이 가득 찰 만큼 쉰 키는 새 키와 같으므로 지워도 결과가 바뀌지 않고, 오래된 키부터 지워서 메모리를 제한합니다.
+#이벤트 루프 스레드에서만 사용하는 것을 전제로 하므로 락을 사용하지 않습니다.
+class TokenBucket:
+    def __init__(self, rate: float, burst: int, maxsize: int, timer: Callable[[], float] = time.monotonic):
+        if rate <= 0 or burst < 1:
+            raise ValueError("rate 는 0 보다 크고 burst 는 1 이상이어야 합니다.")
+        if maxsize < 1:
+            raise ValueError("maxsize 는 1 이상이어야 합니다.")
+        self.rate = rate
+        self.burst = burst
+        self.maxsize = maxsize
+        self._timer = timer
+        #빈 버킷이 가득 차는 데 걸리는 시간
+        self._refill_seconds = burst / rate
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def _expire(self, now: float) -> None:
+        #마지막 갱신 순서로 정렬되어 있으므로 앞에서부터 가득 찬 버킷만 지우면 됩니다.
+        while self._buckets:
+            key, (_, updated) = next(iter(self._buckets.items()))
+            if updated + self._refill_seconds > now:
+                break
+            del self._buckets[key]
+
+    def acquire(self, key: str) -> float:
+        now = self._timer()
+        self._expire(now)
+
+        tokens, updated = self._buckets.pop(key, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated) * self.rate)
+        if tokens >= 1:
+            tokens -= 1
+            retry_after = 0.0
+        else:
+            retry_after = (1 - tokens) / self.rate
+
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.maxsize:
+            self._buckets.popitem(last=False)
+        return retry_after
+
+    def clear(self) -> None:
+        self._buckets.clear()
+
+
+#공유 저장소를 지정하지 않으면 프로세스 안의 토큰 버킷으로 셉니다.
+class RateLimiter:
+    def __init__(self, name: str, rate: float, burst: int, maxsize: int, store: RateLimitStore | None = None):
+        self.name = name
+        self.rate = rate
+        self.burst = burst
+        self.store = store
+        self.local = TokenBucket(rate, burst, maxsize)
+
+    async def acquire(self, key: str) -> float:
+        if self.store is not None:
+            return await self.store.acquire(f"{self.name}:{key}", self.rate, self.burst)
+        return self.local.acquire(key)
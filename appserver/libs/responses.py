@@ -0,0 +1,43 @@
+from typing import Any, Iterable
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+def dumps(content: Any) -> bytes:
+    #UTC 시각은 pydantic 과 같은 형식("...Z")으로 출력합니다.
+    return orjson.dumps(content, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+#이미 검증된 ORM 객체를 응답할 때 pydantic 검증을 다시 거치지 않고 스키마의 필드만 꺼냅니다.
+#str/int/bool/날짜/시각처럼 JSON 으로 바로 변환되는 필드로만 이루어진 스키마에 사용합니다.
+def dump_model(schema: type[BaseModel], obj: Any) -> dict[str, Any]:
+    return {name: getattr(obj, name) for name in schema.model_fields}
+
+
+def dump_models(schema: type[BaseModel], objs: Iterable[Any]) -> list[dict[str, Any]]:
+    names = tuple(schema.model_fields)
+    return [{name: getattr(obj, name) for name in names} for obj in objs]
+
+
+def model_response(schema: type[BaseModel], data: Any, status_code: int = 200, **kwargs) -> FastJSONResponse:
+    if isinstance(data, (list, tuple)):
+        content = dump_models(schema, data)
+    else:
+        content = dump_model(schema, data)
+    return FastJSONResponse(content, status_code=status_code, **kwargs)
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    #If-None-Match 는 쉼표로 여러 값을 보내거나 * 를 보낼 수 있고, 약한 비교(W/ 무시)를 합니다. (RFC 9110 13.1.2)
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return etag.removeprefix("W/") in {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
@@ -0,0 +1,45 @@
+"""운영 환경에서 여러 워커로 서버를 실행합니다.
+
+    python -m appserver.server --host 0.0.0.0 --port 8000 --workers 4
+
+각 워커는 create_app 으로 앱을 만들고, lifespan 에서 엔진, 커넥션 풀, 해시 스레드를 만듭니다.
+감독 프로세스는 앱을 불러오지 않으므로 데이터베이스 커넥션을 워커와 나눠 갖지 않습니다.
+SIGTERM 을 받으면 새 연결을 받지 않고, 처리 중인 요청을 SERVER_SHUTDOWN_TIMEOUT 초까지 기다린 뒤 종료합니다.
+"""
+import argparse
+import importlib.util
+import os
+
+from appserver.config import settings
+
+
+def _installed(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default=os.environ.get("SERVER_HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.environ.get("SERVER_PORT") or 8000))
+    parser.add_argument("--workers", type=int, default=settings.server_workers or os.cpu_count() or 1)
+    parser.add_argument("--log-level", default=os.environ.get("SERVER_LOG_LEVEL", "info"))
+    args = parser.parse_args(argv)
+
+    #uvicorn[standard] 로 설치하면 uvloop, httptools 를 사용하고, 없으면 기본 구현으로 실행합니다.
+    import uvicorn
+
+    uvicorn.run(
+        "appserver.app:create_app",
+        factory=True,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        loop="uvloop" if _installed("uvloop") else "asyncio",
+        http="httptools" if _installed("httptools") else "h11",
+        timeout_graceful_shutdown=settings.server_shutdown_timeout,
+        log_level=args.log_level,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+import statistics
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(samples: list[float]) -> dict[str, float]:
+    #초 단위 샘플을 ms 단위 요약으로 변환합니다.
+    return {
+        "count": len(samples),
+        "mean_ms": statistics.fmean(samples) * 1000 if samples else 0.0,
+        "p50_ms": percentile(samples, 50) * 1000,
+        "p95_ms": percentile(samples, 95) * 1000,
+        "p99_ms": percentile(samples, 99) * 1000,
+        "max_ms": max(samples, default=0.0) * 1000,
+    }
+
+
+def format_summary(name: str, summary: dict[str, float]) -> str:
+    return (
+        f"{name:<34} n={summary['count']:<6} "
+        f"p50={summary['p50_ms']:8.2f}ms p95={summary['p95_ms']:8.2f}ms "
+        f"p99={summary['p99_ms']:8.2f}ms max={summary['max_ms']:8.2f}ms"
+    )
@@ -0,0 +1,68 @@
+"""인증 토큰 검증 처리량을 캐시 사용 여부에 따라 비교합니다.
+
+    python -m benchmarks.bench_auth --requests 5000
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+from fastapi import FastAPI
+
+from appserver.app import include_routers
+from appserver.apps.account import deps
+from appserver.apps.account.utils import create_access_token
+from benchmarks._stats import format_summary, summarize
+
+
+def bench_function(token: str, total: int, cached: bool) -> list[float]:
+    samples = []
+    for _ in range(total):
+        if not cached:
+            deps.token_cache.clear()
+        started = time.perf_counter()
+        deps.authenticate_token(token)
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+async def bench_endpoint(token: str, total: int, cached: bool) -> tuple[list[float], float]:
+    app = FastAPI()
+    include_routers(app)
+    headers = {"Authorization": f"Bearer {token}"}
+    samples = []
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        started_all = time.perf_counter()
+        for _ in range(total):
+            if not cached:
+                deps.token_cache.clear()
+            started = time.perf_counter()
+            response = await client.get("/api/accounts/@me", headers=headers)
+            samples.append(time.perf_counter() - started)
+            response.raise_for_status()
+        elapsed = time.perf_counter() - started_all
+    return samples, elapsed
+
+
+def main(args: argparse.Namespace) -> None:
+    token = create_access_token({"sub": "benchuser", "display_name": "benchuser", "is_host": True})
+
+    for cached in (False, True):
+        label = "cached" if cached else "uncached"
+        samples = bench_function(token, args.requests, cached)
+        print(f"{format_summary(f'authenticate_token {label}', summarize(samples))} "
+              f"throughput={len(samples) / sum(samples):10.0f}/s")
+
+    for cached in (False, True):
+        label = "cached" if cached else "uncached"
+        samples, elapsed = asyncio.run(bench_endpoint(token, args.requests // 5, cached))
+        print(f"{format_summary(f'GET /@me {label}', summarize(samples))} "
+              f"throughput={len(samples) / elapsed:10.0f}/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=5000)
+    main(parser.parse_args())
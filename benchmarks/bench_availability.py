@@ -0,0 +1,149 @@
+"""수백 개의 타임슬롯을 가진 호스트의 12개월 예약 가능 현황 계산 비용을 측정합니다.
+
+guest view 는 예약 가능한 슬롯을 UTC 시점으로 펼친 목록이며, 게스트 시간대가 캘린더와 같을 때와
+다를 때(앞뒤 달을 함께 읽고 시간대를 바꿈)를 비교합니다.
+
+    python -m benchmarks.bench_availability --hosts 20 --slots 300 --fill 0.3
+    python -m benchmarks.bench_availability --host-zone Asia/Seoul --guest-zone America/New_York
+"""
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+from datetime import date, time as dtime
+from pathlib import Path
+
+from sqlalchemy import insert
+from sqlmodel import SQLModel
+
+from appserver.apps.account.models import User
+from appserver.apps.calendar import availability
+from appserver.apps.calendar.models import Booking, Calendar, TimeSlot
+from appserver.db import create_engine, create_session
+from appserver.libs.datetime.calendar import get_last_day_of_month
+from benchmarks._stats import format_summary, summarize
+
+YEAR = 2025
+
+
+async def seed(
+    session_factory, hosts: int, slots: int, fill: float, rng: random.Random, host_zone: str
+) -> list[int]:
+    async with session_factory() as session:
+        guest = User(username="benchguest", email="guest@example.com", display_name="benchguest",
+                     hashed_password="x")
+        session.add(guest)
+        await session.flush()
+
+        calendar_ids = []
+        for host_index in range(hosts):
+            host = User(username=f"host{host_index:04d}", email=f"host{host_index}@example.com",
+                        display_name=f"host{host_index:04d}", hashed_password="x", is_host=True)
+            session.add(host)
+            await session.flush()
+            calendar = Calendar(host_id=host.id, topics=[], description="", google_calendar_id="", timezone=host_zone)
+            session.add(calendar)
+            await session.flush()
+            calendar_ids.append(calendar.id)
+
+            slot_rows = [
+                {
+                    "start_time": dtime(index % 24, 0),
+                    "end_time": dtime(index % 24, 30),
+                    "weekdays": sorted(rng.sample(range(7), rng.randint(1, 7))),
+                    "calendar_id": calendar.id,
+                }
+                for index in range(slots)
+            ]
+            result = await session.execute(insert(TimeSlot).returning(TimeSlot.id, TimeSlot.weekdays), slot_rows)
+
+            booking_rows = []
+            for slot_id, weekdays in result:
+                for month in range(1, 13):
+                    for day in range(1, get_last_day_of_month(YEAR, month) + 1):
+                        when = date(YEAR, month, day)
+                        if when.weekday() in weekdays and rng.random() < fill:
+                            booking_rows.append({
+                                "when": when, "topic": "bench", "description": "",
+                                "time_slot_id": slot_id, "calendar_id": calendar.id, "guest_id": guest.id,
+                            })
+            if booking_rows:
+                await session.execute(insert(Booking), booking_rows)
+        await session.commit()
+    return calendar_ids
+
+
+async def main(args: argparse.Namespace) -> None:
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        engine = create_engine(f"sqlite+aiosqlite:///{Path(tmpdir) / 'bench.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+        session_factory = create_session(engine)
+
+        started = time.perf_counter()
+        calendar_ids = await seed(session_factory, args.hosts, args.slots, args.fill, rng, args.host_zone)
+        print(f"seeded {args.hosts} hosts x {args.slots} slots in {time.perf_counter() - started:.1f}s")
+
+        cold: list[float] = []
+        warm: list[float] = []
+        compute_only: list[float] = []
+        async with session_factory() as session:
+            availability.availability_cache.clear()
+            for calendar_id in calendar_ids:
+                for month in range(1, 13):
+                    started = time.perf_counter()
+                    result = await availability.get_month_availability(session, calendar_id, YEAR, month)
+                    cold.append(time.perf_counter() - started)
+
+                    started = time.perf_counter()
+                    availability.compute_month_availability(
+                        calendar_id, YEAR, month,
+                        zip(result.slot_ids, [[0, 1, 2, 3, 4, 5, 6]] * len(result.slot_ids)),
+                        [],
+                    )
+                    compute_only.append(time.perf_counter() - started)
+
+            for _ in range(args.repeat):
+                for calendar_id in calendar_ids:
+                    for month in range(1, 13):
+                        started = time.perf_counter()
+                        await availability.get_month_availability(session, calendar_id, YEAR, month)
+                        warm.append(time.perf_counter() - started)
+
+            #앞뒤 달을 미리 캐시에 올려서 두 경우 모두 계산 비용만 비교합니다.
+            for calendar_id in calendar_ids:
+                for year, month in ((YEAR - 1, 12), (YEAR + 1, 1)):
+                    await availability.get_month_availability(session, calendar_id, year, month)
+            guest_views: dict[str, list[float]] = {args.host_zone: [], args.guest_zone: []}
+            for _ in range(args.repeat):
+                for calendar_id in calendar_ids:
+                    for month in range(1, 13):
+                        for zone_name, samples in guest_views.items():
+                            started = time.perf_counter()
+                            await availability.get_free_instants(
+                                session, calendar_id, args.host_zone, YEAR, month, zone_name
+                            )
+                            samples.append(time.perf_counter() - started)
+
+        await engine.dispose()
+
+    print(format_summary("month view (query+compute)", summarize(cold)))
+    print(format_summary("month view (compute only)", summarize(compute_only)))
+    print(format_summary("month view (cached)", summarize(warm)))
+    for zone_name, samples in guest_views.items():
+        print(format_summary(f"guest view ({zone_name})", summarize(samples)))
+    print(f"cache: {availability.availability_cache.stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--hosts", type=int, default=10)
+    parser.add_argument("--slots", type=int, default=300)
+    parser.add_argument("--fill", type=float, default=0.3)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--host-zone", default="Asia/Seoul")
+    parser.add_argument("--guest-zone", default="America/New_York")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,77 @@
+"""호스트 캘린더의 바쁜 시간을 요청마다 가져올 때와 BusyTimeClient 로 묶고 캐시할 때를 비교합니다.
+
+가짜 제공자에 지연 시간을 주고, 여러 호스트의 날짜별 화면을 동시에 요청하는 상황을 흉내 냅니다.
+
+    python -m benchmarks.bench_busy_time --hosts 20 --requests 2000 --concurrency 100 --latency 0.08
+"""
+import argparse
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta
+
+from appserver.apps.calendar.providers import BusyInterval, BusyTimeClient, FakeCalendarProvider, month_range
+from benchmarks._stats import format_summary, summarize
+
+YEAR, MONTH = 2025, 3
+
+
+def build_provider(hosts: int, latency: float, rng: random.Random) -> FakeCalendarProvider:
+    start, _ = month_range(YEAR, MONTH)
+    busy = {
+        f"host{index}@example.com": [
+            BusyInterval(start + timedelta(hours=hour), start + timedelta(hours=hour + 1))
+            for hour in sorted(rng.sample(range(24 * 31), 40))
+        ]
+        for index in range(hosts)
+    }
+    return FakeCalendarProvider(busy, latency=latency)
+
+
+async def run(name: str, fetch, requests: list[tuple[str, datetime]], concurrency: int) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+    samples: list[float] = []
+
+    async def one(calendar_id: str, day_start: datetime):
+        async with semaphore:
+            started = time.perf_counter()
+            await fetch(calendar_id, day_start, day_start + timedelta(days=1))
+            samples.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(calendar_id, day_start) for calendar_id, day_start in requests))
+    elapsed = time.perf_counter() - started
+    print(format_summary(name, summarize(samples)) + f" throughput={len(requests) / elapsed:8.1f}/s")
+
+
+async def main(args: argparse.Namespace) -> None:
+    rng = random.Random(args.seed)
+    start, _ = month_range(YEAR, MONTH)
+    requests = [
+        (f"host{rng.randrange(args.hosts)}@example.com", start + timedelta(days=rng.randrange(31)))
+        for _ in range(args.requests)
+    ]
+
+    provider = build_provider(args.hosts, args.latency, random.Random(args.seed))
+
+    async def fetch_every_time(calendar_id: str, time_min: datetime, time_max: datetime):
+        return (await provider.fetch_busy([calendar_id], time_min, time_max))[calendar_id]
+
+    await run("provider call per request", fetch_every_time, requests, args.concurrency)
+    print(f"  provider calls: {provider.calls}")
+
+    provider = build_provider(args.hosts, args.latency, random.Random(args.seed))
+    client = BusyTimeClient(provider, maxsize=4096, ttl=args.ttl)
+    await run("BusyTimeClient (single-flight+TTL)", client.get_busy, requests, args.concurrency)
+    print(f"  provider calls: {provider.calls}, cache: {client.cache.stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--hosts", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.08, help="가짜 제공자 응답 지연(초)")
+    parser.add_argument("--ttl", type=float, default=30)
+    parser.add_argument("--seed", type=int, default=42)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,80 @@
+"""구간 색인과 단순 비교의 겹침 검사 비용을 비교합니다.
+
+타임슬롯 검증(find_overlap)은 색인을 만들고 한 번 훑는 비용, 부킹 검증은 만들어 둔 색인에
+질의하는 비용입니다.
+
+    python -m benchmarks.bench_intervals --intervals 10000 --queries 1000
+"""
+import argparse
+import random
+import time
+from datetime import time as dtime
+
+from appserver.apps.calendar.time_slots import SlotSpec, find_overlap
+from appserver.libs.intervals import IntervalIndex
+from benchmarks._stats import format_summary, summarize
+
+
+def make_intervals(count: int, rng: random.Random) -> list[tuple[int, int, int]]:
+    #하루(초 단위)를 count 개로 나눠 서로 겹치지 않게 만든 뒤 마지막 하나만 겹치게 합니다.
+    width = max(1, 24 * 60 * 60 // count)
+    intervals = [(index * width, index * width + width, index) for index in range(count)]
+    rng.shuffle(intervals)
+    intervals.append((width // 2, width // 2 + width, count))
+    return intervals
+
+
+def naive_pair(intervals: list[tuple[int, int, int]]):
+    for i, (start, end, value) in enumerate(intervals):
+        for other_start, other_end, other_value in intervals[i + 1:]:
+            if start < other_end and other_start < end:
+                return value, other_value
+    return None
+
+
+def timed(func, *args, repeat: int = 1) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(*args)
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def main(args: argparse.Namespace) -> None:
+    rng = random.Random(args.seed)
+    intervals = make_intervals(args.intervals, rng)
+    queries = []
+    for _ in range(args.queries):
+        start = rng.randrange(0, 24 * 60 * 60)
+        queries.append((start, start + rng.randrange(1, 3600)))
+
+    index = IntervalIndex(intervals)
+    print(format_summary("build IntervalIndex", summarize(timed(IntervalIndex, intervals, repeat=5))))
+    print(format_summary("IntervalIndex.overlaps", summarize(
+        [timed(index.overlaps, start, end)[0] for start, end in queries]
+    )))
+    print(format_summary("linear scan", summarize(
+        [timed(lambda s, e: any(a < e and b > s for a, b, _ in intervals), start, end)[0] for start, end in queries]
+    )))
+
+    #1분짜리 타임슬롯을 요일마다 채워서 겹치지 않는 최악의 경우(끝까지 훑음)를 만듭니다.
+    minutes = [divmod(minute, 24 * 60) for minute in range(min(args.intervals, 7 * 24 * 60 - 7))]
+    specs = [
+        SlotSpec(dtime(*divmod(minute, 60)), dtime(*divmod(minute + 1, 60)), (weekday,))
+        for weekday, minute in minutes
+        if minute < 24 * 60 - 1
+    ]
+    rng.shuffle(specs)
+    print(format_summary(f"find_overlap ({len(specs)} slots)", summarize(timed(find_overlap, specs, repeat=5))))
+    if not args.skip_naive:
+        print(format_summary("naive pairwise", summarize(timed(naive_pair, intervals))))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--intervals", type=int, default=10000)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=17)
+    parser.add_argument("--skip-naive", action="store_true", help="O(n^2) 비교를 건너뜁니다.")
+    main(parser.parse_args())
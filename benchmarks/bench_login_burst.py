@@ -0,0 +1,128 @@
+"""로그인 요청이 몰리는 동안 다른 엔드포인트의 지연 시간을 측정합니다.
+
+    python -m benchmarks.bench_login_burst --logins 200 --concurrency 50
+    python -m benchmarks.bench_login_burst --inline   # 해시를 이벤트 루프에서 직접 실행(비교용)
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from pathlib import Path
+
+#같은 계정으로 계속 로그인하므로 시도 횟수 제한을 끕니다. appserver 를 불러오기 전에 설정해야 합니다.
+os.environ.setdefault("LOGIN_RATE_LIMIT_PER_USERNAME", "0")
+os.environ.setdefault("LOGIN_RATE_LIMIT_PER_IP", "0")
+
+import httpx
+from fastapi import FastAPI
+from sqlmodel import SQLModel
+
+from appserver.app import include_routers
+from appserver.apps.account import utils
+from appserver.apps.account.hashing import hashing_service
+from appserver.apps.account.models import User
+from appserver.db import create_engine, create_session, use_session
+from benchmarks._stats import format_summary, summarize
+
+
+def build_app(session_factory) -> FastAPI:
+    app = FastAPI()
+    include_routers(app)
+
+    async def override_use_session():
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[use_session] = override_use_session
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    return app
+
+
+async def seed(session_factory) -> None:
+    async with session_factory() as session:
+        session.add(User(
+            username="benchuser",
+            email="bench@example.com",
+            display_name="benchuser",
+            hashed_password=utils.hash_password("benchmark-password"),
+        ))
+        await session.commit()
+
+
+async def measure_ping(client: httpx.AsyncClient, stop: asyncio.Event, samples: list[float]) -> None:
+    #이벤트 루프가 막히면 요청 자체가 늦게 출발하므로, 예정된 출발 시각부터의 지연을 기록합니다.
+    interval = 0.005
+    scheduled = time.perf_counter()
+    while not stop.is_set():
+        await client.get("/ping")
+        samples.append(time.perf_counter() - scheduled)
+        scheduled = max(scheduled + interval, time.perf_counter())
+        await asyncio.sleep(max(scheduled - time.perf_counter(), 0))
+
+
+async def login_burst(client: httpx.AsyncClient, total: int, concurrency: int, samples: list[float]) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+    payload = {"username": "benchuser", "password": "benchmark-password"}
+
+    async def one():
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.post("/api/accounts/login", json=payload)
+            samples.append(time.perf_counter() - started)
+            response.raise_for_status()
+
+    await asyncio.gather(*(one() for _ in range(total)))
+
+
+async def main(args: argparse.Namespace) -> None:
+    if args.inline:
+        async def inline_verify(plain_password, hashed_password):
+            return utils.verify_password(plain_password, hashed_password)
+        hashing_service.verify_password = inline_verify
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        engine = create_engine(f"sqlite+aiosqlite:///{Path(tmpdir) / 'bench.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+        session_factory = create_session(engine)
+        await seed(session_factory)
+
+        app = build_app(session_factory)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            baseline: list[float] = []
+            stop = asyncio.Event()
+            task = asyncio.create_task(measure_ping(client, stop, baseline))
+            await asyncio.sleep(1)
+            stop.set()
+            await task
+
+            during: list[float] = []
+            logins: list[float] = []
+            stop = asyncio.Event()
+            task = asyncio.create_task(measure_ping(client, stop, during))
+            await login_burst(client, args.logins, args.concurrency, logins)
+            stop.set()
+            await task
+
+        await engine.dispose()
+        hashing_service.shutdown()
+
+    mode = "inline" if args.inline else f"offloaded(workers={hashing_service.max_workers})"
+    print(f"mode: {mode}")
+    print(format_summary("GET /ping (idle)", summarize(baseline)))
+    print(format_summary("GET /ping (login burst)", summarize(during)))
+    print(format_summary("POST /login", summarize(logins)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--inline", action="store_true")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,81 @@
+"""있는 계정(틀린 비밀번호), 없는 계정, 정상 로그인의 응답 시간 분포와 로그인 한 번의 CPU 시간을 측정합니다.
+
+세 경로의 분포가 겹치면 응답 시간으로 계정이 있는지 알 수 없습니다.
+CPU 시간은 해시 스레드를 포함한 프로세스 전체 CPU 시간을 요청 수로 나눈 값입니다.
+
+    python -m benchmarks.bench_login_timing --logins 100 --concurrency 4
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from pathlib import Path
+
+#같은 계정으로 계속 로그인하므로 시도 횟수 제한을 끕니다. appserver 를 불러오기 전에 설정해야 합니다.
+os.environ.setdefault("LOGIN_RATE_LIMIT_PER_USERNAME", "0")
+os.environ.setdefault("LOGIN_RATE_LIMIT_PER_IP", "0")
+
+import httpx
+from sqlmodel import SQLModel
+
+from appserver.apps.account.hashing import hashing_service
+from appserver.db import create_engine, create_session
+from benchmarks._stats import format_summary, summarize
+from benchmarks.bench_login_burst import build_app, seed
+
+PATHS = {
+    "existing user, wrong password": ({"username": "benchuser", "password": "wrong-password"}, 401),
+    "unknown user": ({"username": "nobody", "password": "benchmark-password"}, 401),
+    "existing user, correct password": ({"username": "benchuser", "password": "benchmark-password"}, 200),
+}
+
+
+async def main(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        engine = create_engine(f"sqlite+aiosqlite:///{Path(tmpdir) / 'bench.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+        session_factory = create_session(engine)
+        await seed(session_factory)
+        await hashing_service.warm_up()
+
+        #경로를 섞어서 보내야 시간에 따른 부하 변화가 한쪽 경로에만 몰리지 않습니다.
+        order = [name for name in PATHS for _ in range(args.logins)]
+        random.Random(args.seed).shuffle(order)
+        samples: dict[str, list[float]] = {name: [] for name in PATHS}
+        semaphore = asyncio.Semaphore(args.concurrency)
+
+        app = build_app(session_factory)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            async def one(name: str):
+                payload, expected = PATHS[name]
+                async with semaphore:
+                    started = time.perf_counter()
+                    response = await client.post("/api/accounts/login", json=payload)
+                    samples[name].append(time.perf_counter() - started)
+                assert response.status_code == expected, response.text
+
+            cpu_started = time.process_time()
+            wall_started = time.perf_counter()
+            await asyncio.gather(*(one(name) for name in order))
+            cpu = time.process_time() - cpu_started
+            wall = time.perf_counter() - wall_started
+
+        await engine.dispose()
+        hashing_service.shutdown()
+
+    print(f"workers={hashing_service.max_workers} concurrency={args.concurrency}")
+    for name, values in samples.items():
+        print(format_summary(name, summarize(values)))
+    print(f"cpu per login: {cpu / len(order) * 1000:.2f}ms  throughput: {len(order) / wall:.1f}/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=100, help="경로별 요청 수")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=42)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,61 @@
+"""월 달력을 만드는 비용과 캐시된 달력을 여러 요청이 함께 쓸 때의 비용을 비교합니다.
+
+    python -m benchmarks.bench_month_grid --guests 5000 --months 12
+"""
+import argparse
+import sys
+import time
+from datetime import date
+
+from appserver.libs.datetime.calendar import get_month_grid, get_month_grids
+from benchmarks._stats import summarize
+
+YEAR = 2025
+
+
+def build_uncached(year: int, month: int) -> list[int]:
+    #캐시 전의 get_range_days_of_month 와 같은 방식
+    start_weekday = (date(year, month, 1).weekday() + 1) % 7
+    last_day = ((date(year + month // 12, month % 12 + 1, 1) - date(year, month, 1))).days
+    result = [0] * start_weekday
+    for day in range(1, last_day + 1):
+        result.append(day)
+    return result
+
+
+def timed(func, *args) -> float:
+    started = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - started
+
+
+def main(args: argparse.Namespace) -> None:
+    months = [(YEAR + (month - 1) // 12, (month - 1) % 12 + 1) for month in range(1, args.months + 1)]
+    uncached = [timed(build_uncached, *month) for _ in range(args.guests) for month in months]
+
+    get_month_grid.cache_clear()
+    get_month_grids.cache_clear()
+    cold = [timed(get_month_grid, *month) for month in months]
+    warm = [timed(get_month_grid, *month) for _ in range(args.guests) for month in months]
+    ranges = [timed(get_month_grids, YEAR, 1, args.months) for _ in range(args.guests)]
+
+    #한 번에 수 마이크로초라 ms 단위 백분위 대신 평균을 마이크로초로 출력합니다.
+    for name, samples in [
+        ("list per request", uncached),
+        ("grid (first build)", cold),
+        ("grid (cached)", warm),
+        (f"{args.months}-month range (cached)", ranges),
+    ]:
+        summary = summarize(samples)
+        print(f"{name:<34} n={summary['count']:<6} mean={summary['mean_ms'] * 1000:8.2f}us")
+
+    grid = get_month_grid(YEAR, 1)
+    size = sys.getsizeof(grid) + sum(sys.getsizeof(week) + sys.getsizeof(week.days) for week in grid.weeks)
+    print(f"one grid ~{size + sys.getsizeof(grid.days)} bytes, shared by all {args.guests} guests")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--guests", type=int, default=5000)
+    parser.add_argument("--months", type=int, default=12)
+    main(parser.parse_args())
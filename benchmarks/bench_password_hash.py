@@ -0,0 +1,65 @@
+"""Argon2 비용 설정별 verify 처리량과 지연 시간을 측정합니다.
+
+    python -m benchmarks.bench_password_hash --seconds 3
+    python -m benchmarks.bench_password_hash --params 2:19456:1 3:65536:4
+
+--params 값은 time_cost:memory_cost(KiB):parallelism 형식입니다.
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from pwdlib.hashers.bcrypt import BcryptHasher
+
+from appserver.apps.account.utils import build_password_hash
+from appserver.config import settings
+from benchmarks._stats import format_summary, summarize
+
+DEFAULT_PARAMS = [
+    "1:8192:1",
+    "2:19456:1",
+    "3:12288:1",
+    f"{settings.argon2_time_cost}:{settings.argon2_memory_cost}:{settings.argon2_parallelism}",
+]
+
+
+def run_one(label: str, verify, seconds: float, threads: int) -> None:
+    def worker() -> list[float]:
+        samples = []
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            verify()
+            samples.append(time.perf_counter() - started)
+        return samples
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        results = list(executor.map(lambda _: worker(), range(threads)))
+
+    samples = [sample for result in results for sample in result]
+    summary = summarize(samples)
+    print(f"{format_summary(label, summary)} throughput={len(samples) / seconds:8.1f}/s")
+
+
+def main(args: argparse.Namespace) -> None:
+    password = "benchmark-password"
+    print(f"threads={args.threads} seconds={args.seconds}")
+
+    for param in args.params:
+        time_cost, memory_cost, parallelism = (int(value) for value in param.split(":"))
+        password_hash = build_password_hash(time_cost, memory_cost, parallelism)
+        hashed = password_hash.hash(password)
+        run_one(f"argon2id t={time_cost} m={memory_cost} p={parallelism}",
+                lambda: password_hash.verify(password, hashed), args.seconds, args.threads)
+
+    bcrypt = BcryptHasher()
+    hashed = bcrypt.hash(password)
+    run_one("bcrypt rounds=12", lambda: bcrypt.verify(password, hashed), args.seconds, args.threads)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--params", nargs="+", default=DEFAULT_PARAMS)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--threads", type=int, default=settings.password_hash_workers)
+    main(parser.parse_args())
@@ -0,0 +1,113 @@
+"""응답 직렬화 비용을 단일 객체와 한 달 치 부킹 목록으로 비교합니다.
+
+    python -m benchmarks.bench_serialization --bookings 1500
+"""
+import argparse
+import asyncio
+import time
+from datetime import date, datetime, time as dtime, timedelta, timezone
+
+import httpx
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from sqlmodel import SQLModel
+
+from appserver.apps.account.models import User
+from appserver.apps.account.schemas import UserOut
+from appserver.apps.calendar.models import Booking
+from appserver.libs.responses import FastJSONResponse, model_response
+from benchmarks._stats import format_summary, summarize
+
+
+class BookingOut(SQLModel):
+    id: int
+    when: date
+    topic: str
+    description: str
+    time_slot_id: int
+    guest_id: int
+    created_at: datetime
+
+
+def make_user() -> User:
+    now = datetime.now(timezone.utc)
+    return User(id=1, username="benchuser", email="bench@example.com", display_name="벤치사용자",
+                hashed_password="x", is_host=True, created_at=now, updated_at=now)
+
+
+def make_bookings(total: int) -> list[Booking]:
+    now = datetime.now(timezone.utc)
+    return [
+        Booking(id=index, when=date(2025, 1, 1) + timedelta(days=index % 31), topic="상담",
+                description="부킹 설명 " * 5, time_slot_id=index % 50, guest_id=index % 200,
+                created_at=now, updated_at=now)
+        for index in range(total)
+    ]
+
+
+def timeit(func, repeat: int) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def bench_functions(user: User, bookings: list[Booking], repeat: int) -> None:
+    booking_list = TypeAdapter(list[BookingOut])
+
+    cases = {
+        "user: model_dump+JSONResponse": lambda: JSONResponse(
+            user.model_dump(mode="json", exclude={"hashed_password", "email"})),
+        "user: validate+dump_json": lambda: UserOut.model_validate(user, from_attributes=True).model_dump_json(),
+        "user: model_response": lambda: model_response(UserOut, user),
+        "bookings: validate+JSONResponse": lambda: JSONResponse(booking_list.dump_python(
+            booking_list.validate_python(bookings, from_attributes=True), mode="json")),
+        "bookings: validate+dump_json": lambda: booking_list.dump_json(
+            booking_list.validate_python(bookings, from_attributes=True)),
+        "bookings: model_response": lambda: model_response(BookingOut, bookings),
+    }
+    for name, func in cases.items():
+        iterations = repeat if name.startswith("user") else max(repeat // 50, 20)
+        print(format_summary(name, summarize(timeit(func, iterations))))
+
+
+async def bench_endpoints(bookings: list[Booking], total: int) -> None:
+    app = FastAPI()
+
+    @app.get("/default")
+    async def default_route() -> list[BookingOut]:
+        return bookings
+
+    @app.get("/fast", response_model=list[BookingOut], response_class=FastJSONResponse)
+    async def fast_route():
+        return model_response(BookingOut, bookings)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for path in ("/default", "/fast"):
+            samples = []
+            for _ in range(total):
+                started = time.perf_counter()
+                response = await client.get(path)
+                samples.append(time.perf_counter() - started)
+                response.raise_for_status()
+            print(format_summary(f"GET {path}", summarize(samples)))
+
+
+def main(args: argparse.Namespace) -> None:
+    user = make_user()
+    bookings = make_bookings(args.bookings)
+    print(f"bookings={args.bookings}")
+    bench_functions(user, bookings, args.repeat)
+    asyncio.run(bench_endpoints(bookings, args.requests))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bookings", type=int, default=1500)
+    parser.add_argument("--repeat", type=int, default=5000)
+    parser.add_argument("--requests", type=int, default=100)
+    main(parser.parse_args())
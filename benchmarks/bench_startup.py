@@ -0,0 +1,78 @@
+"""새 프로세스에서 앱을 불러오고 lifespan 을 마칠 때까지 걸리는 시간을 측정합니다.
+
+워커 하나가 요청을 받을 준비가 되기까지의 시간이므로, 워커를 늘리거나 다시 띄울 때의 지연과 같습니다.
+
+    python -m benchmarks.bench_startup --runs 5
+    python -m benchmarks.bench_startup --importtime 15   # 오래 걸린 모듈 상위 15개
+"""
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from benchmarks._stats import format_summary, summarize
+
+CHILD = """
+import asyncio, json, sys, time
+started = time.perf_counter()
+from appserver.app import create_app, lifespan
+imported = time.perf_counter()
+
+async def main():
+    app = create_app()
+    async with lifespan(app):
+        ready = time.perf_counter()
+        print(json.dumps({
+            "import": imported - started,
+            "ready": ready - started,
+            "heavy_modules": [name for name in ("jose", "pwdlib", "argon2") if name in sys.modules],
+        }))
+
+asyncio.run(main())
+"""
+
+
+def run_once(env: dict[str, str]) -> dict:
+    result = subprocess.run([sys.executable, "-c", CHILD], capture_output=True, text=True, env=env, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def importtime(env: dict[str, str], top: int) -> None:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import appserver.app"],
+        capture_output=True, text=True, env=env, check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        rows.append((int(cumulative), name.rstrip()))
+    for cumulative, name in sorted(rows, reverse=True)[:top]:
+        print(f"{cumulative / 1000:8.1f}ms {name}")
+
+
+def main(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        env = {
+            "PATH": "",
+            "PYTHONPATH": str(Path(__file__).parent.parent),
+            "DATABASE_DSN": f"sqlite+aiosqlite:///{Path(tmpdir) / 'startup.db'}",
+            "CALENDAR_PROVIDER": "fake",
+        }
+        runs = [run_once(env) for _ in range(args.runs)]
+        print(format_summary("import appserver.app", summarize([run["import"] for run in runs])))
+        print(format_summary("import + lifespan", summarize([run["ready"] for run in runs])))
+        print(f"heavy modules loaded after lifespan: {runs[-1]['heavy_modules']}")
+        if args.importtime:
+            print()
+            importtime(env, args.importtime)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--importtime", type=int, default=0, help="불러오는 데 오래 걸린 모듈을 이 개수만큼 출력합니다.")
+    main(parser.parse_args())
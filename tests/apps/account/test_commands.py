@@ -0,0 +1,68 @@
+from pwdlib.hashers.bcrypt import BcryptHasher
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from appserver.apps.account.commands import import_users, main
+from appserver.apps.account.hashing import PasswordHashingService
+from appserver.apps.account.models import User
+from appserver.apps.account.utils import verify_password
+
+
+async def test_사용자를_배치로_추가하고_중복과_잘못된_행은_건너뛴다(db_session: AsyncSession, host_user: User):
+    bcrypt_hash = BcryptHasher(rounds=4).hash("legacy-password")
+    rows = [
+        {"username": "import01", "email": "import01@example.com", "password": "password01"},
+        {"username": "import02", "email": "import02@example.com", "password": "password02", "is_host": "true"},
+        {"username": "import03", "email": "import03@example.com", "hashed_password": bcrypt_hash},
+        #이미 있는 username
+        {"username": host_user.username, "email": "other@example.com", "password": "password04"},
+        #배치 안에서 중복된 email
+        {"username": "import05", "email": "import01@example.com", "password": "password05"},
+        #비밀번호가 없는 행
+        {"username": "import06", "email": "import06@example.com", "password": ""},
+    ]
+
+    hashing = PasswordHashingService(max_workers=2, max_queue_size=2)
+    try:
+        result = await import_users(db_session, rows, hashing=hashing, batch_size=2)
+    finally:
+        hashing.shutdown()
+
+    assert (result.inserted, result.skipped, result.invalid) == (3, 2, 1)
+
+    users = {
+        user.username: user
+        for user in (await db_session.scalars(select(User).where(User.username.like("import%")))).all()
+    }
+    assert set(users) == {"import01", "import02", "import03"}
+    assert verify_password("password01", users["import01"].hashed_password)
+    assert users["import02"].is_host is True
+    assert users["import03"].hashed_password == bcrypt_hash
+    assert len(users["import01"].display_name) == 8
+
+
+def test_import_users_명령은_CSV_파일을_읽는다(tmp_path, monkeypatch, capsys):
+    from appserver import db
+
+    csv_path = tmp_path / "users.csv"
+    csv_path.write_text(
+        "username,email,display_name,password\n"
+        "csvuser1,csvuser1@example.com,CSV사용자1,password01\n"
+        "csvuser2,csvuser2@example.com,,password02\n",
+        encoding="utf-8",
+    )
+    monkeypatch.setattr(db, "DSN", f"sqlite+aiosqlite:///{tmp_path / 'import.db'}")
+
+    import asyncio
+    from sqlmodel import SQLModel
+
+    async def create_tables():
+        engine = db.create_engine(db.DSN)
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+        await engine.dispose()
+
+    asyncio.run(create_tables())
+
+    assert main(["import-users", str(csv_path), "--batch-size", "10", "--workers", "2"]) == 0
+    assert "inserted=2 skipped=0 invalid=0" in capsys.readouterr().out
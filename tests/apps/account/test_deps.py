@@ -0,0 +1,87 @@
+from datetime import timedelta
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from appserver.apps.account import deps
+from appserver.apps.account.deps import authenticate_token
+from appserver.apps.account.exceptions import ExpiredTokenError, InvalidTokenError
+from appserver.apps.account.models import User
+from appserver.apps.account.utils import create_access_token
+
+
+@pytest.fixture(autouse=True)
+def clear_token_cache():
+    deps.token_cache.clear()
+    yield
+    deps.token_cache.clear()
+
+
+def make_token(user: User, **kwargs) -> str:
+    return create_access_token(
+        data={"sub": user.username, "display_name": user.display_name, "is_host": user.is_host},
+        **kwargs,
+    )
+
+
+async def test_Bearer_헤더로_인증하면_DB_조회없이_사용자_정보를_돌려준다(host_user: User, client: TestClient):
+    token = make_token(host_user)
+    response = client.get("/api/accounts/@me", headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {
+        "username": host_user.username,
+        "display_name": host_user.display_name,
+        "is_host": True,
+    }
+
+
+async def test_로그인_쿠키로도_인증할_수_있다(host_user: User, client: TestClient):
+    response = client.post("/api/accounts/login", json={"username": host_user.username, "password": "testtest"})
+    assert response.status_code == status.HTTP_200_OK
+
+    client.cookies.set(deps.AUTH_COOKIE_NAME, response.cookies[deps.AUTH_COOKIE_NAME])
+    response = client.get("/api/accounts/@me")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["username"] == host_user.username
+
+
+async def test_인증_정보가_없거나_잘못되면_401_로_응답한다(host_user: User, client: TestClient):
+    assert client.get("/api/accounts/@me").status_code == status.HTTP_401_UNAUTHORIZED
+
+    response = client.get("/api/accounts/@me", headers={"Authorization": "Bearer not-a-token"})
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert response.json()["detail"] == InvalidTokenError().detail
+
+    expired = make_token(host_user, expires_delta=timedelta(minutes=-1))
+    response = client.get("/api/accounts/@me", headers={"Authorization": f"Bearer {expired}"})
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert response.json()["detail"] == ExpiredTokenError().detail
+
+
+async def test_검증한_토큰은_캐시하고_다시_검증하지_않는다(host_user: User, monkeypatch):
+    token = make_token(host_user)
+    first = authenticate_token(token)
+
+    def fail_decode(token):
+        raise AssertionError("cached token must not be decoded again")
+
+    monkeypatch.setattr(deps, "decode_token", fail_decode)
+    assert authenticate_token(token) is first
+    assert deps.token_cache.hits == 1
+
+
+def test_필수_클레임이_없는_토큰은_거부한다():
+    token = create_access_token(data={"sub": "someone"})
+    with pytest.raises(InvalidTokenError):
+        authenticate_token(token)
+    assert len(deps.token_cache) == 0
+
+
+async def test_캐시는_토큰_만료_시각을_넘지_않는다(host_user: User):
+    token = make_token(host_user, expires_delta=timedelta(seconds=30))
+    authenticate_token(token)
+
+    expires_at, _ = next(iter(deps.token_cache._data.values()))
+    assert expires_at - deps.token_cache._timer() <= 30
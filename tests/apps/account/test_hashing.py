@@ -0,0 +1,87 @@
+import asyncio
+import threading
+
+import pytest
+
+from appserver.apps.account.exceptions import HashingQueueFullError
+from appserver.apps.account.hashing import PasswordHashingService
+from appserver.apps.account.utils import verify_password
+
+
+async def test_해시와_검증은_이벤트_루프가_아닌_스레드에서_실행된다():
+    service = PasswordHashingService(max_workers=2, max_queue_size=4)
+    try:
+        hashed = await service.hash_password("testtest")
+        assert verify_password("testtest", hashed)
+        assert await service.verify_password("testtest", hashed) is True
+        assert await service.verify_password("wrong-password", hashed) is False
+        assert service.in_flight == 0
+        assert service.completed == 3
+    finally:
+        service.shutdown()
+
+
+async def test_대기열이_가득_차면_HashingQueueFullError_를_일으킨다(monkeypatch):
+    release = threading.Event()
+
+    def slow_hash(password: str) -> str:
+        release.wait(timeout=5)
+        return password
+
+    monkeypatch.setattr("appserver.apps.account.utils.hash_password", slow_hash)
+
+    service = PasswordHashingService(max_workers=1, max_queue_size=1)
+    try:
+        running = asyncio.create_task(service.hash_password("a"))
+        queued = asyncio.create_task(service.hash_password("b"))
+        await asyncio.sleep(0.05)
+
+        assert service.in_flight == 2
+        assert service.queue_depth == 1
+
+        with pytest.raises(HashingQueueFullError):
+            await service.hash_password("c")
+        assert service.rejected == 1
+
+        release.set()
+        assert await asyncio.gather(running, queued) == ["a", "b"]
+        assert service.queue_depth == 0
+    finally:
+        release.set()
+        service.shutdown()
+
+
+async def test_실패하거나_취소된_요청은_완료로_세지_않는다(monkeypatch):
+    release = threading.Event()
+
+    def broken_hash(password: str) -> str:
+        raise RuntimeError("hash failed")
+
+    def slow_verify(plain_password: str, hashed_password: str) -> bool:
+        release.wait(timeout=5)
+        return True
+
+    monkeypatch.setattr("appserver.apps.account.utils.hash_password", broken_hash)
+    monkeypatch.setattr("appserver.apps.account.utils.verify_password", slow_verify)
+
+    service = PasswordHashingService(max_workers=1, max_queue_size=1)
+    try:
+        with pytest.raises(RuntimeError):
+            await service.hash_password("a")
+
+        waiting = asyncio.create_task(service.verify_password("a", "b"))
+        await asyncio.sleep(0.05)
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+
+        assert (service.completed, service.failed, service.in_flight) == (0, 2, 0)
+    finally:
+        release.set()
+        service.shutdown()
+
+
+@pytest.mark.parametrize("max_workers, max_queue_size", [(0, 1), (1, -1)])
+def test_잘못된_동시성_설정은_거부한다(max_workers, max_queue_size):
+    with pytest.raises(ValueError):
+        PasswordHashingService(max_workers=max_workers, max_queue_size=max_queue_size)
@@ -1,10 +1,14 @@
+import pytest
 from fastapi import status
 from fastapi.testclient import TestClient
+from pwdlib.hashers.argon2 import Argon2Hasher
+from pwdlib.hashers.bcrypt import BcryptHasher
+from sqlalchemy.ext.asyncio import AsyncSession
 
 
 from appserver.apps.account.schemas import LoginPayload, SignupPayload
 from appserver.apps.account.models import User
-from appserver.apps.account.utils import ACCESS_TOKEN_EXPIRE_MINUTES
+from appserver.apps.account.utils import ACCESS_TOKEN_EXPIRE_MINUTES, password_hash, verify_password
 
 
 async def test_로그인_성공(host_user: User, client: TestClient):
@@ -29,4 +33,90 @@ async def test_로그인_성공(host_user: User, client: TestClient):
 
     cookie = response.cookies.get("auth_token")
     assert cookie is not None
-    assert cookie == data["access_token"]
\ No newline at end of file
+    assert cookie == data["access_token"]
+
+@pytest.mark.parametrize("legacy_hasher", [
+  BcryptHasher(rounds=4),
+  Argon2Hasher(time_cost=1, memory_cost=8192, parallelism=1),
+])
+async def test_이전_방식의_해시는_로그인_성공시_현재_설정으로_다시_해시된다(
+  legacy_hasher, client: TestClient, db_session: AsyncSession
+):
+  user = User(
+    username="legacyuser",
+    hashed_password=legacy_hasher.hash("testtest"),
+    email="legacy@example.com",
+    display_name="legacyuser",
+  )
+  db_session.add(user)
+  await db_session.commit()
+  legacy_hash = user.hashed_password
+
+  response = client.post("/api/accounts/login", json={"username": "legacyuser", "password": "testtest"})
+  assert response.status_code == status.HTTP_200_OK
+
+  await db_session.refresh(user)
+  assert user.hashed_password != legacy_hash
+  assert password_hash.current_hasher.identify(user.hashed_password)
+  assert not password_hash.current_hasher.check_needs_rehash(user.hashed_password)
+  assert verify_password("testtest", user.hashed_password)
+
+
+async def test_현재_설정의_해시는_로그인해도_바뀌지_않는다(host_user: User, client: TestClient, db_session: AsyncSession):
+  current_hash = host_user.hashed_password
+
+  response = client.post("/api/accounts/login", json={"username": host_user.username, "password": "testtest"})
+  assert response.status_code == status.HTTP_200_OK
+
+  await db_session.refresh(host_user)
+  assert host_user.hashed_password == current_hash
+
+
+async def test_계정별_로그인_시도_한도를_넘으면_비밀번호를_검증하지_않고_429_로_거절한다(
+  host_user: User, client: TestClient, monkeypatch: pytest.MonkeyPatch
+):
+  from appserver.apps.account.hashing import hashing_service
+  from appserver.apps.account.ratelimit import LOGIN_HASHES_AVOIDED, login_rate_limiter
+
+  verified = []
+  original = hashing_service.verify_and_update_password
+
+  async def counting_verify(plain_password: str, hashed_password: str):
+    verified.append(plain_password)
+    return await original(plain_password, hashed_password)
+
+  monkeypatch.setattr(hashing_service, "verify_and_update_password", counting_verify)
+  burst = login_rate_limiter.by_username.burst
+  avoided = LOGIN_HASHES_AVOIDED.value(limit="username")
+
+  for _ in range(burst):
+    response = client.post("/api/accounts/login", json={"username": host_user.username, "password": "wrong"})
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+  response = client.post("/api/accounts/login", json={"username": host_user.username, "password": "testtest"})
+  assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+  assert int(response.headers["Retry-After"]) >= 1
+  assert len(verified) == burst
+  assert LOGIN_HASHES_AVOIDED.value(limit="username") == avoided + 1
+
+
+async def test_없는_계정도_더미_해시를_검증하고_틀린_비밀번호와_같은_응답을_돌려준다(
+  host_user: User, client: TestClient, monkeypatch: pytest.MonkeyPatch
+):
+  from appserver.apps.account.hashing import hashing_service
+
+  dummy_verified = []
+  original = hashing_service.verify_dummy_password
+
+  async def counting_verify(plain_password: str) -> bool:
+    dummy_verified.append(plain_password)
+    return await original(plain_password)
+
+  monkeypatch.setattr(hashing_service, "verify_dummy_password", counting_verify)
+
+  unknown = client.post("/api/accounts/login", json={"username": "nobody", "password": "testtest"})
+  wrong = client.post("/api/accounts/login", json={"username": host_user.username, "password": "wrong"})
+
+  assert unknown.status_code == wrong.status_code == status.HTTP_401_UNAUTHORIZED
+  assert unknown.json() == wrong.json()
+  assert dummy_verified == ["testtest"]
@@ -1,6 +1,8 @@
 from fastapi import status
 from fastapi.testclient import TestClient
 
+from appserver.apps.account.exceptions import DuplicatedUsernameError, DuplicatedEmailError
+
 
 async def test_회원가입_성공(client: TestClient):
     payload = {
@@ -33,4 +35,31 @@ async def test_응답_결과에는_username_display_name_is_host_만_출력한
     assert response.status_code == status.HTTP_201_CREATED
     response_keys = frozenset(data.keys())
     expected_keys = frozenset(["username", "display_name", "is_host"])
-    assert response_keys == expected_keys
\ No newline at end of file
+    assert response_keys == expected_keys
+
+async def test_중복된_username_은_DuplicatedUsernameError_로_응답한다(client: TestClient):
+    payload = {
+        "username": "test",
+        "email": "test@example.com",
+        "password": "test테스트1234",
+        "password_again": "test테스트1234",
+    }
+    assert client.post("/api/accounts/signup", json=payload).status_code == status.HTTP_201_CREATED
+
+    response = client.post("/api/accounts/signup", json={**payload, "email": "other@example.com"})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert response.json()["detail"] == DuplicatedUsernameError().detail
+
+
+async def test_중복된_email_은_DuplicatedEmailError_로_응답한다(client: TestClient):
+    payload = {
+        "username": "test",
+        "email": "test@example.com",
+        "password": "test테스트1234",
+        "password_again": "test테스트1234",
+    }
+    assert client.post("/api/accounts/signup", json=payload).status_code == status.HTTP_201_CREATED
+
+    response = client.post("/api/accounts/signup", json={**payload, "username": "other"})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert response.json()["detail"] == DuplicatedEmailError().detail
@@ -0,0 +1,82 @@
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from appserver.apps.account import cache as cache_module
+from appserver.apps.account.cache import InMemoryUserCacheBackend, UserCache, user_cache
+from appserver.apps.account.models import User
+
+
+async def test_사용자_정보를_캐시하고_비밀번호_해시는_응답하지_않는다(host_user: User, client: TestClient):
+    misses = user_cache.misses
+    response = client.get(f"/api/accounts/users/{host_user.username}")
+    assert response.status_code == status.HTTP_200_OK
+    assert "hashed_password" not in response.json()
+    assert response.headers["ETag"]
+    assert user_cache.misses == misses + 1
+
+    misses = user_cache.misses
+    hits = user_cache.hits
+    response = client.get(f"/api/accounts/users/{host_user.username}")
+    assert response.status_code == status.HTTP_200_OK
+    assert user_cache.hits == hits + 1
+    assert user_cache.misses == misses
+
+
+async def test_If_None_Match_가_ETag_와_같으면_304_로_응답한다(host_user: User, client: TestClient):
+    etag = client.get(f"/api/accounts/users/{host_user.username}").headers["ETag"]
+
+    response = client.get(f"/api/accounts/users/{host_user.username}", headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+
+    response = client.get(f"/api/accounts/users/{host_user.username}", headers={"If-None-Match": '"stale"'})
+    assert response.status_code == status.HTTP_200_OK
+
+
+async def test_If_None_Match_의_여러_값과_약한_ETag_도_304_로_응답한다(host_user: User, client: TestClient):
+    etag = client.get(f"/api/accounts/users/{host_user.username}").headers["ETag"]
+
+    for if_none_match in (f'"stale", {etag}', f"W/{etag}", "*"):
+        response = client.get(f"/api/accounts/users/{host_user.username}", headers={"If-None-Match": if_none_match})
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED, if_none_match
+
+
+async def test_사용자가_수정되면_캐시를_비우고_ETag_가_바뀐다(
+    host_user: User, client: TestClient, db_session: AsyncSession
+):
+    first = client.get(f"/api/accounts/users/{host_user.username}")
+    assert host_user.username in user_cache.local
+
+    host_user.display_name = "새 표시 이름"
+    db_session.add(host_user)
+    await db_session.commit()
+    assert host_user.username not in user_cache.local
+
+    second = client.get(f"/api/accounts/users/{host_user.username}")
+    assert second.json()["display_name"] == "새 표시 이름"
+    assert second.headers["ETag"] != first.headers["ETag"]
+
+
+async def test_공유_저장소를_설정하면_로컬_캐시가_비어도_공유_저장소에서_읽는다(
+    host_user: User, monkeypatch, db_session: AsyncSession
+):
+    shared = InMemoryUserCacheBackend()
+    cache = UserCache(maxsize=10, ttl=60, backend=shared)
+    monkeypatch.setattr(cache_module, "user_cache", cache)
+
+    entry = await cache.set(host_user)
+    cache.local.clear()
+    assert await cache.get(host_user.username) == entry
+    assert cache.stats()["hits"] == 1
+
+    host_user.display_name = "공유캐시"
+    db_session.add(host_user)
+    await db_session.commit()
+    for task in list(cache._pending_deletes):
+        await task
+
+    assert await shared.get(host_user.username) is None
+    assert await cache.get(host_user.username) is None
+    assert cache.misses == 1
@@ -0,0 +1,190 @@
+from datetime import date, datetime, time, timezone
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from appserver.apps.account.models import User
+from appserver.apps.calendar import availability
+from appserver.apps.calendar.availability import compute_month_availability, get_month_availability
+from appserver.apps.calendar.models import Booking, Calendar, TimeSlot
+
+
+def test_요일과_부킹으로_일자별_예약_가능_여부를_계산한다():
+    #2024년 12월 1일은 일요일(6) 입니다.
+    result = compute_month_availability(
+        calendar_id=1,
+        year=2024,
+        month=12,
+        time_slots=[(10, [0, 2]), (11, [0])],
+        bookings=[(10, date(2024, 12, 2)), (11, date(2024, 12, 2)), (10, date(2024, 12, 4))],
+    )
+
+    assert len(result.open_masks) == 31
+    #12월 2일(월)은 두 슬롯 모두 예약되어 있습니다.
+    assert result.slot_status(2) == {10: False, 11: False}
+    assert result.is_available(2) is False
+    #12월 4일(수)은 10번 슬롯만 열리는데 이미 예약되어 있습니다.
+    assert result.slot_status(4) == {10: False}
+    #12월 9일(월)은 두 슬롯 모두 예약 가능합니다.
+    assert result.slot_status(9) == {10: True, 11: True}
+    #12월 1일(일)은 열린 슬롯이 없습니다.
+    assert result.slot_status(1) == {}
+
+    assert result.available_days == (9, 11, 16, 18, 23, 25, 30)
+    assert result.day_bitset == sum(1 << (day - 1) for day in result.available_days)
+
+
+def test_다른_달의_부킹이나_모르는_슬롯의_부킹은_무시한다():
+    result = compute_month_availability(
+        1, 2024, 12,
+        time_slots=[(10, [0])],
+        bookings=[(10, date(2025, 1, 6)), (99, date(2024, 12, 2))],
+    )
+    assert result.is_available(2)
+
+
+async def test_한번의_쿼리로_불러온_결과를_캐시하고_부킹이_저장되면_무효화한다(
+    db_session: AsyncSession, host_calendar: Calendar, guest_user: User
+):
+    time_slot = TimeSlot(
+        start_time=time(10, 0),
+        end_time=time(11, 0),
+        weekdays=[0],
+        calendar_id=host_calendar.id,
+    )
+    db_session.add(time_slot)
+    await db_session.commit()
+
+    first = await get_month_availability(db_session, host_calendar.id, 2024, 12)
+    assert first.is_available(2)
+    assert await get_month_availability(db_session, host_calendar.id, 2024, 12) is first
+
+    db_session.add(Booking(
+        when=date(2024, 12, 2),
+        topic="상담",
+        description="상담 신청",
+        time_slot_id=time_slot.id,
+        calendar_id=host_calendar.id,
+        guest_id=guest_user.id,
+    ))
+    await db_session.commit()
+
+    second = await get_month_availability(db_session, host_calendar.id, 2024, 12)
+    assert second is not first
+    assert second.is_available(2) is False
+    assert second.is_available(9) is True
+
+
+async def test_부킹의_calendar_id_로_이_워커가_계산하지_않은_캐시도_무효화한다(
+    db_session: AsyncSession, host_calendar: Calendar, guest_user: User
+):
+    time_slot = TimeSlot(start_time=time(10, 0), end_time=time(11, 0), weekdays=[0], calendar_id=host_calendar.id)
+    db_session.add(time_slot)
+    await db_session.commit()
+    #슬롯 목록을 모르는 채로 캐시에 들어간 현황
+    availability.availability_cache.set(
+        (host_calendar.id, 2024, 12), compute_month_availability(host_calendar.id, 2024, 12, [], [])
+    )
+
+    db_session.add(Booking(
+        when=date(2024, 12, 2),
+        topic="상담",
+        description="상담 신청",
+        time_slot_id=time_slot.id,
+        calendar_id=host_calendar.id,
+        guest_id=guest_user.id,
+    ))
+    await db_session.commit()
+
+    assert availability.availability_cache.get((host_calendar.id, 2024, 12)) is None
+
+
+async def test_타임슬롯이_바뀌면_캘린더의_모든_달을_무효화한다(db_session: AsyncSession, host_calendar: Calendar):
+    time_slot = TimeSlot(start_time=time(10, 0), end_time=time(11, 0), weekdays=[0], calendar_id=host_calendar.id)
+    db_session.add(time_slot)
+    await db_session.commit()
+
+    december = await get_month_availability(db_session, host_calendar.id, 2024, 12)
+    january = await get_month_availability(db_session, host_calendar.id, 2025, 1)
+
+    time_slot.weekdays = [1]
+    db_session.add(time_slot)
+    await db_session.commit()
+
+    assert await get_month_availability(db_session, host_calendar.id, 2024, 12) is not december
+    assert await get_month_availability(db_session, host_calendar.id, 2025, 1) is not january
+    assert (await get_month_availability(db_session, host_calendar.id, 2024, 12)).is_available(3)
+
+
+async def test_롤백된_변경은_캐시를_비우지_않는다(db_session: AsyncSession, host_calendar: Calendar):
+    time_slot = TimeSlot(start_time=time(10, 0), end_time=time(11, 0), weekdays=[0], calendar_id=host_calendar.id)
+    db_session.add(time_slot)
+    await db_session.commit()
+    calendar_id = host_calendar.id
+    cached = await get_month_availability(db_session, calendar_id, 2024, 12)
+
+    time_slot.weekdays = [1]
+    db_session.add(time_slot)
+    await db_session.flush()
+    await db_session.rollback()
+
+    assert await get_month_availability(db_session, calendar_id, 2024, 12) is cached
+
+
+def test_예약_가능한_슬롯을_캘린더_시간대_기준_UTC_시점으로_돌려준다():
+    result = compute_month_availability(
+        1, 2025, 3,
+        time_slots=[(10, [6]), (11, [6])],
+        bookings=[(11, date(2025, 3, 2))],
+        slot_times={10: (time(9, 0), time(10, 0)), 11: (time(13, 0), time(14, 0))},
+    )
+
+    instants = list(result.free_instants("America/New_York"))
+    #3월 2일(일)은 11번 슬롯이 예약되어 있고, 3월 9일(일)부터는 서머타임(-4시간)입니다.
+    assert instants[:3] == [
+        (10, datetime(2025, 3, 2, 14, tzinfo=timezone.utc), datetime(2025, 3, 2, 15, tzinfo=timezone.utc)),
+        (10, datetime(2025, 3, 9, 13, tzinfo=timezone.utc), datetime(2025, 3, 9, 14, tzinfo=timezone.utc)),
+        (11, datetime(2025, 3, 9, 17, tzinfo=timezone.utc), datetime(2025, 3, 9, 18, tzinfo=timezone.utc)),
+    ]
+
+
+async def test_게스트_시간대의_한_달은_캘린더의_앞뒤_달에_걸쳐_계산한다(
+    db_session: AsyncSession, host_calendar: Calendar
+):
+    host_calendar.timezone = "Asia/Seoul"
+    #서울 월요일 08:00 은 UTC 로 전날(일요일) 23:00 입니다.
+    db_session.add(TimeSlot(start_time=time(8, 0), end_time=time(9, 0), weekdays=[0], calendar_id=host_calendar.id))
+    await db_session.commit()
+
+    instants = await availability.get_free_instants(db_session, host_calendar.id, "Asia/Seoul", 2025, 3, "UTC")
+
+    starts = [start for _, start, _ in instants]
+    #UTC 3월 2일(일) 23:00 ~ 3월 30일(일) 23:00, 서울 3월 31일(월) 08:00 은 UTC 3월 30일 이므로 포함됩니다.
+    assert starts[0] == datetime(2025, 3, 2, 23, tzinfo=timezone.utc)
+    assert starts[-1] == datetime(2025, 3, 30, 23, tzinfo=timezone.utc)
+    assert len(starts) == 5
+
+    #4월의 첫 슬롯은 서울 4월 7일(월) 08:00 입니다.
+    april = await availability.get_free_instants(db_session, host_calendar.id, "Asia/Seoul", 2025, 4, "UTC")
+    assert april[0][1] == datetime(2025, 4, 6, 23, tzinfo=timezone.utc)
+
+
+async def test_버전이_바뀌면_다른_워커가_바꾼_것으로_보고_캐시를_다시_읽는다(
+    db_session: AsyncSession, host_calendar: Calendar
+):
+    db_session.add(TimeSlot(start_time=time(10, 0), end_time=time(11, 0), weekdays=[0], calendar_id=host_calendar.id))
+    await db_session.commit()
+    #다른 워커가 타임슬롯을 추가하기 전에 캐시된 빈 현황
+    availability.availability_cache.set(
+        (host_calendar.id, 2024, 12), compute_month_availability(host_calendar.id, 2024, 12, [], [])
+    )
+    version = await availability.load_availability_version(
+        db_session, host_calendar.id, date(2024, 12, 1), date(2024, 12, 31)
+    )
+
+    assert await availability.get_day_bitset(db_session, host_calendar.id, "UTC", 2024, 12) == 0
+    bitset = await availability.get_day_bitset(db_session, host_calendar.id, "UTC", 2024, 12, version=version)
+    assert bitset == sum(1 << (day - 1) for day in (2, 9, 16, 23, 30))
+    #같은 버전이면 캐시를 그대로 씁니다.
+    cached = await availability.get_month_availability(db_session, host_calendar.id, 2024, 12)
+    await availability.get_day_bitset(db_session, host_calendar.id, "UTC", 2024, 12, version=version)
+    assert await availability.get_month_availability(db_session, host_calendar.id, 2024, 12) is cached
@@ -0,0 +1,173 @@
+import csv
+import io
+import json
+from datetime import date, time, timedelta
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy import select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from appserver.apps.account.models import User
+from appserver.apps.account.schemas import AuthUser
+from appserver.apps.calendar.endpoints import host_bookings_query
+from appserver.apps.calendar.models import Booking, Calendar, TimeSlot
+from appserver.apps.outbox.models import OutboxMessage
+from appserver.apps.outbox.sinks import CALENDAR_EVENT_TOPIC, EMAIL_TOPIC
+
+FIRST_DAY = date(2024, 12, 2)
+
+
+@pytest.fixture()
+async def bookings(db_session: AsyncSession, host_calendar: Calendar, guest_user: User) -> list[Booking]:
+    morning = TimeSlot(start_time=time(10, 0), end_time=time(11, 0), weekdays=list(range(7)), calendar_id=host_calendar.id)
+    evening = TimeSlot(start_time=time(18, 0), end_time=time(19, 0), weekdays=list(range(7)), calendar_id=host_calendar.id)
+    db_session.add_all([morning, evening])
+    await db_session.flush()
+
+    #같은 날 두 건씩 있어서 when 이 같을 때 id 로 순서를 정하는지 확인할 수 있습니다.
+    items = [
+        Booking(
+            when=FIRST_DAY + timedelta(days=index // 2),
+            topic=f"상담 {index}",
+            description="상담 신청",
+            time_slot_id=(evening if index % 2 else morning).id,
+            calendar_id=host_calendar.id,
+            guest_id=guest_user.id,
+        )
+        for index in reversed(range(25))
+    ]
+    db_session.add_all(items)
+    await db_session.commit()
+    return sorted(items, key=lambda booking: (booking.when, booking.id))
+
+
+def collect_pages(client: TestClient, url: str, headers: dict, limit: int) -> list[list[dict]]:
+    pages = []
+    cursor = None
+    while True:
+        params = {"limit": limit}
+        if cursor is not None:
+            params["cursor"] = cursor
+        response = client.get(url, params=params, headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        pages.append(data["items"])
+        cursor = data["next_cursor"]
+        if cursor is None:
+            return pages
+
+
+async def test_게스트는_자신의_부킹을_커서로_나눠_조회한다(
+    client: TestClient, bookings: list[Booking], guest_user: User, auth_headers
+):
+    pages = collect_pages(client, "/api/bookings", auth_headers(guest_user), limit=10)
+
+    assert [len(page) for page in pages] == [10, 10, 5]
+    items = [item for page in pages for item in page]
+    assert [item["id"] for item in items] == [booking.id for booking in bookings]
+    assert items[0]["when"] == FIRST_DAY.isoformat()
+    #역순으로 넣었기 때문에 같은 날에서는 저녁 타임슬롯 부킹의 id 가 더 작습니다.
+    assert items[0]["start_time"] == "18:00:00"
+    assert items[1]["start_time"] == "10:00:00"
+
+
+async def test_호스트는_자신의_캘린더_부킹을_조회한다(
+    client: TestClient, bookings: list[Booking], host_user: User, guest_user: User, auth_headers
+):
+    url = f"/api/calendars/{host_user.username}/bookings"
+    pages = collect_pages(client, url, auth_headers(host_user), limit=7)
+
+    assert [item["id"] for page in pages for item in page] == [booking.id for booking in bookings]
+
+    #다른 사용자는 호스트의 부킹을 볼 수 없습니다.
+    assert client.get(url, headers=auth_headers(guest_user)).status_code == status.HTTP_403_FORBIDDEN
+    #로그인하지 않으면 볼 수 없습니다.
+    assert client.get(url).status_code == status.HTTP_401_UNAUTHORIZED
+
+
+async def test_호스트_부킹_목록은_캘린더_인덱스를_순서대로_읽는다(db_session: AsyncSession, host_user: User):
+    user = AuthUser(username=host_user.username, display_name=host_user.display_name, is_host=True)
+    stmt = host_bookings_query(user, host_user.username)
+    stmt = stmt.where(tuple_(Booking.when, Booking.id) > (FIRST_DAY, 0)).limit(10)
+    sql = stmt.compile(db_session.bind, compile_kwargs={"literal_binds": True})
+
+    plan = " / ".join(row[-1] for row in await db_session.execute(text(f"EXPLAIN QUERY PLAN {sql}")))
+
+    assert "ix_bookings_calendar_id_when_id" in plan
+    #(calendar_id, when, id) 순서 그대로 읽으므로 따로 정렬하지 않습니다.
+    assert "TEMP B-TREE" not in plan
+
+
+async def test_잘못된_커서는_422_로_응답한다(client: TestClient, guest_user: User, auth_headers):
+    response = client.get("/api/bookings", params={"cursor": "broken"}, headers=auth_headers(guest_user))
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+async def test_부킹을_NDJSON_으로_내려받는다(
+    client: TestClient, bookings: list[Booking], guest_user: User, auth_headers
+):
+    response = client.get("/api/bookings/export", headers=auth_headers(guest_user))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["id"] for line in lines] == [booking.id for booking in bookings]
+
+
+async def test_호스트는_부킹을_CSV_로_내려받는다(
+    client: TestClient, bookings: list[Booking], host_user: User, auth_headers
+):
+    response = client.get(
+        f"/api/calendars/{host_user.username}/bookings/export",
+        params={"format": "csv"},
+        headers=auth_headers(host_user),
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [int(row["id"]) for row in rows] == [booking.id for booking in bookings]
+    assert rows[0]["topic"] == bookings[0].topic
+
+
+@pytest.fixture()
+async def monday_slot(db_session: AsyncSession, host_calendar: Calendar) -> TimeSlot:
+    time_slot = TimeSlot(start_time=time(10, 0), end_time=time(11, 0), weekdays=[0], calendar_id=host_calendar.id)
+    db_session.add(time_slot)
+    await db_session.commit()
+    return time_slot
+
+
+async def test_부킹을_만들면_캘린더_일정과_알림_메일을_아웃박스에_남긴다(
+    client: TestClient, db_session: AsyncSession, monday_slot: TimeSlot, guest_user: User, auth_headers
+):
+    payload = {"time_slot_id": monday_slot.id, "when": "2024-12-02", "topic": "상담", "description": "상담 신청"}
+    response = client.post("/api/bookings", json=payload, headers=auth_headers(guest_user))
+
+    assert response.status_code == status.HTTP_201_CREATED
+    data = response.json()
+    assert data["guest_id"] == guest_user.id
+    assert data["start_time"] == "10:00:00"
+
+    messages = (await db_session.scalars(select(OutboxMessage).order_by(OutboxMessage.id))).all()
+    assert [(message.topic, message.idempotency_key) for message in messages] == [
+        (CALENDAR_EVENT_TOPIC, f"booking-{data['id']}-calendar-event"),
+        (EMAIL_TOPIC, f"booking-{data['id']}-created-email"),
+    ]
+    assert messages[0].payload["when"] == "2024-12-02"
+    #워커가 다시 조회하지 않고 일정과 메일을 만들 수 있도록 필요한 값을 함께 남깁니다.
+    assert messages[0].payload["start"] == "2024-12-02T10:00:00+00:00"
+    assert messages[0].payload["guest_email"] == guest_user.email
+
+
+async def test_부킹을_만들지_못하면_아웃박스에도_남기지_않는다(
+    client: TestClient, db_session: AsyncSession, monday_slot: TimeSlot, guest_user: User, auth_headers
+):
+    #화요일에는 열리지 않는 타임슬롯입니다.
+    payload = {"time_slot_id": monday_slot.id, "when": "2024-12-03", "topic": "상담", "description": "상담 신청"}
+    response = client.post("/api/bookings", json=payload, headers=auth_headers(guest_user))
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert (await db_session.scalars(select(OutboxMessage))).all() == []
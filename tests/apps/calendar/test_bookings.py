@@ -0,0 +1,204 @@
+import asyncio
+from datetime import date, time
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import SQLModel
+
+from appserver.apps.account.models import User
+from appserver.apps.calendar import availability
+from appserver.apps.calendar.bookings import insert_booking
+from appserver.apps.calendar.exceptions import (
+    GuestBookingOverlapError,
+    SlotAlreadyBookedError,
+    SlotNotAvailableError,
+    TimeSlotNotFoundError,
+)
+from appserver.apps.calendar.models import Booking, Calendar, TimeSlot
+from appserver.apps.calendar.overlaps import guest_booking_indexes, load_guest_booking_index
+from appserver.apps.calendar.providers import slot_range
+from appserver.db import create_engine, create_session
+
+#2024년 12월 2일은 월요일입니다.
+MONDAY = date(2024, 12, 2)
+
+
+@pytest.fixture()
+async def time_slot(db_session: AsyncSession, host_calendar: Calendar) -> TimeSlot:
+    time_slot = TimeSlot(start_time=time(10, 0), end_time=time(11, 0), weekdays=[0, 2], calendar_id=host_calendar.id)
+    db_session.add(time_slot)
+    await db_session.commit()
+    return time_slot
+
+
+@pytest.fixture()
+async def other_host_time_slot(db_session: AsyncSession) -> TimeSlot:
+    host = User(
+        username="otherhost",
+        email="otherhost@example.com",
+        display_name="otherhost",
+        hashed_password="not-a-real-hash",
+        is_host=True,
+    )
+    db_session.add(host)
+    await db_session.flush()
+    calendar = Calendar(host_id=host.id, topics=[], description="", google_calendar_id="")
+    db_session.add(calendar)
+    await db_session.flush()
+    time_slot = TimeSlot(start_time=time(10, 30), end_time=time(11, 30), weekdays=[0], calendar_id=calendar.id)
+    db_session.add(time_slot)
+    await db_session.commit()
+    return time_slot
+
+
+async def book(session: AsyncSession, time_slot_id: int, guest_id: int, when: date = MONDAY) -> Booking:
+    return await insert_booking(
+        session,
+        time_slot_id=time_slot_id,
+        guest_id=guest_id,
+        when=when,
+        topic="상담",
+        description="상담 신청",
+    )
+
+
+async def test_부킹을_생성한다(db_session: AsyncSession, time_slot: TimeSlot, guest_user: User):
+    booking = await book(db_session, time_slot.id, guest_user.id)
+    await db_session.commit()
+
+    assert booking.id is not None
+    assert booking.when == MONDAY
+    assert booking.guest_id == guest_user.id
+    assert booking.created_at is not None
+
+
+async def test_같은_슬롯_같은_날은_한번만_예약할_수_있다(
+    db_session: AsyncSession, time_slot: TimeSlot, guest_user: User, host_user: User
+):
+    await book(db_session, time_slot.id, guest_user.id)
+    await db_session.commit()
+
+    with pytest.raises(SlotAlreadyBookedError):
+        await book(db_session, time_slot.id, host_user.id)
+
+    #다른 날은 예약할 수 있습니다.
+    await book(db_session, time_slot.id, host_user.id, when=date(2024, 12, 4))
+
+
+async def test_게스트는_다른_호스트의_겹치는_시간대를_예약할_수_없다(
+    db_session: AsyncSession, time_slot: TimeSlot, other_host_time_slot: TimeSlot, guest_user: User
+):
+    await book(db_session, time_slot.id, guest_user.id)
+    await db_session.commit()
+
+    with pytest.raises(GuestBookingOverlapError):
+        await book(db_session, other_host_time_slot.id, guest_user.id)
+
+    await book(db_session, other_host_time_slot.id, guest_user.id, when=date(2024, 12, 9))
+
+
+async def test_게스트의_부킹_겹침_색인은_부킹을_커밋하면_비운다(
+    db_session: AsyncSession, time_slot: TimeSlot, other_host_time_slot: TimeSlot, guest_user: User
+):
+    await book(db_session, time_slot.id, guest_user.id)
+    await db_session.commit()
+
+    index = await load_guest_booking_index(db_session, guest_user.id, since=MONDAY)
+    assert index.find_overlap(*slot_range(MONDAY, time(10, 30), time(11, 30))) == time_slot.id
+    #같은 타임슬롯은 SlotAlreadyBookedError 로 구분하도록 제외합니다.
+    assert index.find_overlap(*slot_range(MONDAY, time(10, 0), time(11, 0)), exclude_slot_id=time_slot.id) is None
+    assert index.find_overlap(*slot_range(MONDAY, time(11, 0), time(12, 0))) is None
+
+    guest_booking_indexes.set(guest_user.id, index)
+    await book(db_session, other_host_time_slot.id, guest_user.id, when=date(2024, 12, 9))
+    assert guest_user.id in guest_booking_indexes
+    await db_session.commit()
+    assert guest_user.id not in guest_booking_indexes
+
+
+async def test_시간대가_다른_호스트의_부킹은_UTC_시점으로_겹침을_비교한다(
+    db_session: AsyncSession,
+    host_calendar: Calendar,
+    time_slot: TimeSlot,
+    other_host_time_slot: TimeSlot,
+    guest_user: User,
+):
+    #서울 10:00-11:00 은 UTC 01:00-02:00 이므로 UTC 10:30-11:30 슬롯과 겹치지 않습니다.
+    host_calendar.timezone = "Asia/Seoul"
+    await db_session.commit()
+
+    await book(db_session, time_slot.id, guest_user.id)
+    await book(db_session, other_host_time_slot.id, guest_user.id)
+    await db_session.commit()
+
+    index = await load_guest_booking_index(db_session, guest_user.id, since=MONDAY)
+    assert index.find_overlap(*slot_range(MONDAY, time(1, 30), time(2, 30))) == time_slot.id
+    assert index.find_overlap(*slot_range(MONDAY, time(10, 0), time(11, 0), "Asia/Seoul")) == time_slot.id
+    assert index.find_overlap(*slot_range(MONDAY, time(19, 0), time(20, 0), "Asia/Seoul")) == other_host_time_slot.id
+
+
+async def test_열리지_않은_요일이나_없는_슬롯은_예약할_수_없다(
+    db_session: AsyncSession, time_slot: TimeSlot, guest_user: User
+):
+    with pytest.raises(SlotNotAvailableError):
+        await book(db_session, time_slot.id, guest_user.id, when=date(2024, 12, 3))
+
+    with pytest.raises(TimeSlotNotFoundError):
+        await book(db_session, time_slot.id + 100, guest_user.id)
+
+
+async def test_부킹을_커밋하면_예약_가능_현황_캐시를_비운다(
+    db_session: AsyncSession, time_slot: TimeSlot, guest_user: User
+):
+    availability.availability_cache.clear()
+    cached = await availability.get_month_availability(db_session, time_slot.calendar_id, 2024, 12)
+    assert cached.is_available(MONDAY.day)
+
+    await book(db_session, time_slot.id, guest_user.id)
+    assert await availability.get_month_availability(db_session, time_slot.calendar_id, 2024, 12) is cached
+
+    await db_session.commit()
+    refreshed = await availability.get_month_availability(db_session, time_slot.calendar_id, 2024, 12)
+    assert refreshed.slot_status(MONDAY.day) == {time_slot.id: False}
+
+
+async def test_동시에_500건을_요청해도_하나만_성공한다(tmp_path):
+    engine = create_engine(f"sqlite+aiosqlite:///{tmp_path / 'concurrency.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    session_factory = create_session(engine)
+
+    async with session_factory() as session:
+        users = [
+            User(username=f"user{index:04d}", email=f"user{index}@example.com", display_name=f"user{index:04d}",
+                 hashed_password="not-a-real-hash")
+            for index in range(500)
+        ]
+        session.add_all(users)
+        await session.flush()
+        calendar = Calendar(host_id=users[0].id, topics=[], description="", google_calendar_id="")
+        session.add(calendar)
+        await session.flush()
+        time_slot = TimeSlot(start_time=time(10, 0), end_time=time(11, 0), weekdays=[0], calendar_id=calendar.id)
+        session.add(time_slot)
+        await session.commit()
+        guest_ids = [user.id for user in users]
+        time_slot_id = time_slot.id
+
+    async def attempt(guest_id: int) -> bool:
+        async with session_factory() as session:
+            try:
+                await book(session, time_slot_id, guest_id)
+                await session.commit()
+            except SlotAlreadyBookedError:
+                return False
+            return True
+
+    results = await asyncio.gather(*(attempt(guest_id) for guest_id in guest_ids))
+
+    assert results.count(True) == 1
+    async with session_factory() as session:
+        assert await session.scalar(select(func.count()).select_from(Booking)) == 1
+
+    await engine.dispose()
@@ -0,0 +1,121 @@
+from datetime import date, time
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy import delete, select
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from appserver.apps.account.models import User
+from appserver.apps.calendar.models import Booking, Calendar, TimeSlot
+
+
+@pytest.fixture()
+async def time_slots(db_session: AsyncSession, host_calendar: Calendar) -> list[TimeSlot]:
+    slots = [
+        TimeSlot(start_time=time(hour, 0), end_time=time(hour + 1, 0), weekdays=[0, 2, 4], calendar_id=host_calendar.id)
+        for hour in (9, 13, 15)
+    ]
+    db_session.add_all(slots)
+    await db_session.commit()
+    return slots
+
+
+async def test_캘린더_상세는_호스트와_타임슬롯을_함께_응답한다(
+    client: TestClient, host_user: User, host_calendar: Calendar, time_slots: list[TimeSlot]
+):
+    #query_budget(2) 를 넘으면 strict 모드에서 예외가 나므로, 로더 옵션이 빠지면 이 테스트가 실패합니다.
+    response = client.get(f"/api/calendars/{host_user.username}")
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["id"] == host_calendar.id
+    assert data["host"] == {"username": host_user.username, "display_name": host_user.display_name}
+    assert sorted(slot["id"] for slot in data["time_slots"]) == sorted(slot.id for slot in time_slots)
+
+
+async def test_캘린더가_없는_사용자는_404_로_응답한다(client: TestClient, guest_user: User):
+    response = client.get(f"/api/calendars/{guest_user.username}")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+async def test_불러오지_않은_관계에_접근하면_예외를_일으킨다(db_session: AsyncSession, host_calendar: Calendar):
+    db_session.expunge_all()
+    calendar = (await db_session.execute(select(Calendar).where(Calendar.id == host_calendar.id))).scalar_one()
+
+    with pytest.raises(InvalidRequestError, match="raise_on_sql"):
+        calendar.time_slots
+
+
+def bits(*days: int) -> int:
+    return sum(1 << (day - 1) for day in days)
+
+
+async def test_월별_예약_가능한_날을_비트셋으로_응답하고_바뀌지_않았으면_304_로_응답한다(
+    client: TestClient,
+    db_session: AsyncSession,
+    host_user: User,
+    guest_user: User,
+    time_slots: list[TimeSlot],
+    monkeypatch: pytest.MonkeyPatch,
+):
+    #2024년 12월 2일(월)은 세 슬롯이 모두 예약되어 있습니다.
+    db_session.add_all([
+        Booking(when=date(2024, 12, 2), topic="상담", description="", time_slot_id=slot.id, calendar_id=slot.calendar_id, guest_id=guest_user.id)
+        for slot in time_slots
+    ])
+    await db_session.commit()
+    url = f"/api/calendars/{host_user.username}/availability"
+
+    response = client.get(url, params={"year": 2024, "month": 12})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {
+        "year": 2024,
+        "month": 12,
+        "timezone": "UTC",
+        "days_in_month": 31,
+        "days": bits(4, 6, 9, 11, 13, 16, 18, 20, 23, 25, 27, 30),
+    }
+    etag = response.headers["ETag"]
+    assert response.headers["Cache-Control"].startswith("public, max-age=")
+
+    #바뀌지 않았으면 현황을 다시 계산하지 않습니다.
+    def fail(*args, **kwargs):
+        raise AssertionError("304 응답에서 현황을 계산했습니다.")
+
+    with monkeypatch.context() as patch:
+        patch.setattr("appserver.apps.calendar.endpoints.get_day_bitset", fail)
+        response = client.get(url, params={"year": 2024, "month": 12}, headers={"If-None-Match": f'"other", {etag}'})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.headers["ETag"] == etag
+    assert response.content == b""
+
+    #부킹이 지워지면 ETag 가 바뀝니다.
+    await db_session.execute(delete(Booking).where(Booking.time_slot_id == time_slots[0].id))
+    await db_session.commit()
+    response = client.get(url, params={"year": 2024, "month": 12}, headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["ETag"] != etag
+    assert response.json()["days"] & bits(2)
+
+
+async def test_시간대를_지정하면_그_시간대의_날짜로_나눈다(
+    client: TestClient, db_session: AsyncSession, host_user: User, host_calendar: Calendar
+):
+    #서울 월요일 08:00 은 UTC 로 일요일 23:00 입니다.
+    host_calendar.timezone = "Asia/Seoul"
+    db_session.add(TimeSlot(start_time=time(8, 0), end_time=time(9, 0), weekdays=[0], calendar_id=host_calendar.id))
+    await db_session.commit()
+    url = f"/api/calendars/{host_user.username}/availability"
+
+    seoul = client.get(url, params={"year": 2025, "month": 3})
+    utc = client.get(url, params={"year": 2025, "month": 3, "tz": "UTC"})
+
+    assert seoul.json()["days"] == bits(3, 10, 17, 24, 31)
+    assert utc.json() == {"year": 2025, "month": 3, "timezone": "UTC", "days_in_month": 31, "days": bits(2, 9, 16, 23, 30)}
+    assert seoul.headers["ETag"] != utc.headers["ETag"]
+
+    response = client.get(url, params={"year": 2025, "month": 3, "tz": "Mars/Olympus_Mons"})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
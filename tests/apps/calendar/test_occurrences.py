@@ -0,0 +1,98 @@
+from datetime import date, time, timedelta
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from appserver.apps.account.models import User
+from appserver.apps.calendar import occurrences
+from appserver.apps.calendar.models import Calendar, SlotOccurrence, TimeSlot
+from appserver.apps.calendar.occurrences import find_open_time_slots, occurrence_days, refresh_occurrences
+
+#2024년 12월 2일은 월요일(0) 입니다.
+TODAY = date(2024, 12, 2)
+
+
+@pytest.fixture(autouse=True)
+def fixed_today(monkeypatch):
+    monkeypatch.setattr(occurrences, "today", lambda: TODAY)
+
+
+async def occurrence_days_of(session: AsyncSession, time_slot_id: int) -> list[date]:
+    stmt = select(SlotOccurrence.day).where(SlotOccurrence.time_slot_id == time_slot_id).order_by(SlotOccurrence.day)
+    return list((await session.scalars(stmt)).all())
+
+
+def test_기간_안에서_요일에_해당하는_날짜를_펼친다():
+    days = occurrence_days([2, 0], TODAY, TODAY + timedelta(weeks=2))
+    assert days == [date(2024, 12, 2), date(2024, 12, 4), date(2024, 12, 9), date(2024, 12, 11)]
+
+
+async def test_타임슬롯을_추가_수정_삭제하면_날짜_행도_함께_바뀐다(db_session: AsyncSession, host_calendar: Calendar):
+    time_slot = TimeSlot(start_time=time(10, 0), end_time=time(11, 0), weekdays=[0], calendar_id=host_calendar.id)
+    db_session.add(time_slot)
+    await db_session.commit()
+
+    days = await occurrence_days_of(db_session, time_slot.id)
+    assert len(days) == occurrences.settings.slot_occurrence_weeks
+    assert all(day.weekday() == 0 for day in days)
+
+    time_slot.weekdays = [1, 3]
+    await db_session.commit()
+    days = await occurrence_days_of(db_session, time_slot.id)
+    assert {day.weekday() for day in days} == {1, 3}
+
+    time_slot_id = time_slot.id
+    await db_session.delete(time_slot)
+    await db_session.commit()
+    assert await occurrence_days_of(db_session, time_slot_id) == []
+
+
+async def test_갱신하면_기간을_옮기고_어긋난_행을_바로잡는다(db_session: AsyncSession, host_calendar: Calendar, monkeypatch):
+    time_slot = TimeSlot(start_time=time(10, 0), end_time=time(11, 0), weekdays=[0], calendar_id=host_calendar.id)
+    db_session.add(time_slot)
+    await db_session.commit()
+    time_slot_id = time_slot.id
+
+    #ORM 이벤트를 거치지 않는 대량 UPDATE 는 날짜 행을 바꾸지 않습니다.
+    await db_session.execute(update(TimeSlot).where(TimeSlot.id == time_slot_id).values(weekdays=[4]))
+    await db_session.commit()
+
+    next_week = TODAY + timedelta(weeks=1)
+    monkeypatch.setattr(occurrences, "today", lambda: next_week)
+    total = await refresh_occurrences(db_session)
+
+    days = await occurrence_days_of(db_session, time_slot_id)
+    assert total == len(days) == occurrences.settings.slot_occurrence_weeks
+    assert days[0] == date(2024, 12, 13)
+    assert all(day.weekday() == 4 for day in days)
+
+
+async def test_펼쳐_둔_기간_밖의_날짜도_요일로_슬롯을_찾는다(db_session: AsyncSession, host_calendar: Calendar):
+    morning = TimeSlot(start_time=time(10, 0), end_time=time(11, 0), weekdays=[0, 2], calendar_id=host_calendar.id)
+    evening = TimeSlot(start_time=time(18, 0), end_time=time(19, 0), weekdays=[2], calendar_id=host_calendar.id)
+    db_session.add_all([evening, morning])
+    await db_session.commit()
+
+    far_wednesday = TODAY + timedelta(weeks=occurrences.settings.slot_occurrence_weeks + 4, days=2)
+    for day in (date(2024, 12, 4), far_wednesday):
+        assert [slot.id for slot in await find_open_time_slots(db_session, host_calendar.id, day)] == [morning.id, evening.id]
+
+    assert await find_open_time_slots(db_session, host_calendar.id, date(2024, 12, 3)) == []
+
+
+async def test_날짜별_열린_타임슬롯을_조회한다(
+    client: TestClient, db_session: AsyncSession, host_user: User, host_calendar: Calendar
+):
+    time_slot = TimeSlot(start_time=time(10, 0), end_time=time(11, 0), weekdays=[0], calendar_id=host_calendar.id)
+    db_session.add(time_slot)
+    await db_session.commit()
+
+    response = client.get(f"/api/calendars/{host_user.username}/time-slots", params={"day": "2024-12-09"})
+    assert response.status_code == status.HTTP_200_OK
+    assert [slot["id"] for slot in response.json()] == [time_slot.id]
+
+    response = client.get(f"/api/calendars/{host_user.username}/time-slots", params={"day": "2024-12-10"})
+    assert response.json() == []
@@ -0,0 +1,168 @@
+import asyncio
+import dataclasses
+import json
+from datetime import datetime, time, timezone
+
+import httpx
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from appserver.apps.account.models import User
+from appserver.apps.calendar.exceptions import CalendarProviderError
+from appserver.apps.calendar.models import Calendar, TimeSlot
+from appserver.apps.calendar.providers import (
+    BusyInterval,
+    BusyTimeClient,
+    FakeCalendarProvider,
+    GoogleCalendarProvider,
+    get_busy_time_client,
+    verify_provider_settings,
+)
+from appserver.config import settings
+
+
+def utc(*args) -> datetime:
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+class FailingProvider(FakeCalendarProvider):
+    async def fetch_busy(self, calendar_ids, time_min, time_max):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        raise CalendarProviderError
+
+
+async def test_여러_캘린더를_한_번에_가져오고_캐시한다():
+    provider = FakeCalendarProvider({
+        "a": [BusyInterval(utc(2024, 12, 2, 10), utc(2024, 12, 2, 11)), BusyInterval(utc(2025, 1, 6, 10), utc(2025, 1, 6, 11))],
+        "b": [BusyInterval(utc(2024, 12, 3, 9), utc(2024, 12, 3, 12))],
+    })
+    client = BusyTimeClient(provider, maxsize=100, ttl=60)
+
+    result = await client.get_month_busy(["a", "b", "c"], 2024, 12)
+    assert result == {
+        "a": (BusyInterval(utc(2024, 12, 2, 10), utc(2024, 12, 2, 11)),),
+        "b": (BusyInterval(utc(2024, 12, 3, 9), utc(2024, 12, 3, 12)),),
+        "c": (),
+    }
+    assert provider.calls == 1
+
+    #캐시에 없는 캘린더만 묶어서 요청합니다.
+    await client.get_month_busy(["a", "b", "c", "d"], 2024, 12)
+    assert provider.calls == 2
+    assert provider.requested_calendars == 4
+
+
+async def test_동시에_같은_달을_요청하면_한_번만_가져온다():
+    provider = FakeCalendarProvider({"a": [BusyInterval(utc(2024, 12, 2, 10), utc(2024, 12, 2, 11))]}, latency=0.05)
+    client = BusyTimeClient(provider, maxsize=100, ttl=60)
+
+    results = await asyncio.gather(*(client.get_month_busy(["a"], 2024, 12) for _ in range(50)))
+
+    assert provider.calls == 1
+    assert all(result == results[0] for result in results)
+
+
+async def test_가져오지_못하면_기다리던_요청_모두_실패하고_캐시하지_않는다():
+    provider = FailingProvider()
+    client = BusyTimeClient(provider, maxsize=100, ttl=60)
+
+    results = await asyncio.gather(*(client.get_month_busy(["a"], 2024, 12) for _ in range(5)), return_exceptions=True)
+    assert all(isinstance(result, CalendarProviderError) for result in results)
+    assert provider.calls == 1
+
+    with pytest.raises(CalendarProviderError):
+        await client.get_month_busy(["a"], 2024, 12)
+    assert provider.calls == 2
+
+
+async def test_여러_달에_걸친_기간은_달마다_가져와_겹치는_일정만_돌려준다():
+    inside = BusyInterval(utc(2025, 1, 1, 0), utc(2025, 1, 1, 1))
+    provider = FakeCalendarProvider({"a": [BusyInterval(utc(2024, 12, 1, 0), utc(2024, 12, 1, 1)), inside]})
+    client = BusyTimeClient(provider, maxsize=100, ttl=60)
+
+    assert await client.get_busy("a", utc(2024, 12, 31, 12), utc(2025, 1, 1, 12)) == [inside]
+    assert provider.calls == 2
+
+
+async def test_구글_freeBusy_응답을_바쁜_시간으로_바꾼다():
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        requests.append((request.headers["authorization"], body))
+        calendars = {item["id"]: {"busy": [{"start": "2024-12-02T10:00:00Z", "end": "2024-12-02T11:00:00Z"}]} for item in body["items"]}
+        return httpx.Response(200, json={"calendars": calendars})
+
+    provider = GoogleCalendarProvider("token", timeout=1, transport=httpx.MockTransport(handler))
+    calendar_ids = [f"calendar-{index}" for index in range(60)]
+    result = await provider.fetch_busy(calendar_ids, utc(2024, 12, 1), utc(2025, 1, 1))
+    await provider.aclose()
+
+    #요청 하나에 50개까지만 넣을 수 있어서 두 번으로 나눕니다.
+    assert [len(body["items"]) for _, body in requests] == [50, 10]
+    assert requests[0][0] == "Bearer token"
+    assert requests[0][1]["timeMin"] == "2024-12-01T00:00:00+00:00"
+    assert result["calendar-59"] == [BusyInterval(utc(2024, 12, 2, 10), utc(2024, 12, 2, 11))]
+
+
+async def test_구글_API_오류는_CalendarProviderError_로_바꾼다():
+    provider = GoogleCalendarProvider("token", timeout=1, transport=httpx.MockTransport(lambda request: httpx.Response(429)))
+    with pytest.raises(CalendarProviderError):
+        await provider.fetch_busy(["a"], utc(2024, 12, 1), utc(2025, 1, 1))
+    await provider.aclose()
+
+
+def test_google_제공자에_토큰이_없으면_서버를_띄우지_않는다():
+    with pytest.raises(ValueError, match="CALENDAR_PROVIDER=fake"):
+        verify_provider_settings(dataclasses.replace(settings, calendar_provider="google", google_calendar_access_token=""))
+    with pytest.raises(ValueError):
+        verify_provider_settings(dataclasses.replace(settings, calendar_provider="outlook"))
+
+    verify_provider_settings(dataclasses.replace(settings, calendar_provider="google", google_calendar_access_token="token"))
+
+
+def test_fake_제공자는_명시해야_하고_경고를_남긴다(caplog):
+    verify_provider_settings(dataclasses.replace(settings, calendar_provider="fake"))
+    assert "NOT checked" in caplog.text
+
+
+@pytest.fixture()
+def busy_host(client: TestClient, host_calendar: Calendar) -> FakeCalendarProvider:
+    #2024년 12월 2일(월) 10시~11시에 호스트 구글 캘린더에 일정이 있습니다.
+    provider = FakeCalendarProvider({host_calendar.google_calendar_id: [BusyInterval(utc(2024, 12, 2, 10), utc(2024, 12, 2, 11))]})
+    busy_time_client = BusyTimeClient(provider, maxsize=10, ttl=60)
+    client.app.dependency_overrides[get_busy_time_client] = lambda: busy_time_client
+    return provider
+
+
+@pytest.fixture()
+async def monday_slots(db_session: AsyncSession, host_calendar: Calendar) -> list[TimeSlot]:
+    slots = [
+        TimeSlot(start_time=time(hour, 0), end_time=time(hour + 1, 0), weekdays=[0], calendar_id=host_calendar.id)
+        for hour in (9, 10)
+    ]
+    db_session.add_all(slots)
+    await db_session.commit()
+    return slots
+
+
+async def test_구글_캘린더에_일정이_있는_타임슬롯은_보여주지_않는다(
+    client: TestClient, busy_host: FakeCalendarProvider, host_user: User, monday_slots: list[TimeSlot]
+):
+    url = f"/api/calendars/{host_user.username}/time-slots"
+
+    assert [slot["id"] for slot in client.get(url, params={"day": "2024-12-02"}).json()] == [monday_slots[0].id]
+    assert len(client.get(url, params={"day": "2024-12-09"}).json()) == 2
+    assert busy_host.calls == 1
+
+
+async def test_구글_캘린더에_일정이_있는_시간은_예약할_수_없다(
+    client: TestClient, busy_host: FakeCalendarProvider, guest_user: User, monday_slots: list[TimeSlot], auth_headers
+):
+    payload = {"time_slot_id": monday_slots[1].id, "when": "2024-12-02", "topic": "상담", "description": ""}
+    response = client.post("/api/bookings", json=payload, headers=auth_headers(guest_user))
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert response.json()["detail"] == "호스트의 캘린더에 이미 일정이 있는 시간입니다."
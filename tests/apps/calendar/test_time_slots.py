@@ -0,0 +1,162 @@
+from datetime import date, time
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from appserver.apps.account.models import User
+from appserver.apps.calendar.models import Booking, Calendar, SlotOccurrence, TimeSlot
+from appserver.apps.calendar.schemas import TimeSlotIn
+from appserver.apps.calendar.time_slots import SlotSpec, diff_time_slots, find_overlap
+
+
+def spec(start: int, end: int, weekdays: tuple[int, ...] = (0,)) -> SlotSpec:
+    return SlotSpec(time(start), time(end), weekdays)
+
+
+def slot_in(start: int, end: int, weekdays: list[int] = [0], id: int | None = None) -> TimeSlotIn:
+    return TimeSlotIn(id=id, start_time=time(start), end_time=time(end), weekdays=weekdays)
+
+
+def test_같은_요일에_시간이_겹치는_타임슬롯을_찾는다():
+    #9-12 가 10-11 보다 먼저 끝나지 않으므로 11-13 과도 겹칩니다.
+    assert find_overlap([spec(11, 13), spec(9, 12), spec(10, 11)]) == (spec(9, 12), spec(10, 11))
+    assert find_overlap([spec(9, 10), spec(10, 11), spec(9, 17, (1,))]) is None
+    assert find_overlap([spec(9, 17, (1, 2)), spec(12, 13, (2,))]) == (spec(9, 17, (1, 2)), spec(12, 13, (2,)))
+
+
+def test_바뀐_타임슬롯만_추가_수정_삭제한다():
+    existing = {1: spec(9, 10), 2: spec(10, 11), 3: spec(13, 14)}
+
+    changes = diff_time_slots(existing, [
+        slot_in(9, 10),
+        slot_in(10, 11, [0, 1]),
+        slot_in(15, 16, id=3),
+        slot_in(17, 18),
+    ])
+
+    #id 없이 보낸 타임슬롯은 시각이 같은 기존 타임슬롯에 맞춥니다.
+    assert changes.updates == {2: spec(10, 11, (0, 1)), 3: spec(15, 16)}
+    assert changes.inserts == [spec(17, 18)]
+    assert changes.deletes == []
+    assert diff_time_slots(existing, [slot_in(9, 10, id=1)]).deletes == [2, 3]
+
+
+@pytest.fixture()
+async def time_slots(db_session: AsyncSession, host_calendar: Calendar) -> list[TimeSlot]:
+    slots = [
+        TimeSlot(start_time=time(hour), end_time=time(hour + 1), weekdays=[0, 2], calendar_id=host_calendar.id)
+        for hour in (9, 13)
+    ]
+    db_session.add_all(slots)
+    await db_session.commit()
+    return slots
+
+
+async def test_타임슬롯_전체를_한_번에_바꾼다(
+    client: TestClient, db_session: AsyncSession, host_user: User, time_slots: list[TimeSlot], auth_headers
+):
+    morning = time_slots[0]
+    response = client.put(f"/api/calendars/{host_user.username}/time-slots", headers=auth_headers(host_user), json={
+        "time_slots": [
+            {"id": morning.id, "start_time": "09:00", "end_time": "10:00", "weekdays": [1]},
+            {"start_time": "18:00", "end_time": "19:00", "weekdays": [4]},
+        ],
+    })
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert [(slot["start_time"], slot["weekdays"]) for slot in data] == [("09:00:00", [1]), ("18:00:00", [4])]
+    assert data[0]["id"] == morning.id
+
+    db_session.expunge_all()
+    rows = (await db_session.scalars(select(TimeSlot).order_by(TimeSlot.start_time))).all()
+    assert [(row.id, row.start_time) for row in rows] == [(data[0]["id"], time(9)), (data[1]["id"], time(18))]
+
+    #대량으로 쓴 타임슬롯도 날짜 행을 함께 갱신합니다.
+    occurrence_rows = (await db_session.execute(select(SlotOccurrence.time_slot_id, SlotOccurrence.day))).all()
+    weekdays = {(slot_id, day.weekday()) for slot_id, day in occurrence_rows}
+    assert weekdays == {(morning.id, 1), (data[1]["id"], 4)}
+
+
+async def test_일부_타임슬롯만_추가_수정_삭제한다(
+    client: TestClient, db_session: AsyncSession, host_user: User, time_slots: list[TimeSlot], auth_headers
+):
+    morning, afternoon = time_slots
+    response = client.patch(f"/api/calendars/{host_user.username}/time-slots", headers=auth_headers(host_user), json={
+        "upsert": [{"start_time": "11:00", "end_time": "12:00", "weekdays": [0]}],
+        "delete": [afternoon.id],
+    })
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [slot["start_time"] for slot in response.json()] == ["09:00:00", "11:00:00"]
+    assert response.json()[0] == {"id": morning.id, "start_time": "09:00:00", "end_time": "10:00:00", "weekdays": [0, 2]}
+
+
+async def test_겹치는_타임슬롯이_있으면_아무것도_바꾸지_않는다(
+    client: TestClient, db_session: AsyncSession, host_user: User, time_slots: list[TimeSlot], auth_headers
+):
+    response = client.patch(f"/api/calendars/{host_user.username}/time-slots", headers=auth_headers(host_user), json={
+        "upsert": [{"start_time": "09:30", "end_time": "10:30", "weekdays": [2]}],
+    })
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+    assert "09:00-10:00" in response.json()["detail"]
+    assert len((await db_session.scalars(select(TimeSlot))).all()) == 2
+
+
+async def test_부킹이_있는_타임슬롯은_삭제할_수_없다(
+    client: TestClient,
+    db_session: AsyncSession,
+    host_user: User,
+    guest_user: User,
+    time_slots: list[TimeSlot],
+    auth_headers,
+):
+    db_session.add(Booking(when=date(2024, 12, 2), topic="상담", description="", time_slot_id=time_slots[0].id, calendar_id=time_slots[0].calendar_id, guest_id=guest_user.id))
+    await db_session.commit()
+
+    response = client.put(f"/api/calendars/{host_user.username}/time-slots", headers=auth_headers(host_user), json={
+        "time_slots": [],
+    })
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+    assert len((await db_session.scalars(select(TimeSlot))).all()) == 2
+
+
+@pytest.mark.parametrize("change", [
+    {"start_time": "09:30", "end_time": "10:30", "weekdays": [0, 2]},
+    {"start_time": "09:00", "end_time": "10:00", "weekdays": [2]},
+])
+async def test_부킹이_있는_타임슬롯은_시각이나_요일을_바꿀_수_없다(
+    client: TestClient,
+    db_session: AsyncSession,
+    host_user: User,
+    guest_user: User,
+    time_slots: list[TimeSlot],
+    auth_headers,
+    change: dict,
+):
+    morning = time_slots[0]
+    db_session.add(Booking(when=date(2024, 12, 2), topic="상담", description="", time_slot_id=morning.id, calendar_id=morning.calendar_id, guest_id=guest_user.id))
+    await db_session.commit()
+
+    response = client.patch(f"/api/calendars/{host_user.username}/time-slots", headers=auth_headers(host_user), json={
+        "upsert": [{"id": morning.id, **change}],
+    })
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+    db_session.expunge_all()
+    row = await db_session.get(TimeSlot, morning.id)
+    assert (row.start_time, row.end_time, row.weekdays) == (time(9), time(10), [0, 2])
+
+
+async def test_다른_사람의_타임슬롯은_바꿀_수_없다(
+    client: TestClient, host_user: User, guest_user: User, host_calendar: Calendar, auth_headers
+):
+    response = client.put(f"/api/calendars/{host_user.username}/time-slots", headers=auth_headers(guest_user), json={
+        "time_slots": [],
+    })
+    assert response.status_code == status.HTTP_403_FORBIDDEN
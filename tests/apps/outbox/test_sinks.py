@@ -0,0 +1,77 @@
+import dataclasses
+import json
+import re
+
+import httpx
+
+from appserver.apps.outbox.sinks import (
+    CALENDAR_EVENT_TOPIC,
+    EMAIL_TOPIC,
+    GoogleCalendarEventSink,
+    SmtpEmailSink,
+    configured_sinks,
+    google_event_id,
+)
+from appserver.config import settings
+
+PAYLOAD = {
+    "booking_id": 1,
+    "when": "2024-12-02",
+    "topic": "상담",
+    "description": "상담 신청",
+    "google_calendar_id": "host@example.com",
+    "start": "2024-12-02T01:00:00+00:00",
+    "end": "2024-12-02T02:00:00+00:00",
+    "timezone": "Asia/Seoul",
+    "guest_email": "guest@example.com",
+}
+
+
+def test_구글_일정_id_는_키마다_항상_같고_허용된_문자만_쓴다():
+    event_id = google_event_id("booking-1-calendar-event")
+
+    assert event_id == google_event_id("booking-1-calendar-event")
+    assert event_id != google_event_id("booking-2-calendar-event")
+    assert re.fullmatch(r"[a-v0-9]{5,1024}", event_id)
+
+
+async def test_호스트_구글_캘린더에_일정을_만들고_이미_있으면_성공으로_본다():
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200 if len(requests) == 1 else 409)
+
+    sink = GoogleCalendarEventSink("token", timeout=1, transport=httpx.MockTransport(handler))
+    await sink.send("booking-1-calendar-event", PAYLOAD)
+    #점유 시간이 지나 다시 보내도 같은 일정 id 라서 409 로 거절되고, 실패로 보지 않습니다.
+    await sink.send("booking-1-calendar-event", PAYLOAD)
+    await sink.aclose()
+
+    assert requests[0].url.path == "/calendar/v3/calendars/host@example.com/events"
+    assert requests[0].headers["Authorization"] == "Bearer token"
+    body = json.loads(requests[0].content)
+    assert body["id"] == google_event_id("booking-1-calendar-event")
+    assert body["start"] == {"dateTime": "2024-12-02T01:00:00+00:00"}
+    assert body["attendees"] == [{"email": "guest@example.com"}]
+    assert json.loads(requests[1].content)["id"] == body["id"]
+
+
+def test_예약_확정_메일은_캘린더_시간대의_시각으로_쓰고_키로_Message_ID_를_정한다():
+    sink = SmtpEmailSink("smtp.example.com", 587, "noreply@example.com")
+
+    message = sink.build_message("booking-1-created-email", PAYLOAD)
+
+    assert message["To"] == "guest@example.com"
+    assert message["Message-ID"] == "<booking-1-created-email@example.com>"
+    assert "2024-12-02 10:00 ~ 11:00 (Asia/Seoul)" in message.get_content()
+
+
+def test_자격_증명이_설정된_싱크만_만든다():
+    empty = dataclasses.replace(settings, google_calendar_access_token="", smtp_host="")
+    assert configured_sinks(empty) == {}
+
+    configured = dataclasses.replace(settings, google_calendar_access_token="token", smtp_host="smtp.example.com")
+    sinks = configured_sinks(configured)
+    assert isinstance(sinks[CALENDAR_EVENT_TOPIC], GoogleCalendarEventSink)
+    assert isinstance(sinks[EMAIL_TOPIC], SmtpEmailSink)
@@ -0,0 +1,160 @@
+from contextlib import asynccontextmanager
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from appserver.apps.outbox import worker as outbox_worker
+from appserver.apps.outbox.models import OutboxMessage, OutboxStatus, utcnow
+from appserver.apps.outbox.worker import OutboxWorker, backoff_delay, count_backlog, enqueue
+
+
+class InMemoryEmailSink:
+    #알림 이메일을 보내는 대신 메모리에 기록합니다.
+    def __init__(self):
+        self.sent: dict[str, dict] = {}
+
+    async def send(self, idempotency_key: str, payload: dict) -> None:
+        self.sent.setdefault(idempotency_key, payload)
+
+
+class FlakySink:
+    #처음 failures 번은 실패하고 그 뒤로는 성공합니다.
+    def __init__(self, failures: int):
+        self.failures = failures
+        self.calls = 0
+        self.sent = InMemoryEmailSink()
+
+    async def send(self, idempotency_key: str, payload: dict) -> None:
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise ConnectionError("메일 서버에 연결할 수 없습니다.")
+        await self.sent.send(idempotency_key, payload)
+
+
+@pytest.fixture()
+def make_worker(db_session: AsyncSession):
+    @asynccontextmanager
+    async def shared_session():
+        yield db_session
+
+    def factory(sinks, **kwargs) -> OutboxWorker:
+        return OutboxWorker(lambda: shared_session(), sinks, **kwargs)
+
+    return factory
+
+
+@pytest.fixture(autouse=True)
+def no_jitter(monkeypatch):
+    monkeypatch.setattr(outbox_worker.random, "uniform", lambda a, b: b)
+
+
+async def make_ready(session: AsyncSession):
+    #재시도 대기 시간을 건너뛰고 바로 처리할 수 있게 합니다.
+    for message in (await session.scalars(select(OutboxMessage))).all():
+        message.available_at = utcnow() - timedelta(seconds=1)
+    await session.commit()
+
+
+def test_실패할수록_대기_시간을_두_배씩_늘리되_최대값을_넘지_않는다():
+    assert [backoff_delay(attempts, 1.0, 10.0) for attempts in range(1, 6)] == [1.0, 2.0, 4.0, 8.0, 10.0]
+
+
+async def test_메시지를_묶음으로_가져와_싱크로_보낸다(db_session: AsyncSession, make_worker):
+    sink = InMemoryEmailSink()
+    for index in range(5):
+        enqueue(db_session, "email", f"key-{index}", {"index": index})
+    await db_session.commit()
+
+    worker = make_worker({"email": sink}, batch_size=3)
+    assert await worker.refresh_queue_depth() == 5
+
+    assert await worker.process_batch() == 3
+    assert await worker.process_batch() == 2
+    assert await worker.process_batch() == 0
+
+    assert sink.sent == {f"key-{index}": {"index": index} for index in range(5)}
+    assert await worker.refresh_queue_depth() == 0
+    assert worker.metrics.snapshot() == {"queue_depth": 0, "in_flight": 0, "delivered": 5, "retried": 0, "dead": 0}
+
+
+async def test_실패한_메시지는_대기_후_다시_보낸다(db_session: AsyncSession, make_worker):
+    sink = FlakySink(failures=2)
+    message = enqueue(db_session, "email", "key", {"booking_id": 1})
+    await db_session.commit()
+    worker = make_worker({"email": sink}, base_delay=30)
+
+    assert await worker.process_batch() == 1
+    assert message.status == OutboxStatus.PENDING
+    assert message.attempts == 1
+    assert "ConnectionError" in message.last_error
+    #대기 시간이 지나기 전에는 가져가지 않습니다.
+    assert message.available_at > utcnow() + timedelta(seconds=25)
+    assert await worker.process_batch() == 0
+
+    for _ in range(2):
+        await make_ready(db_session)
+        await worker.process_batch()
+
+    assert message.status == OutboxStatus.DONE
+    assert message.attempts == 3
+    assert message.processed_at is not None
+    assert sink.sent.sent == {"key": {"booking_id": 1}}
+    assert worker.metrics.retried == 2
+    assert worker.metrics.delivered == 1
+
+
+async def test_최대_시도_횟수를_넘으면_더_이상_보내지_않는다(db_session: AsyncSession, make_worker):
+    sink = FlakySink(failures=100)
+    message = enqueue(db_session, "email", "key", {})
+    await db_session.commit()
+    worker = make_worker({"email": sink}, max_attempts=2)
+
+    for _ in range(3):
+        await make_ready(db_session)
+        await worker.process_batch()
+
+    assert message.status == OutboxStatus.DEAD
+    assert sink.calls == 2
+    assert worker.metrics.dead == 1
+    assert await worker.refresh_queue_depth() == 0
+
+
+async def test_싱크가_없는_토픽은_가져가지_않고_PENDING_으로_남긴다(db_session: AsyncSession, make_worker):
+    enqueue(db_session, "email", "key", {})
+    unknown = enqueue(db_session, "unknown", "other-key", {})
+    await db_session.commit()
+    worker = make_worker({"email": InMemoryEmailSink()})
+
+    assert await worker.process_batch() == 1
+
+    assert (unknown.status, unknown.attempts) == (OutboxStatus.PENDING, 0)
+    assert await count_backlog(db_session) == {OutboxStatus.PENDING: 1, OutboxStatus.DEAD: 0}
+
+
+async def test_점유_시간이_지나_다시_처리해도_싱크에는_한_번만_반영된다(db_session: AsyncSession, make_worker):
+    sink = InMemoryEmailSink()
+    enqueue(db_session, "email", "key", {"version": 1})
+    await db_session.commit()
+    worker = make_worker({"email": sink})
+
+    #워커가 메시지를 가져간 뒤 결과를 기록하지 못하고 죽은 상황
+    claimed = await worker.claim(db_session)
+    await sink.send(claimed[0].idempotency_key, claimed[0].payload)
+    assert await worker.process_batch() == 0
+
+    await make_ready(db_session)
+    assert await worker.process_batch() == 1
+    assert sink.sent == {"key": {"version": 1}}
+
+
+async def test_stop_을_부르면_대기_중이던_워커가_바로_끝난다(db_session: AsyncSession, make_worker):
+    import asyncio
+
+    worker = make_worker({}, poll_interval=60)
+    task = asyncio.create_task(worker.run())
+    await asyncio.sleep(0.05)
+
+    worker.stop()
+    await asyncio.wait_for(task, timeout=1)
@@ -1,12 +1,38 @@
+import os
+
+#선언한 쿼리 예산을 넘는 요청은 테스트를 실패시킵니다. appserver 를 불러오기 전에 설정해야 합니다.
+os.environ.setdefault("DATABASE_QUERY_BUDGET_STRICT", "1")
+#호스트 캘린더 일정은 네트워크 없이 가짜 제공자에서 가져옵니다.
+os.environ.setdefault("CALENDAR_PROVIDER", "fake")
+
 import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 from sqlmodel import SQLModel
 from sqlalchemy.ext.asyncio import AsyncSession
-from appserver.db import use_session, create_engine, create_session
+from appserver.db import use_session, use_read_session, create_engine, create_session
 from appserver.app import include_routers
 from appserver.apps.account import models as account_models
+from appserver.apps.calendar import models as calendar_models
+from appserver.apps.outbox import models as outbox_models
 from appserver.apps.account.utils import hash_password
+from appserver.apps.account.cache import user_cache
+from appserver.apps.account.deps import token_cache
+from appserver.apps.account.ratelimit import login_rate_limiter
+from appserver.apps.calendar.availability import availability_cache
+from appserver.apps.calendar.overlaps import guest_booking_indexes
+from appserver.apps.calendar.providers import busy_time_client
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    #프로세스 단위 캐시가 다른 테스트의 데이터를 돌려주지 않도록 비웁니다.
+    caches = (
+        user_cache.local, token_cache, availability_cache, busy_time_client.cache, guest_booking_indexes, login_rate_limiter,
+    )
+    for cache in caches:
+        cache.clear()
+    yield
 
 
 @pytest.fixture(autouse=True)
@@ -38,6 +64,7 @@ def fastapi_app(db_session: AsyncSession):
 
 
     app.dependency_overrides[use_session] = override_use_session
+    app.dependency_overrides[use_read_session] = override_use_session
     return app
 
 @pytest.fixture()
@@ -59,4 +86,44 @@ async def host_user(db_session: AsyncSession):
     db_session.add(user)
     await db_session.commit()
     await db_session.flush()
-    return user
\ No newline at end of file
+    return user
+
+
+@pytest.fixture()
+async def guest_user(db_session: AsyncSession):
+    user = account_models.User(
+        username="guestuser",
+        hashed_password=hash_password("testtest"),
+        email="guest@example.com",
+        display_name="게스트",
+        is_host=False,
+    )
+    db_session.add(user)
+    await db_session.commit()
+    return user
+
+
+@pytest.fixture()
+async def host_calendar(db_session: AsyncSession, host_user: account_models.User):
+    calendar = calendar_models.Calendar(
+        host_id=host_user.id,
+        topics=["푸딩캠프 상담"],
+        description="푸딩캠프 상담 캘린더",
+        google_calendar_id="puddingcamp@group.calendar.google.com",
+    )
+    db_session.add(calendar)
+    await db_session.commit()
+    return calendar
+
+
+@pytest.fixture()
+def auth_headers():
+    from appserver.apps.account.utils import create_access_token
+
+    def make_headers(user: account_models.User) -> dict[str, str]:
+        token = create_access_token(
+            data={"sub": user.username, "display_name": user.display_name, "is_host": user.is_host},
+        )
+        return {"Authorization": f"Bearer {token}"}
+
+    return make_headers
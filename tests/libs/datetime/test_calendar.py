@@ -1,4 +1,12 @@
-from appserver.libs.datetime.calendar import get_start_weekday_of_month, get_last_day_of_month, get_range_days_of_month
+from datetime import date
+
+from appserver.libs.datetime.calendar import (
+  get_month_grid,
+  get_month_grids,
+  get_range_days_of_month,
+  get_last_day_of_month,
+  get_start_weekday_of_month,
+)
 import pytest
 
 def test_get_start_weekday_of_month():
@@ -46,3 +54,50 @@ def test_get_range_days_of_month(year, month, expcted_padding_count, expected_to
   assert sum(padding_count) == 0
   assert days[expcted_padding_count] == 1
   assert len(days) == expected_total_count
+
+
+def test_get_month_grid():
+  grid = get_month_grid(2024, 12)
+
+  #2024년 12월 1일은 일요일이므로 앞 빈칸 없이 시작하고, 마지막 주는 뒤를 0으로 채웁니다.
+  assert grid.weeks[0] == (49, (1, 2, 3, 4, 5, 6, 7))
+  assert grid.weeks[-1] == (1, (29, 30, 31, 0, 0, 0, 0))
+  assert len(grid.days) == len(grid.weeks) * 7
+  assert get_month_grid(2024, 12) is grid
+
+
+@pytest.mark.parametrize("year, month, first_weekday", [
+  (2021, 1, 0),
+  (2020, 12, 6),
+  (2024, 2, 2),
+  (2026, 10, 6),
+])
+def test_get_month_grid_iso_week(year, month, first_weekday):
+  grid = get_month_grid(year, month, first_weekday)
+
+  for week in grid.weeks:
+    days = [day for day in week.days if day]
+    #월요일부터 그리면 같은 주의 모든 날이 같은 ISO 주입니다.
+    if first_weekday == 0:
+      assert {date(year, month, day).isocalendar().week for day in days} == {week.iso_week}
+    #주의 목요일이 이 달이면 그 날의 ISO 주와 같습니다.
+    thursday = week.days[(3 - first_weekday) % 7]
+    if thursday:
+      assert date(year, month, thursday).isocalendar().week == week.iso_week
+
+
+def test_get_month_grids():
+  grids = get_month_grids(2024, 11, 3, 0)
+
+  assert [(grid.year, grid.month) for grid in grids] == [(2024, 11), (2024, 12), (2025, 1)]
+  assert grids[1] is get_month_grid(2024, 12, 0)
+
+  with pytest.raises(ValueError):
+    get_month_grid(2024, 12, 7)
+
+
+def test_get_range_days_of_month_returns_copy():
+  days = get_range_days_of_month(2024, 3)
+  days.append(99)
+
+  assert get_range_days_of_month(2024, 3)[-1] == 31
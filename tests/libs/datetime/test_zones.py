@@ -0,0 +1,45 @@
+from datetime import date, datetime, time, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from appserver.libs.datetime.zones import get_zone, is_valid_zone, local_month_range, local_to_utc, month_offsets
+
+
+@pytest.mark.parametrize("zone_name", ["UTC", "Asia/Seoul", "America/New_York", "Europe/London", "Australia/Lord_Howe"])
+def test_오프셋_표로_바꾼_시각은_zoneinfo_계산과_같다(zone_name: str):
+    zone = get_zone(zone_name)
+    for month in range(1, 13):
+        day = date(2025, month, 1)
+        while day.month == month:
+            for local_time in (time(0, 0), time(1, 30), time(2, 30), time(12, 0), time.max):
+                expected = datetime.combine(day, local_time, tzinfo=zone).astimezone(timezone.utc)
+                assert local_to_utc(day, local_time, zone_name) == expected
+            day += timedelta(days=1)
+
+
+def test_DST_가_바뀌는_날만_따로_계산한다():
+    offsets = month_offsets("America/New_York", 2025, 3)
+
+    assert offsets.transition_days == {9}
+    assert month_offsets("America/New_York", 2025, 3) is offsets
+    assert month_offsets("Asia/Seoul", 2025, 3).transition_days == frozenset()
+    #시계를 앞당겨 없는 02:30 은 바뀌기 전 오프셋(-5시간)으로 계산합니다.
+    assert local_to_utc(date(2025, 3, 9), time(2, 30), "America/New_York") == datetime(2025, 3, 9, 7, 30, tzinfo=timezone.utc)
+    #시계를 되돌려 두 번 있는 01:30 은 앞의 것으로 계산합니다.
+    assert local_to_utc(date(2025, 11, 2), time(1, 30), "America/New_York") == datetime(2025, 11, 2, 5, 30, tzinfo=timezone.utc)
+
+
+def test_시간대의_한_달을_UTC_범위로_바꾼다():
+    assert local_month_range(2024, 12, "Asia/Seoul") == (
+        datetime(2024, 11, 30, 15, tzinfo=timezone.utc),
+        datetime(2024, 12, 31, 15, tzinfo=timezone.utc),
+    )
+
+
+def test_시간대_이름을_확인한다():
+    assert get_zone("Asia/Seoul") is get_zone("Asia/Seoul")
+    assert get_zone("Asia/Seoul") == ZoneInfo("Asia/Seoul")
+    assert is_valid_zone("UTC")
+    assert not is_valid_zone("Mars/Olympus_Mons")
+    assert not is_valid_zone("../etc/passwd")
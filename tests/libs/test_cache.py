@@ -0,0 +1,51 @@
+import pytest
+
+from appserver.libs.cache import TTLCache
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_만료된_항목은_조회되지_않는다():
+    timer = FakeTimer()
+    cache = TTLCache(maxsize=10, ttl=5, timer=timer)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=20)
+
+    assert cache.get("a") == 1
+    timer.now = 6
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_maxsize_를_넘으면_가장_오래_사용하지_않은_항목을_버린다():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert "a" in cache
+    assert "b" not in cache
+    assert len(cache) == 2
+
+
+def test_조건에_맞는_키를_한번에_무효화한다():
+    cache = TTLCache(maxsize=10, ttl=60)
+    for month in (1, 2, 3):
+        cache.set((1, 2025, month), month)
+    cache.set((2, 2025, 1), 0)
+
+    assert cache.invalidate_where(lambda key: key[0] == 1) == 3
+    assert len(cache) == 1
+
+
+def test_maxsize_는_1_이상이어야_한다():
+    with pytest.raises(ValueError):
+        TTLCache(maxsize=0, ttl=1)
@@ -0,0 +1,36 @@
+import random
+
+from appserver.libs.intervals import IntervalIndex
+
+
+def test_겹치는_구간을_모두_찾는다():
+    rng = random.Random(7)
+    intervals = []
+    for value in range(300):
+        start = rng.randrange(0, 1000)
+        intervals.append((start, start + rng.randrange(1, 50), value))
+    index = IntervalIndex(intervals)
+
+    for _ in range(200):
+        start = rng.randrange(0, 1000)
+        end = start + rng.randrange(1, 50)
+        expected = {value for s, e, value in intervals if s < end and e > start}
+        assert set(index.overlapping(start, end)) == expected
+        assert index.overlaps(start, end) == bool(expected)
+        assert (index.first_overlap(start, end) in expected) if expected else index.first_overlap(start, end) is None
+
+
+def test_맞닿은_구간은_겹치지_않는다():
+    index = IntervalIndex([(9, 10, "a"), (10, 11, "b")])
+
+    assert index.find_overlapping_pair() is None
+    assert list(index.overlapping(10, 11)) == ["b"]
+    assert not IntervalIndex([]).overlaps(0, 1)
+
+
+def test_앞선_긴_구간과_겹치는_쌍을_찾는다():
+    #바로 앞 구간이 아니라 더 앞에서 시작한 긴 구간과 겹치는 경우입니다.
+    index = IntervalIndex([(0, 100, "long"), (10, 20, "a"), (50, 60, "b")])
+
+    assert index.find_overlapping_pair() == ("long", "a")
+    assert list(index.overlapping(55, 56)) == ["b", "long"]
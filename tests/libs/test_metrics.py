@@ -0,0 +1,76 @@
+import re
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from appserver import db
+from appserver.apps.account.hashing import PasswordHashingService
+from appserver.libs.metrics import REQUEST_DB_QUERIES, REQUEST_LATENCY, MetricsMiddleware, Registry
+
+
+def test_히스토그램은_누적_버킷과_합계_개수를_내보낸다():
+    registry = Registry()
+    latency = registry.histogram("latency_seconds", "응답 시간", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        latency.observe(value, route='/a"b')
+
+    assert registry.render().splitlines() == [
+        "# HELP latency_seconds 응답 시간",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{route="/a\\"b",le="0.1"} 2.0',
+        'latency_seconds_bucket{route="/a\\"b",le="1.0"} 3.0',
+        'latency_seconds_bucket{route="/a\\"b",le="+Inf"} 4.0',
+        'latency_seconds_sum{route="/a\\"b"} 3.65',
+        'latency_seconds_count{route="/a\\"b"} 4.0',
+    ]
+
+
+def test_게이지_함수는_내보낼_때마다_값을_읽는다():
+    registry = Registry()
+    values = {"pending": 3}
+    registry.gauge_function("queue", "대기열", lambda: values, "state")
+    assert 'queue{state="pending"} 3.0' in registry.render()
+    values["pending"] = 0
+    assert 'queue{state="pending"} 0.0' in registry.render()
+
+
+def test_요청별_DB_시간과_해시_시간을_Server_Timing_헤더로_내보낸다(db_session):
+    hashing = PasswordHashingService(max_workers=1, max_queue_size=1)
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/items/{item_id}")
+    async def item(item_id: int, session: db.DbSessionDep):
+        await session.execute(text("SELECT 1"))
+        await session.execute(text("SELECT 2"))
+        await hashing.verify_password("password", "$argon2id$v=19$m=8,t=1,p=1$c2FsdHNhbHQ$invalid")
+        return {"id": item_id}
+
+    app.dependency_overrides[db.use_session] = lambda: db_session
+    before = REQUEST_LATENCY.count(method="GET", route="/items/{item_id}", status="200")
+
+    with TestClient(app) as client:
+        response = client.get("/items/1")
+        client.get("/items/2")
+    hashing.shutdown()
+
+    timing = response.headers["server-timing"]
+    assert re.fullmatch(r'app;dur=[\d.]+, db;dur=[\d.]+;desc="2 queries", hash;dur=[\d.]+', timing)
+    #경로 값이 아니라 라우트 경로로 묶어서 기록합니다.
+    assert REQUEST_LATENCY.count(method="GET", route="/items/{item_id}", status="200") == before + 2
+    assert REQUEST_DB_QUERIES.count(route="/items/{item_id}") >= 2
+
+
+def test_metrics_엔드포인트는_Prometheus_형식으로_응답한다():
+    from appserver.app import app
+
+    #lifespan 없이 요청만 보냅니다.
+    client = TestClient(app)
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE http_request_duration_seconds histogram" in response.text
+    assert "# TYPE password_hash_duration_seconds histogram" in response.text
+    assert "db_pool_checked_out" in response.text
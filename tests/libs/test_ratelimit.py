@@ -0,0 +1,60 @@
+import pytest
+
+from appserver.libs.ratelimit import RateLimiter, TokenBucket
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_버킷의_토큰을_다_쓰면_채워질_때까지_거절한다():
+    timer = FakeTimer()
+    bucket = TokenBucket(rate=1, burst=3, maxsize=10, timer=timer)
+
+    assert [bucket.acquire("a") for _ in range(3)] == [0, 0, 0]
+    assert bucket.acquire("a") == pytest.approx(1.0)
+    assert bucket.acquire("b") == 0
+
+    timer.now = 1.5
+    assert bucket.acquire("a") == 0
+    assert bucket.acquire("a") == pytest.approx(0.5)
+
+
+def test_가득_찰_만큼_쉰_키와_maxsize_를_넘는_키는_지운다():
+    timer = FakeTimer()
+    bucket = TokenBucket(rate=1, burst=2, maxsize=2, timer=timer)
+    bucket.acquire("a")
+    timer.now = 1
+    bucket.acquire("b")
+    assert len(bucket) == 2
+
+    #a 는 마지막으로 쓴 뒤 burst / rate(2초)가 지났으므로 가득 찬 버킷입니다.
+    timer.now = 2
+    bucket.acquire("c")
+    assert len(bucket) == 2
+
+    bucket.acquire("d")
+    assert len(bucket) == 2
+    #b 는 지워졌으므로 새 버킷으로 시작합니다.
+    assert bucket.acquire("b") == 0
+
+
+async def test_공유_저장소를_지정하면_저장소로_센다():
+    class Store:
+        def __init__(self):
+            self.calls = []
+
+        async def acquire(self, key: str, rate: float, burst: int) -> float:
+            self.calls.append((key, rate, burst))
+            return 2.0
+
+    store = Store()
+    limiter = RateLimiter("login", rate=0.5, burst=5, maxsize=10, store=store)
+
+    assert await limiter.acquire("user") == 2.0
+    assert store.calls == [("login:user", 0.5, 5)]
+    assert len(limiter.local) == 0
@@ -0,0 +1,54 @@
+import json
+from datetime import date, datetime, time, timezone
+
+from sqlmodel import SQLModel
+
+from appserver.libs.responses import FastJSONResponse, dump_model, dump_models, etag_matches, model_response
+
+
+class ItemOut(SQLModel):
+    name: str
+    when: date
+    starts_at: time
+    created_at: datetime
+
+
+class Item:
+    def __init__(self, name: str):
+        self.name = name
+        self.when = date(2024, 12, 2)
+        self.starts_at = time(10, 30)
+        self.created_at = datetime(2024, 12, 1, 9, 0, tzinfo=timezone.utc)
+        self.secret = "not exposed"
+
+
+def test_스키마에_정의된_필드만_꺼낸다():
+    assert dump_model(ItemOut, Item("a")) == {
+        "name": "a",
+        "when": date(2024, 12, 2),
+        "starts_at": time(10, 30),
+        "created_at": datetime(2024, 12, 1, 9, 0, tzinfo=timezone.utc),
+    }
+    assert [item["name"] for item in dump_models(ItemOut, [Item("a"), Item("b")])] == ["a", "b"]
+
+
+def test_pydantic_과_같은_JSON_을_만든다():
+    response = model_response(ItemOut, [Item("푸딩")], status_code=201)
+    expected = [ItemOut.model_validate(Item("푸딩"), from_attributes=True).model_dump(mode="json")]
+
+    assert response.status_code == 201
+    assert response.media_type == "application/json"
+    assert json.loads(response.body) == expected
+
+
+def test_FastJSONResponse_는_dict_를_그대로_렌더링한다():
+    response = FastJSONResponse({"ok": True, 1: "one"})
+    assert json.loads(response.body) == {"ok": True, "1": "one"}
+
+
+def test_If_None_Match_의_여러_값과_약한_비교를_처리한다():
+    assert etag_matches('"a", "b"', '"b"')
+    assert etag_matches('W/"b"', '"b"')
+    assert etag_matches("*", '"b"')
+    assert not etag_matches('"a"', '"b"')
+    assert not etag_matches(None, '"b"')
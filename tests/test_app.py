@@ -0,0 +1,60 @@
+import logging
+import subprocess
+import sys
+
+from fastapi.testclient import TestClient
+
+from appserver import db
+from appserver import app as app_module
+from appserver.app import create_app
+from appserver.apps.outbox import sinks
+
+
+def test_앱을_불러와도_jose_와_해시_라이브러리는_불러오지_않는다():
+    code = "import sys, appserver.app; print(sorted(m for m in ('jose', 'pwdlib', 'argon2') if m in sys.modules))"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+
+    assert result.stdout.strip() == "[]"
+
+
+def test_lifespan_은_시작_시간을_기록하고_지표로_내보낸다(tmp_path, monkeypatch):
+    monkeypatch.setattr(db, "DSN", f"sqlite+aiosqlite:///{tmp_path / 'startup.db'}")
+    app = create_app()
+
+    with TestClient(app) as client:
+        startup = app.state.startup_seconds
+        assert 0 < startup["import"] <= startup["total"]
+        assert 0 < startup["lifespan"] <= startup["total"]
+        assert 'app_startup_seconds{phase="lifespan"}' in client.get("/metrics").text
+
+
+class NullSink:
+    async def send(self, idempotency_key: str, payload: dict) -> None:
+        pass
+
+    async def aclose(self) -> None:
+        pass
+
+
+def test_싱크가_설정되지_않으면_아웃박스_워커를_띄우지_않고_밀린_메시지_수만_내보낸다(tmp_path, monkeypatch, caplog):
+    monkeypatch.setattr(db, "DSN", f"sqlite+aiosqlite:///{tmp_path / 'outbox.db'}")
+    monkeypatch.setattr(app_module, "configured_sinks", lambda: {})
+    app = create_app()
+
+    with caplog.at_level(logging.ERROR, logger="appserver.app"), TestClient(app) as client:
+        assert app.state.outbox_worker is None
+        assert 'outbox_backlog_messages{status="pending"} 0.0' in client.get("/metrics").text
+
+    assert "outbox worker is NOT running" in caplog.text
+
+
+def test_설정한_싱크로_아웃박스_워커를_띄운다(tmp_path, monkeypatch, caplog):
+    configured = {sinks.CALENDAR_EVENT_TOPIC: NullSink()}
+    monkeypatch.setattr(db, "DSN", f"sqlite+aiosqlite:///{tmp_path / 'outbox.db'}")
+    monkeypatch.setattr(app_module, "configured_sinks", lambda: configured)
+    app = create_app()
+
+    with caplog.at_level(logging.ERROR, logger="appserver.app"), TestClient(app):
+        assert app.state.outbox_worker.sinks is configured
+
+    assert sinks.EMAIL_TOPIC in caplog.text
@@ -0,0 +1,185 @@
+import asyncio
+import dataclasses
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from appserver import db
+from appserver.config import settings
+
+
+@pytest.mark.parametrize("dsn, expected", [
+    ("postgresql://user:pw@localhost/app", "postgresql+asyncpg://user:pw@localhost/app"),
+    ("postgres://user:pw@localhost/app", "postgresql+asyncpg://user:pw@localhost/app"),
+    ("postgresql+asyncpg://user:pw@localhost/app", "postgresql+asyncpg://user:pw@localhost/app"),
+    ("sqlite+aiosqlite:///./local.db", "sqlite+aiosqlite:///./local.db"),
+])
+def test_normalize_dsn(dsn, expected):
+    assert db.normalize_dsn(dsn) == expected
+
+
+def test_PostgreSQL_엔진에는_풀_설정과_statement_timeout_을_적용한다():
+    _settings = dataclasses.replace(
+        settings,
+        database_pool_size=20,
+        database_max_overflow=5,
+        database_pool_recycle=600,
+        database_statement_timeout=3000,
+    )
+    options = db.build_engine_options("postgresql+asyncpg://user:pw@localhost/app", _settings)
+
+    assert options["pool_size"] == 20
+    assert options["max_overflow"] == 5
+    assert options["pool_recycle"] == 600
+    assert options["pool_pre_ping"] is True
+    assert options["connect_args"]["server_settings"]["statement_timeout"] == "3000"
+
+
+def test_메모리_SQLite_엔진에는_풀_설정을_적용하지_않는다():
+    options = db.build_engine_options("sqlite+aiosqlite:///:memory:")
+    assert "pool_size" not in options
+
+
+async def test_풀_체크아웃과_대기_시간을_기록한다(tmp_path):
+    engine = db.create_engine(f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}")
+    metrics = db.PoolMetrics()
+    db.instrument_pool(engine, metrics)
+
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+        assert metrics.checked_out == 1
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+    assert metrics.connects == 1
+    assert metrics.checkouts == 2
+    assert metrics.checkins == 2
+    assert metrics.checked_out == 0
+
+    #두 번째 체크아웃은 풀에 있던 커넥션을 꺼냈으므로 대기 한 번으로 셉니다.
+    assert metrics.waits == 1
+    metrics.observe_wait(0.5)
+    metrics.observe_wait(0.1)
+    assert metrics.snapshot()["wait_seconds_max"] == 0.5
+    assert metrics.waits == 3
+
+    await engine.dispose()
+
+
+async def test_풀이_가득_찼을_때_기다린_시간만_기록한다(tmp_path):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'wait.db'}", poolclass=db.TimedQueuePool, pool_size=1, max_overflow=0
+    )
+    metrics = db.PoolMetrics()
+    db.instrument_pool(engine, metrics)
+
+    #처음 여는 커넥션은 연결 시간이므로 대기로 세지 않습니다.
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+    assert metrics.waits == 0
+
+    async def hold():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            await asyncio.sleep(0.05)
+
+    holder = asyncio.create_task(hold())
+    await asyncio.sleep(0.01)
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+    await holder
+
+    assert metrics.waits == 2
+    assert metrics.wait_seconds_max >= 0.03
+    await engine.dispose()
+
+
+async def test_세션은_첫_쿼리에서_커넥션을_꺼낸다(tmp_path, monkeypatch):
+    engine = db.create_engine(f"sqlite+aiosqlite:///{tmp_path / 'lazy.db'}")
+    metrics = db.PoolMetrics()
+    db.instrument_pool(engine, metrics)
+    monkeypatch.setattr(db, "async_session_factory", db.create_session(engine))
+
+    sessions = db.use_session()
+    session = await anext(sessions)
+    assert metrics.checkouts == 0
+    await session.execute(text("SELECT 1"))
+    assert metrics.checkouts == 1
+    await sessions.aclose()
+    await engine.dispose()
+
+
+def test_앱_lifespan_에서_엔진을_만들고_정리한다(tmp_path, monkeypatch):
+    from appserver.app import app
+
+    monkeypatch.setattr(db, "DSN", f"sqlite+aiosqlite:///{tmp_path / 'lifespan.db'}")
+    assert db.engine is None
+
+    with TestClient(app):
+        assert db.engine is not None
+        assert str(db.engine.url) == db.DSN
+
+    assert db.engine is None
+    assert db.async_session_factory is None
+
+
+async def test_warm_up_pool_은_풀_크기까지만_커넥션을_미리_연다(tmp_path, monkeypatch):
+    monkeypatch.setattr(db, "DSN", f"sqlite+aiosqlite:///{tmp_path / 'warmup.db'}")
+    try:
+        assert await db.warm_up_pool(settings.database_pool_size + 5) == settings.database_pool_size
+        assert db.engine.pool.checkedin() == settings.database_pool_size
+    finally:
+        await db.dispose_engine()
+
+
+async def test_count_queries_는_블록_안에서_실행한_쿼리만_센다(db_session):
+    await db_session.execute(text("SELECT 1"))
+
+    with db.count_queries() as counter:
+        await db_session.execute(text("SELECT 1"))
+        await db_session.execute(text("SELECT 2"))
+
+    await db_session.execute(text("SELECT 3"))
+    assert counter.count == 2
+    assert counter.statements == ["SELECT 1", "SELECT 2"]
+
+
+def _budget_app(limit: int, queries: int) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/", dependencies=[db.query_budget(limit)])
+    async def endpoint(session: db.DbSessionDep):
+        for _ in range(queries):
+            await session.execute(text("SELECT 1"))
+        return {"ok": True}
+
+    return app
+
+
+def test_쿼리_예산_안에서는_그대로_응답한다(db_session):
+    app = _budget_app(limit=2, queries=2)
+    app.dependency_overrides[db.use_session] = lambda: db_session
+
+    with TestClient(app) as client:
+        assert client.get("/").json() == {"ok": True}
+
+
+def test_쿼리_예산을_넘으면_strict_모드에서_예외를_일으킨다(db_session):
+    app = _budget_app(limit=1, queries=3)
+    app.dependency_overrides[db.use_session] = lambda: db_session
+
+    with TestClient(app) as client, pytest.raises(db.QueryBudgetExceededError, match="쿼리 3개"):
+        client.get("/")
+
+
+def test_쿼리_예산을_넘어도_strict_모드가_아니면_경고만_남긴다(db_session, monkeypatch, caplog):
+    monkeypatch.setattr(db, "settings", dataclasses.replace(settings, database_query_budget_strict=False))
+    app = _budget_app(limit=1, queries=3)
+    app.dependency_overrides[db.use_session] = lambda: db_session
+
+    with TestClient(app) as client:
+        assert client.get("/").status_code == 200
+    assert "예산 1개" in caplog.text
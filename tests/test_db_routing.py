@@ -0,0 +1,105 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlmodel import SQLModel, select
+
+from appserver import db
+from appserver.app import include_routers
+from appserver.apps.account.models import User
+
+
+def make_user(username: str) -> User:
+    return User(
+        username=username,
+        email=f"{username}@example.com",
+        display_name=username,
+        hashed_password="not-a-real-hash",
+    )
+
+
+@pytest.fixture()
+async def engines(tmp_path):
+    primary = db.create_engine(f"sqlite+aiosqlite:///{tmp_path / 'primary.db'}")
+    replica = db.create_engine(f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}")
+
+    #복제 지연을 흉내 내기 위해 두 파일에 서로 다른 사용자를 넣어둡니다.
+    for engine, username in ((primary, "onprimary"), (replica, "onreplica")):
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+        async with db.create_session(engine)() as session:
+            session.add(make_user(username))
+            await session.commit()
+
+    yield primary, replica
+
+    await primary.dispose()
+    await replica.dispose()
+
+
+async def usernames(session) -> set[str]:
+    result = await session.execute(select(User.username))
+    return set(result.scalars())
+
+
+async def test_조회는_복제본으로_쓰기는_주_데이터베이스로_보낸다(engines):
+    primary, replica = engines
+    router = db.DatabaseRouter(primary, [replica], read_your_writes=False)
+
+    async with router.create_session()() as session:
+        assert await usernames(session) == {"onreplica"}
+
+        session.add(make_user("newuser"))
+        await session.commit()
+
+        #read_your_writes 를 끄면 커밋 후에도 복제본에서 읽습니다.
+        assert await usernames(session) == {"onreplica"}
+
+    async with db.create_session(primary)() as session:
+        assert await usernames(session) == {"onprimary", "newuser"}
+
+
+async def test_read_your_writes_는_커밋한_세션을_주_데이터베이스에_고정한다(engines):
+    primary, replica = engines
+    router = db.DatabaseRouter(primary, [replica], read_your_writes=True)
+
+    async with router.create_session()() as session:
+        assert await usernames(session) == {"onreplica"}
+
+        session.add(make_user("newuser"))
+        await session.commit()
+
+        assert await usernames(session) == {"onprimary", "newuser"}
+
+    async with router.create_session()() as session:
+        assert await usernames(session) == {"onreplica"}
+
+
+async def test_상태_확인에_실패한_복제본은_제외하고_주_데이터베이스에서_읽는다(engines, tmp_path):
+    primary, replica = engines
+    broken = db.create_engine(f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'replica.db'}")
+    router = db.DatabaseRouter(primary, [broken, replica])
+
+    assert await router.check_replicas() == (replica,)
+    assert {router.choose_replica() for _ in range(4)} == {replica}
+
+    router.replicas = (broken,)
+    assert await router.check_replicas() == ()
+    assert router.choose_replica() is primary
+
+    async with router.create_session()() as session:
+        assert await usernames(session) == {"onprimary"}
+
+    await broken.dispose()
+
+
+async def test_user_detail_은_복제본에서_조회한다(engines, monkeypatch):
+    primary, replica = engines
+    router = db.DatabaseRouter(primary, [replica])
+    monkeypatch.setattr(db, "read_session_factory", router.create_session())
+
+    app = FastAPI()
+    include_routers(app)
+
+    with TestClient(app) as client:
+        assert client.get("/api/accounts/users/onreplica").status_code == 200
+        assert client.get("/api/accounts/users/onprimary").status_code == 404